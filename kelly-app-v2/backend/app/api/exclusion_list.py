@@ -2,22 +2,45 @@
 Exclusion List API endpoints
 For managing the exclusion list (PC/RR list)
 """
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
 from datetime import datetime
 import pandas as pd
+import importlib.util
 import io
-from dateutil import parser
 
 from app.database import get_db
-from app.models.exclusion_list import ExclusionList
+from app.models.exclusion_list import ExclusionList, ExclusionListVersion
 from app.models.user import User
 from app.api.auth import get_current_admin
+from app.services.exclusion_service import (
+    ExclusionIndex, build_exclusion_index, swap_exclusion_index, get_exclusion_index,
+    rescreen_info_sessions, normalize_exclusion_frame, bulk_load_exclusion_list, merge_exclusion_list,
+    record_exclusion_version, RESCREEN_DAYS_BACK
+)
+from app.services import live_feed
+from app.api.info_session import notify_session_changed
+
+# python-calamine (optional) parses .xlsx several times faster than openpyxl
+EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
+
+# Above this many changed sessions, dashboards are told to reload instead of receiving each row
+RESCREEN_FEED_LIMIT = 50
 
 router = APIRouter()
 
+def publish_rescreen(db: Session, report: dict) -> dict:
+    """Push re-screened sessions to the live feed (after commit) and return the public report"""
+    changed_ids = report.pop("changed_session_ids")
+    if len(changed_ids) > RESCREEN_FEED_LIMIT:
+        live_feed.publish({"type": "resync"})
+    else:
+        for session_id in changed_ids:
+            notify_session_changed(db, session_id)
+    return report
+
 class ExclusionListItem(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     
@@ -33,15 +56,33 @@ class ExclusionListResponse(BaseModel):
     items: List[ExclusionListItem]
     total: int
 
+class ExclusionListVersionItem(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    mode: str
+    filename: Optional[str] = None
+    uploaded_by: Optional[str] = None
+    total_rows: int
+    added: int
+    removed: int
+    changed: int
+    unchanged: int
+    content_hash: Optional[str] = None
+    created_at: datetime
+
 @router.post("/upload", status_code=status.HTTP_200_OK)
-async def upload_exclusion_list(
+def upload_exclusion_list(
     file: UploadFile = File(...),
+    mode: str = Query("replace", pattern="^(replace|merge)$"),
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin)
 ):
     """
     Upload Excel file with exclusion list
     Expected columns: name, Code, DOB, SSN
+    mode=replace reloads the whole list; mode=merge applies only added, removed and changed entries
+    Sync endpoint: parsing, the bulk load and the re-screen run in the threadpool, not on the event loop
     """
     if not file.filename.endswith(('.xlsx', '.xls')):
         raise HTTPException(
@@ -51,8 +92,8 @@ async def upload_exclusion_list(
     
     try:
         # Read Excel file
-        contents = await file.read()
-        df = pd.read_excel(io.BytesIO(contents))
+        contents = file.file.read()
+        df = pd.read_excel(io.BytesIO(contents), engine=EXCEL_ENGINE)
         
         # Normalize column names (case-insensitive)
         df.columns = df.columns.str.strip().str.lower()
@@ -66,67 +107,37 @@ async def upload_exclusion_list(
                 detail=f"Missing required columns: {', '.join(missing_columns)}"
             )
         
-        # Clear existing exclusion list
-        db.query(ExclusionList).delete()
-        db.commit()
-        
-        # Process and insert rows
-        added_count = 0
-        errors = []
-        
-        for index, row in df.iterrows():
-            try:
-                # Get name (required)
-                name = str(row.get('name', '')).strip()
-                if not name or name == 'nan':
-                    continue
-                
-                # Convert name to uppercase for storage (as specified)
-                name_upper = name.upper()
-                
-                # Get optional fields
-                code = str(row.get('code', '')).strip() if pd.notna(row.get('code')) else None
-                code = code if code and code != 'nan' else None
-                
-                ssn = str(row.get('ssn', '')).strip() if pd.notna(row.get('ssn')) else None
-                ssn = ssn if ssn and ssn != 'nan' else None
-                
-                # Parse DOB
-                dob = None
-                if pd.notna(row.get('dob')):
-                    try:
-                        dob_value = row.get('dob')
-                        if isinstance(dob_value, str):
-                            dob = parser.parse(dob_value).date()
-                        elif hasattr(dob_value, 'date'):
-                            dob = dob_value.date()
-                        else:
-                            dob = pd.to_datetime(dob_value).date()
-                    except:
-                        pass
-                
-                # Create exclusion list item
-                exclusion_item = ExclusionList(
-                    name=name_upper,
-                    code=code,
-                    dob=dob,
-                    ssn=ssn
-                )
-                db.add(exclusion_item)
-                added_count += 1
-                
-            except Exception as e:
-                errors.append(f"Row {index + 2}: {str(e)}")
+        # Normalize with column operations, then apply the list in one transaction
+        frame = normalize_exclusion_frame(df)
+        if mode == "merge":
+            diff = merge_exclusion_list(db, frame)
+        else:
+            diff = bulk_load_exclusion_list(db, frame)
+        version = record_exclusion_version(
+            db, mode, diff, frame["row_hash"], file.filename, current_admin.email if current_admin else None
+        )
         
+        # Flags and stored matches on existing registrations point at the old list -
+        # re-screen them against the new list, and only start screening with it once committed.
+        # An unchanged merge keeps the current index.
+        list_changed = diff["added"] or diff["removed"] or diff["changed"]
+        new_index = build_exclusion_index(db) if list_changed else get_exclusion_index(db)
+        rescreen = rescreen_info_sessions(db, index=new_index)
         db.commit()
+        if list_changed:
+            swap_exclusion_index(new_index)
         
         return {
             "message": f"Exclusion list uploaded successfully",
-            "added": added_count,
-            "errors": errors if errors else None
+            "mode": mode,
+            "version_id": version.id,
+            **diff,
+            "errors": None,
+            "rescreen": publish_rescreen(db, rescreen)
         }
         
     except Exception as e:
+        # Nothing was committed, so the old list (and its index) stay in place
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -149,17 +160,45 @@ async def list_exclusion_items(
         "total": total
     }
 
+@router.get("/versions", response_model=List[ExclusionListVersionItem])
+async def list_exclusion_versions(
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin)
+):
+    """Upload history of the exclusion list, newest first (admin only)"""
+    return db.query(ExclusionListVersion).order_by(ExclusionListVersion.id.desc()).limit(limit).all()
+
 @router.delete("/clear")
-async def clear_exclusion_list(
+def clear_exclusion_list(
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin)
 ):
     """Clear all exclusion list items (admin only)"""
     count = db.query(ExclusionList).delete()
+    record_exclusion_version(db, "clear", {"removed": count}, uploaded_by=current_admin.email if current_admin else None)
+    empty_index = ExclusionIndex([])
+    rescreen = rescreen_info_sessions(db, index=empty_index)
     db.commit()
+    swap_exclusion_index(empty_index)
     
     return {
-        "message": f"Exclusion list cleared. {count} items removed."
+        "message": f"Exclusion list cleared. {count} items removed.",
+        "rescreen": publish_rescreen(db, rescreen)
     }
 
+@router.post("/rescreen")
+def rescreen_registrations(
+    days_back: int = Query(RESCREEN_DAYS_BACK, ge=0, le=3650),
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    Re-screen open, recent (last days_back days) and flagged info sessions
+    against the current exclusion list and report how many flags changed (admin only)
+    """
+    rescreen = rescreen_info_sessions(db, days_back=days_back)
+    db.commit()
+    return publish_rescreen(db, rescreen)
+
 
@@ -1,20 +1,30 @@
 """
 Info Session API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import JSONResponse, Response
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from sqlalchemy.orm import Session, joinedload, selectinload, defer
+from sqlalchemy import func, or_, and_
 from pydantic import BaseModel, EmailStr, ConfigDict
 from typing import List, Optional
 from datetime import datetime
+from contextlib import nullcontext
+import asyncio
+import base64
 
 from app.database import get_db
-from app.models.info_session import InfoSession, InfoSessionStep
+from app.models.info_session import InfoSession, InfoSessionStep, build_identity_key, normalize_email
 from app.models.recruiter import Recruiter
-from app.services.exclusion_service import check_name_in_exclusion_list, is_in_exclusion_list
+from app.services.exclusion_service import check_name_in_exclusion_list, is_in_exclusion_list, apply_exclusion_snapshot, find_similar_exclusion_entries
+from app.services.name_matching import FUZZY_MIN_SCORE, FUZZY_MAX_RESULTS
 from app.models.exclusion_list import ExclusionList
-from app.services.recruiter_service import get_next_recruiter, initialize_default_recruiters
+from app.services.recruiter_service import get_next_recruiter, initialize_default_recruiters, recruiter_assignment_lock, assign_recruiter_by_capacity, estimate_wait_for_session
+from app.services.assignment_worker import request_sweep
+from app.services import live_feed
+from app.services.version_service import not_modified
+from app.services.session_serializer import serialize_live_session
+from app.utils.date_utils import miami_today, to_miami_date, local_date_range_filter, timestamp_param
+from app.utils.json_response import json_response
 from datetime import date
 
 router = APIRouter()
@@ -35,7 +45,8 @@ class ExclusionMatchInfo(BaseModel):
     code: Optional[str] = None
     ssn: Optional[str] = None
 
-class InfoSessionResponse(BaseModel):
+class InfoSessionSummary(BaseModel):
+    """Info session without interview answers (list endpoints)"""
     model_config = ConfigDict(from_attributes=True)
     
     id: int
@@ -62,6 +73,9 @@ class InfoSessionResponse(BaseModel):
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     duration_minutes: Optional[int] = None
+    created_at: datetime
+
+class InfoSessionResponse(InfoSessionSummary):
     question_1_response: Optional[str] = None
     question_2_response: Optional[str] = None
     question_3_response: Optional[str] = None
@@ -70,7 +84,6 @@ class InfoSessionResponse(BaseModel):
     question_6_response: Optional[str] = None
     question_7_response: Optional[str] = None
     question_8_response: Optional[str] = None
-    created_at: datetime
 
 class InfoSessionStepModel(BaseModel):
     step_name: str
@@ -79,16 +92,19 @@ class InfoSessionStepModel(BaseModel):
 
 class InfoSessionWithSteps(InfoSessionResponse):
     steps: List[InfoSessionStepModel]
+    estimated_wait_minutes: Optional[int] = None  # until the assigned recruiter can start the interview
 
-def get_exclusion_match_info(db: Session, first_name: str, last_name: str) -> Optional[ExclusionMatchInfo]:
-    """Get exclusion match info for a name"""
-    exclusion_matches = check_name_in_exclusion_list(db, first_name, last_name)
-    if exclusion_matches:
-        first_match = exclusion_matches[0]
+# Large TEXT columns that list endpoints don't return - deferred so they are never loaded
+INTERVIEW_ANSWER_COLUMNS = [getattr(InfoSession, f"question_{n}_response") for n in range(1, 9)]
+LIST_DEFERRED_COLUMNS = INTERVIEW_ANSWER_COLUMNS + [InfoSession.generated_row]
+
+def get_exclusion_match_info(info_session: InfoSession) -> Optional[ExclusionMatchInfo]:
+    """Get the exclusion match stored on the session (set at registration, refreshed on list upload)"""
+    if info_session.is_in_exclusion_list and info_session.exclusion_match_name:
         return ExclusionMatchInfo(
-            name=first_match.name,
-            code=first_match.code,
-            ssn=first_match.ssn
+            name=info_session.exclusion_match_name,
+            code=info_session.exclusion_match_code,
+            ssn=info_session.exclusion_match_ssn
         )
     return None
 
@@ -109,24 +125,23 @@ DEFAULT_STEPS = [
 ]
 
 @router.post("/register", response_model=InfoSessionWithSteps, status_code=status.HTTP_201_CREATED)
-async def register_info_session(
+def register_info_session(
     registration: InfoSessionRegistration,
     db: Session = Depends(get_db)
 ):
     """
     Register a new info session
     Checks exclusion list, assigns recruiter, and creates default steps
+    Sync endpoint: the blocking assignment lock is taken in the threadpool, not on the event loop
     """
-    # Initialize default recruiters if needed
-    initialize_default_recruiters(db)
-
-    # Check for duplicate registration: same email AND same time_slot for today
-    existing = db.query(InfoSession).filter(
-        func.lower(InfoSession.email) == registration.email.strip().lower(),
+    # Check for duplicate registration: same email AND same time_slot for today (ix_info_sessions_email_date_slot)
+    today = miami_today()
+    existing = db.query(InfoSession.id).filter(
+        InfoSession.email_normalized == normalize_email(registration.email),
+        InfoSession.service_date == today,
         InfoSession.time_slot == registration.time_slot,
         InfoSession.session_type == registration.session_type,
         InfoSession.status.notin_(["completed"]),
-        func.date(InfoSession.created_at) == date.today(),
     ).first()
 
     if existing:
@@ -158,32 +173,8 @@ async def register_info_session(
             ssn=first_match.ssn
         )
     
-    # Assign recruiter equitably - ALWAYS assign a recruiter
-    assigned_recruiter = get_next_recruiter(db, registration.time_slot, date.today())
-    
-    # Ensure we always have a recruiter assigned
-    if not assigned_recruiter:
-        # Last resort: get the first active recruiter or create one
-        initialize_default_recruiters(db)
-        assigned_recruiter = db.query(Recruiter).filter(Recruiter.is_active == True, Recruiter.status == "available").first()
-        if not assigned_recruiter:
-            # Create a fallback recruiter
-            from app.models.recruiter import Recruiter
-            assigned_recruiter = Recruiter(
-                name="Default Recruiter",
-                email="recruiter@kellyeducation.com",
-                status="available"
-            )
-            db.add(assigned_recruiter)
-            db.commit()
-            db.refresh(assigned_recruiter)
-    
-    # Debug: Log assignment
-    print(f"✅ Info Session created for {registration.first_name} {registration.last_name}")
-    print(f"   Assigned to recruiter ID: {assigned_recruiter.id}, Name: {assigned_recruiter.name}, Email: {assigned_recruiter.email}")
-    
-    # Create info session record - ALWAYS with a recruiter assigned
-    print(f"📝 Creating session with status='initiated'")
+    # Create info session record with its default steps (the recruiter is set under the lock)
+    # Everything is written in a single flush + commit (steps are inserted in one batch)
     info_session = InfoSession(
         first_name=registration.first_name,
         last_name=registration.last_name,
@@ -195,37 +186,48 @@ async def register_info_session(
         is_in_exclusion_list=is_excluded,
         exclusion_warning_shown=is_excluded,
         status="initiated",  # New sessions start as initiated, change to answers_submitted when questions are answered
-        assigned_recruiter_id=assigned_recruiter.id,  # Always assigned now
-        started_at=datetime.utcnow()  # Set started_at when session is created
+        # started_at stays empty until the recruiter calls /start (interview start, not registration)
+        steps=[
+            InfoSessionStep(
+                step_name=step_data["step_name"],
+                step_description=step_data["step_description"],
+                is_completed=False
+            )
+            for step_data in DEFAULT_STEPS
+        ]
     )
-    print(f"📝 Session object created with status='{info_session.status}'")
-    
-    db.add(info_session)
-    db.commit()
-    db.refresh(info_session)
-    print(f"📝 Session saved to DB with status='{info_session.status}'")
-    
-    # Create default steps
-    for step_data in DEFAULT_STEPS:
-        step = InfoSessionStep(
-            info_session_id=info_session.id,
-            step_name=step_data["step_name"],
-            step_description=step_data["step_description"],
-            is_completed=False
-        )
-        db.add(step)
-    
-    db.commit()
-    db.refresh(info_session)
-    print(f"📝 After creating steps, session status='{info_session.status}'")
+    apply_exclusion_snapshot(info_session, exclusion_matches[0] if exclusion_matches else None)
 
-    # Return with steps
-    # Get recruiter name if assigned
-    recruiter_name = None
-    if assigned_recruiter:
-        recruiter_name = assigned_recruiter.name
+    # Only assignment, insert and commit are serialized, so parallel registrations see each other
+    with recruiter_assignment_lock(db):
+        # Assign the recruiter predicted to be free soonest - ALWAYS assign a recruiter
+        assigned_recruiter, estimated_wait_minutes = assign_recruiter_by_capacity(db, registration.time_slot, today)
     
-    # Get steps
+        # Ensure we always have a recruiter assigned
+        if not assigned_recruiter:
+            # Last resort: get the first active recruiter or create one
+            initialize_default_recruiters(db)
+            assigned_recruiter = db.query(Recruiter).filter(Recruiter.is_active == True, Recruiter.status == "available").first()
+            if not assigned_recruiter:
+                # Create a fallback recruiter (committed together with the session)
+                assigned_recruiter = Recruiter(
+                    name="Default Recruiter",
+                    email="recruiter@kellyeducation.com",
+                    status="available"
+                )
+                db.add(assigned_recruiter)
+    
+        info_session.assigned_recruiter = assigned_recruiter  # Always assigned now
+        db.add(info_session)
+        # The INSERT returns server defaults (eager_defaults); keeping them after commit lets
+        # the response be built outside the lock without reloading the rows
+        db.expire_on_commit = False
+        db.commit()
+
+    # Debug: Log assignment
+    print(f"✅ Info Session {info_session.id} created for {registration.first_name} {registration.last_name}")
+    print(f"   Assigned to recruiter ID: {assigned_recruiter.id}, Name: {assigned_recruiter.name}, Email: {assigned_recruiter.email}")
+
     steps_data = [
         {
             "step_name": step.step_name,
@@ -234,176 +236,206 @@ async def register_info_session(
         }
         for step in info_session.steps
     ]
-    
     response_data = InfoSessionResponse.model_validate(info_session).model_dump()
-    response_data["assigned_recruiter_name"] = recruiter_name
+    response_data["assigned_recruiter_name"] = assigned_recruiter.name
     response_data["exclusion_match"] = exclusion_match_info.model_dump() if exclusion_match_info else None
     response_data["steps"] = steps_data
+    response_data["estimated_wait_minutes"] = estimated_wait_minutes
+    name_counts = get_duplicate_counts(db, [info_session])
+    live_row = serialize_live_session(info_session, name_counts)
+    identity_key = info_session.identity_key
+
+    live_feed.publish({"type": "upsert", "id": live_row["id"], "session": live_row})
+    if live_row["duplicate_count"] > 1:
+        notify_duplicates_changed(db, identity_key, live_row["id"])
     return response_data
 
-@router.get("/live")
-async def get_live_info_sessions(db: Session = Depends(get_db)):
-    """Get live info sessions (registered, in-progress, initiated, and completed)"""
-    sessions = db.query(InfoSession).options(joinedload(InfoSession.steps)).filter(
-        InfoSession.status.in_(["registered", "in-progress", "initiated", "completed"])
-    ).order_by(InfoSession.created_at.desc()).all()
-
-    # Detect duplicates: find name+email combos that appear more than once (case-insensitive)
-    # Check against ALL sessions (not just live ones) to catch duplicates across sessions
-    all_sessions = db.query(InfoSession).all()
+def get_duplicate_counts(db: Session, sessions: List[InfoSession]) -> dict:
+    """
+    Count registrations per identity key (name + email, case-insensitive)
+    Only the keys of the given sessions are counted, using the identity_key index
+    """
+    keys = list({s.identity_key or build_identity_key(s.first_name, s.last_name, s.email) for s in sessions})
     name_counts: dict = {}
-    for s in all_sessions:
-        name_key = f"{s.first_name.strip().lower()}_{s.last_name.strip().lower()}_{s.email.strip().lower()}"
-        name_counts[name_key] = name_counts.get(name_key, 0) + 1
+    for i in range(0, len(keys), 500):
+        rows = db.query(InfoSession.identity_key, func.count(InfoSession.id)).filter(
+            InfoSession.identity_key.in_(keys[i:i + 500])
+        ).group_by(InfoSession.identity_key).all()
+        name_counts.update({key: count for key, count in rows})
+    return name_counts
+
+def notify_session_changed(db: Session, session_id: int):
+    """
+    Push the current state of a session to live feed subscribers
+    Call after the write has been committed
+    """
+    try:
+        session = db.query(InfoSession).options(
+            joinedload(InfoSession.steps),
+            joinedload(InfoSession.assigned_recruiter),
+            *[defer(column) for column in LIST_DEFERRED_COLUMNS]
+        ).filter(
+            InfoSession.id == session_id
+        ).first()
+        if not session:
+            live_feed.publish({"type": "delete", "id": session_id})
+            return
+        live_feed.publish({
+            "type": "upsert",
+            "id": session_id,
+            "session": serialize_live_session(session, get_duplicate_counts(db, [session]))
+        })
+    except Exception as e:
+        # Never fail a write because of the live feed - clients fall back to a resync
+        print(f"⚠️ Could not publish live feed event for session {session_id}: {e}")
+        live_feed.publish({"type": "resync"})
+
+def notify_duplicates_changed(db: Session, identity_key: str, exclude_id: int):
+    """Push sessions whose duplicate_count changed after a registration or delete"""
+    sibling_ids = db.query(InfoSession.id).filter(
+        InfoSession.identity_key == identity_key,
+        InfoSession.id != exclude_id
+    ).all()
+    for (sibling_id,) in sibling_ids:
+        notify_session_changed(db, sibling_id)
 
-    duplicate_names = {k for k, v in name_counts.items() if v > 1}
+@router.get("/stream")
+async def stream_info_sessions(request: Request):
+    """
+    Server-Sent Events stream of info session changes
+    Clients load /live (or /completed) once and then apply these deltas:
+    upsert (full session row), delete (session id) and resync (reload the snapshot)
+    """
+    async def event_generator():
+        subscriber = live_feed.subscribe()
+        _, queue = subscriber
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                if await request.is_disconnected():
+                    break
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=15)
+                    yield live_feed.format_sse(event)
+                except asyncio.TimeoutError:
+                    # Keep proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+        finally:
+            live_feed.unsubscribe(subscriber)
 
-    result = []
-    for session in sessions:
-        name_key = f"{session.first_name.strip().lower()}_{session.last_name.strip().lower()}_{session.email.strip().lower()}"
-        recruiter_name = None
-        if session.assigned_recruiter_id:
-            recruiter = db.query(Recruiter).filter(Recruiter.id == session.assigned_recruiter_id).first()
-            if recruiter:
-                recruiter_name = recruiter.name
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
-        exclusion_match = None
-        if session.is_in_exclusion_list:
-            try:
-                matches = check_name_in_exclusion_list(db, session.first_name, session.last_name)
-                if matches and len(matches) > 0:
-                    first_match = matches[0]
-                    exclusion_match = {
-                        "name": first_match.name if first_match.name else None,
-                        "code": first_match.code if first_match.code else None,
-                        "ssn": first_match.ssn if first_match.ssn else None
-                    }
-            except Exception as e:
-                print(f"Error getting exclusion match: {e}")
-                exclusion_match = None
-
-        steps = []
-        for step in session.steps:
-            steps.append({
-                "step_name": step.step_name,
-                "step_description": step.step_description if step.step_description else "",
-                "is_completed": step.is_completed
-            })
-
-        item = {
-            "id": session.id,
-            "first_name": session.first_name,
-            "last_name": session.last_name,
-            "email": session.email,
-            "phone": session.phone,
-            "zip_code": session.zip_code if session.zip_code else "",
-            "session_type": session.session_type,
-            "time_slot": session.time_slot,
-            "is_in_exclusion_list": bool(session.is_in_exclusion_list),
-            "exclusion_warning_shown": bool(session.exclusion_warning_shown),
-            "status": session.status,
-            "ob365_sent": bool(session.ob365_sent) if hasattr(session, 'ob365_sent') and session.ob365_sent is not None else False,
-            "i9_sent": bool(session.i9_sent) if hasattr(session, 'i9_sent') and session.i9_sent is not None else False,
-            "existing_i9": bool(session.existing_i9) if hasattr(session, 'existing_i9') and session.existing_i9 is not None else False,
-            "ineligible": bool(session.ineligible) if hasattr(session, 'ineligible') and session.ineligible is not None else False,
-            "rejected": bool(session.rejected) if hasattr(session, 'rejected') and session.rejected is not None else False,
-            "drug_screen": bool(session.drug_screen) if hasattr(session, 'drug_screen') and session.drug_screen is not None else False,
-            "questions": bool(session.questions) if hasattr(session, 'questions') and session.questions is not None else False,
-            "assigned_recruiter_id": session.assigned_recruiter_id,
-            "assigned_recruiter_name": recruiter_name,
-            "started_at": session.started_at.isoformat() if session.started_at else None,
-            "completed_at": session.completed_at.isoformat() if session.completed_at else None,
-            "duration_minutes": session.duration_minutes,
-            "created_at": session.created_at.isoformat(),
-            "exclusion_match": exclusion_match,
-            "steps": steps,
-            "is_duplicate": name_key in duplicate_names,
-            "duplicate_count": name_counts.get(name_key, 1),
-        }
-        result.append(item)
+def encode_cursor(session: InfoSession) -> str:
+    """Opaque keyset cursor for the (created_at, id) position of a session"""
+    raw = f"{session.created_at.isoformat()}|{session.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
 
-    return result
+def decode_cursor(cursor: str) -> tuple:
+    """Inverse of encode_cursor - raises 400 on a malformed cursor"""
+    try:
+        created_at_str, session_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+        return datetime.fromisoformat(created_at_str), int(session_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def paginate_sessions(
+    db: Session,
+    query,
+    response: Response,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    cursor: Optional[str],
+    limit: int,
+    default_today: bool = True
+) -> List[InfoSession]:
+    """
+    Apply the Miami-local date window and keyset pagination on (created_at, id), newest first
+    Without start_date/end_date the window is today, or unbounded when default_today is False
+    Sets the X-Next-Cursor response header when more rows are available
+    """
+    if start_date or end_date or default_today:
+        today = miami_today()
+        start_date = start_date or end_date or today
+        query = query.filter(
+            local_date_range_filter(db, InfoSession.created_at, start_date, end_date or start_date)
+        )
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        cursor_param = timestamp_param(db, cursor_created_at)
+        query = query.filter(or_(
+            InfoSession.created_at < cursor_param,
+            and_(InfoSession.created_at == cursor_param, InfoSession.id < cursor_id)
+        ))
+    sessions = query.order_by(InfoSession.created_at.desc(), InfoSession.id.desc()).limit(limit + 1).all()
+    if len(sessions) > limit:
+        sessions = sessions[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(sessions[-1])
+    return sessions
+
+@router.get("/live")
+async def get_live_info_sessions(
+    request: Request,
+    response: Response,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """
+    Get live info sessions (registered, in-progress, initiated, and completed)
+    Defaults to today in Miami time; pass the X-Next-Cursor header value as cursor for the next page
+    Answers 304 Not Modified when nothing changed since the client's ETag
+    """
+    cached = not_modified(request, response, "info_sessions", "info_session_steps", "recruiters")
+    if cached:
+        return cached
+
+    query = db.query(InfoSession).options(
+        selectinload(InfoSession.steps),
+        selectinload(InfoSession.assigned_recruiter),
+        *[defer(column) for column in LIST_DEFERRED_COLUMNS]
+    ).filter(
+        InfoSession.status.in_(["registered", "in-progress", "initiated", "completed"])
+    )
+    sessions = paginate_sessions(db, query, response, start_date, end_date, cursor, limit)
+
+    # Detect duplicates: find name+email combos that appear more than once (case-insensitive)
+    # Counted against ALL sessions (not just live ones) to catch duplicates across sessions
+    name_counts = get_duplicate_counts(db, sessions)
+
+    return json_response([serialize_live_session(session, name_counts) for session in sessions], response)
 
 @router.get("/completed")
-async def get_completed_info_sessions(db: Session = Depends(get_db)):
-    """Get completed info sessions"""
-    sessions = db.query(InfoSession).options(joinedload(InfoSession.steps)).filter(
+async def get_completed_info_sessions(
+    response: Response,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """
+    Get completed info sessions
+    All dates unless start_date/end_date (Miami time) are given; pass the X-Next-Cursor header value as cursor for the next page
+    """
+    query = db.query(InfoSession).options(
+        selectinload(InfoSession.steps),
+        selectinload(InfoSession.assigned_recruiter),
+        *[defer(column) for column in LIST_DEFERRED_COLUMNS]
+    ).filter(
         InfoSession.status == "completed"
-    ).order_by(InfoSession.completed_at.desc()).all()
+    )
+    sessions = paginate_sessions(db, query, response, start_date, end_date, cursor, limit, default_today=False)
 
     # Detect duplicates across ALL sessions (name + email)
-    all_sessions = db.query(InfoSession).all()
-    name_counts: dict = {}
-    for s in all_sessions:
-        nk = f"{s.first_name.strip().lower()}_{s.last_name.strip().lower()}_{s.email.strip().lower()}"
-        name_counts[nk] = name_counts.get(nk, 0) + 1
-    duplicate_names = {k for k, v in name_counts.items() if v > 1}
-
-    result = []
-    for session in sessions:
-        name_key = f"{session.first_name.strip().lower()}_{session.last_name.strip().lower()}_{session.email.strip().lower()}"
-        recruiter_name = None
-        if session.assigned_recruiter_id:
-            recruiter = db.query(Recruiter).filter(Recruiter.id == session.assigned_recruiter_id).first()
-            if recruiter:
-                recruiter_name = recruiter.name
-        
-        exclusion_match = None
-        if session.is_in_exclusion_list:
-            try:
-                matches = check_name_in_exclusion_list(db, session.first_name, session.last_name)
-                if matches and len(matches) > 0:
-                    first_match = matches[0]
-                    exclusion_match = {
-                        "name": first_match.name if first_match.name else None,
-                        "code": first_match.code if first_match.code else None,
-                        "ssn": first_match.ssn if first_match.ssn else None
-                    }
-            except Exception as e:
-                print(f"Error getting exclusion match: {e}")
-                exclusion_match = None
-        
-        steps = []
-        for step in session.steps:
-            steps.append({
-                "step_name": step.step_name,
-                "step_description": step.step_description if step.step_description else "",
-                "is_completed": step.is_completed
-            })
-        
-        item = {
-            "id": session.id,
-            "first_name": session.first_name,
-            "last_name": session.last_name,
-            "email": session.email,
-            "phone": session.phone,
-            "zip_code": session.zip_code if session.zip_code else "",
-            "session_type": session.session_type,
-            "time_slot": session.time_slot,
-            "is_in_exclusion_list": bool(session.is_in_exclusion_list),
-            "exclusion_warning_shown": bool(session.exclusion_warning_shown),
-            "status": session.status,
-            "ob365_sent": bool(session.ob365_sent) if hasattr(session, 'ob365_sent') and session.ob365_sent is not None else False,
-            "i9_sent": bool(session.i9_sent) if hasattr(session, 'i9_sent') and session.i9_sent is not None else False,
-            "existing_i9": bool(session.existing_i9) if hasattr(session, 'existing_i9') and session.existing_i9 is not None else False,
-            "ineligible": bool(session.ineligible) if hasattr(session, 'ineligible') and session.ineligible is not None else False,
-            "rejected": bool(session.rejected) if hasattr(session, 'rejected') and session.rejected is not None else False,
-            "drug_screen": bool(session.drug_screen) if hasattr(session, 'drug_screen') and session.drug_screen is not None else False,
-            "questions": bool(session.questions) if hasattr(session, 'questions') and session.questions is not None else False,
-            "assigned_recruiter_id": session.assigned_recruiter_id,
-            "assigned_recruiter_name": recruiter_name,
-            "started_at": session.started_at.isoformat() if session.started_at else None,
-            "completed_at": session.completed_at.isoformat() if session.completed_at else None,
-            "duration_minutes": session.duration_minutes,
-            "created_at": session.created_at.isoformat(),
-            "exclusion_match": exclusion_match,
-            "steps": steps,
-            "is_duplicate": name_key in duplicate_names,
-            "duplicate_count": name_counts.get(name_key, 1),
-        }
-        result.append(item)
+    name_counts = get_duplicate_counts(db, sessions)
 
-    return result
+    return json_response([serialize_live_session(session, name_counts) for session in sessions], response)
 
 @router.get("/export-excel")
 def export_excel(period: str = "all", db: Session = Depends(get_db)):
@@ -411,21 +443,23 @@ def export_excel(period: str = "all", db: Session = Depends(get_db)):
     import pandas as pd
     from io import BytesIO
     from fastapi.responses import StreamingResponse
-    from datetime import timedelta, timezone
+    from datetime import timedelta
 
-    now = datetime.now(timezone.utc)
+    today = miami_today()
 
-    query = db.query(InfoSession)
+    # Only the exported columns - no ORM entities, no answer text
+    query = db.query(
+        InfoSession.first_name,
+        InfoSession.last_name,
+        InfoSession.email,
+        InfoSession.phone,
+        InfoSession.created_at
+    )
 
-    if period == "day":
-        start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        query = query.filter(InfoSession.created_at >= start)
-    elif period == "week":
-        start = now - timedelta(days=7)
-        query = query.filter(InfoSession.created_at >= start)
-    elif period == "month":
-        start = now - timedelta(days=30)
-        query = query.filter(InfoSession.created_at >= start)
+    # Miami-local days, so evening registrations count on the day they happened
+    days_back = {"day": 0, "week": 7, "month": 30}
+    if period in days_back:
+        query = query.filter(local_date_range_filter(db, InfoSession.created_at, today - timedelta(days=days_back[period])))
     # "all" — no filter
 
     sessions = query.order_by(InfoSession.created_at.desc()).all()
@@ -436,7 +470,7 @@ def export_excel(period: str = "all", db: Session = Depends(get_db)):
             "Name": f"{s.first_name} {s.last_name}",
             "Email": s.email,
             "Phone": s.phone,
-            "Date": s.created_at.strftime("%m/%d/%Y") if s.created_at else "",
+            "Date": to_miami_date(s.created_at).strftime("%m/%d/%Y") if s.created_at else "",
         })
 
     df = pd.DataFrame(rows, columns=["Name", "Email", "Phone", "Date"])
@@ -446,7 +480,7 @@ def export_excel(period: str = "all", db: Session = Depends(get_db)):
         df.to_excel(writer, index=False, sheet_name="Info Session Attendees")
     buffer.seek(0)
 
-    filename = f"info_session_{period}_{now.strftime('%Y%m%d')}.xlsx"
+    filename = f"info_session_{period}_{today.strftime('%Y%m%d')}.xlsx"
     return StreamingResponse(
         buffer,
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
@@ -460,16 +494,15 @@ async def get_info_session(
     db: Session = Depends(get_db)
 ):
     """Get info session by ID"""
-    info_session = db.query(InfoSession).filter(InfoSession.id == session_id).first()
+    info_session = db.query(InfoSession).options(
+        selectinload(InfoSession.steps),
+        joinedload(InfoSession.assigned_recruiter)
+    ).filter(InfoSession.id == session_id).first()
     if not info_session:
         raise HTTPException(status_code=404, detail="Info session not found")
     
     # Get recruiter name if assigned
-    recruiter_name = None
-    if info_session.assigned_recruiter_id:
-        recruiter = db.query(Recruiter).filter(Recruiter.id == info_session.assigned_recruiter_id).first()
-        if recruiter:
-            recruiter_name = recruiter.name
+    recruiter_name = info_session.assigned_recruiter.name if info_session.assigned_recruiter else None
     
     # Get steps
     steps_data = [
@@ -482,20 +515,17 @@ async def get_info_session(
     ]
     
     # Get exclusion match info if in exclusion list
-    exclusion_match_info = None
-    if info_session.is_in_exclusion_list:
-        exclusion_match_info = get_exclusion_match_info(
-            db, info_session.first_name, info_session.last_name
-        )
+    exclusion_match_info = get_exclusion_match_info(info_session)
     
     response_data = InfoSessionResponse.model_validate(info_session).model_dump()
     response_data["assigned_recruiter_name"] = recruiter_name
     response_data["exclusion_match"] = exclusion_match_info.model_dump() if exclusion_match_info else None
     response_data["steps"] = steps_data
+    response_data["estimated_wait_minutes"] = estimate_wait_for_session(db, info_session)
     return response_data
 
 @router.patch("/{session_id}/steps/{step_name}/complete")
-async def complete_step(
+def complete_step(
     session_id: int,
     step_name: str,
     db: Session = Depends(get_db)
@@ -520,26 +550,26 @@ async def complete_step(
 
     # Assign recruiter if not assigned (try to assign after first step completion)
     info_session = db.query(InfoSession).filter(InfoSession.id == session_id).first()
+    needs_recruiter = info_session is not None and not info_session.assigned_recruiter_id
     if info_session:
         total_steps = len(info_session.steps)
         completed_steps = sum(1 for s in info_session.steps if s.is_completed)
         print(f"📋 Steps status: {completed_steps}/{total_steps} completed (status remains '{info_session.status}')")
 
-        if not info_session.assigned_recruiter_id:
-                from app.services.recruiter_service import get_next_recruiter, initialize_default_recruiters
-                from datetime import date
-                initialize_default_recruiters(db)
-                recruiter = get_next_recruiter(db, info_session.time_slot, date.today())
-                if recruiter:
-                    info_session.assigned_recruiter_id = recruiter.id
-                    print(f"✅ Recruiter {recruiter.name} assigned to session {session_id}")
-    
-    db.commit()
+    # An assignment is serialized with the others; the step is committed with it in one transaction
+    with recruiter_assignment_lock(db) if needs_recruiter else nullcontext():
+        if needs_recruiter:
+            recruiter = get_next_recruiter(db, info_session.time_slot, info_session.service_date or miami_today())
+            if recruiter:
+                info_session.assigned_recruiter_id = recruiter.id
+                print(f"✅ Recruiter {recruiter.name} assigned to session {session_id}")
+        db.commit()
+    notify_session_changed(db, session_id)
     
     return {"message": "Step completed successfully", "step": step_name}
 
 @router.post("/{session_id}/complete")
-async def complete_info_session(
+def complete_info_session(
     session_id: int,
     db: Session = Depends(get_db)
 ):
@@ -561,18 +591,24 @@ async def complete_info_session(
 
         # Note: duration_minutes is only calculated when recruiter completes the session
 
-        # Try to assign recruiter (non-critical)
-        try:
-            if not info_session.assigned_recruiter_id:
-                initialize_default_recruiters(db)
-                recruiter = get_next_recruiter(db, info_session.time_slot, date.today())
-                if recruiter:
-                    info_session.assigned_recruiter_id = recruiter.id
-        except:
-            pass
-
+        # Commit the status on its own so a failed assignment attempt cannot lose it
         db.commit()
-        db.refresh(info_session)
+
+        # Try to assign recruiter (non-critical, separate transaction)
+        if not info_session.assigned_recruiter_id:
+            try:
+                with recruiter_assignment_lock(db):
+                    recruiter = get_next_recruiter(db, info_session.time_slot, info_session.service_date or miami_today())
+                    if recruiter:
+                        info_session.assigned_recruiter_id = recruiter.id
+                    db.commit()
+            except Exception as e:
+                db.rollback()
+                print(f"⚠️ Could not assign a recruiter to session {session_id}: {e}")
+                # The background worker picks the session up on its next run
+                request_sweep()
+
+        notify_session_changed(db, session_id)
 
         return {"message": "Info session completed successfully", "session_id": session_id}
     except HTTPException:
@@ -624,6 +660,7 @@ async def update_interview_questions(
 
     db.commit()
     db.refresh(info_session)
+    notify_session_changed(db, session_id)
     
     print(f"✅ Saved responses for session {session_id}:")
     print(f"   Q1: {info_session.question_1_response[:50] if info_session.question_1_response else 'None'}...")
@@ -745,7 +782,7 @@ async def get_answers_pdf(
         }
     )
 
-@router.get("/", response_model=List[InfoSessionResponse])
+@router.get("/", response_model=List[InfoSessionSummary])
 async def list_info_sessions(
     skip: int = 0,
     limit: int = 1000,
@@ -753,59 +790,37 @@ async def list_info_sessions(
     days_back: int = 7,
     db: Session = Depends(get_db)
 ):
-    """List all info sessions (for staff dashboard)"""
-    from app.services.recruiter_service import get_next_recruiter, initialize_default_recruiters
-    from datetime import date, timedelta
+    """List all info sessions (for staff dashboard) - interview answers are not included"""
+    from datetime import timedelta
 
-    initialize_default_recruiters(db)
-
-    # Only auto-assign TODAY's unassigned sessions (not all historical)
-    today = date.today()
-    unassigned_today = db.query(InfoSession).filter(
-        InfoSession.assigned_recruiter_id == None,
-        func.date(InfoSession.created_at) == today
-    ).all()
-
-    for session in unassigned_today:
-        assigned_recruiter = get_next_recruiter(db, session.time_slot, today)
-        if assigned_recruiter:
-            session.assigned_recruiter_id = assigned_recruiter.id
-        else:
-            fallback_recruiter = db.query(Recruiter).filter(
-                Recruiter.is_active == True, Recruiter.status == "available"
-            ).first()
-            if fallback_recruiter:
-                session.assigned_recruiter_id = fallback_recruiter.id
-
-    if unassigned_today:
-        db.commit()
+    # Read-only: unassigned sessions are picked up by the background assignment worker
+    today = miami_today()
 
     query = db.query(InfoSession)
 
     if status:
         query = query.filter(InfoSession.status == status)
 
-    # Filter by date range (days_back=0 means all time)
+    # Filter by date range (days_back=0 means all time); same index as the ORDER BY
     if days_back > 0:
         cutoff = today - timedelta(days=days_back)
-        query = query.filter(func.date(InfoSession.created_at) >= cutoff)
-
-    sessions = query.order_by(InfoSession.created_at.desc()).offset(skip).limit(limit).all()
+        query = query.filter(local_date_range_filter(db, InfoSession.created_at, cutoff))
 
-    # Pre-load all recruiters in one query to avoid N+1
-    recruiter_ids = {s.assigned_recruiter_id for s in sessions if s.assigned_recruiter_id}
-    recruiters_map = {}
-    if recruiter_ids:
-        recruiters = db.query(Recruiter).filter(Recruiter.id.in_(recruiter_ids)).all()
-        recruiters_map = {r.id: r.name for r in recruiters}
+    # Recruiters are loaded in one extra query to avoid N+1
+    sessions = query.options(
+        selectinload(InfoSession.assigned_recruiter),
+        *[defer(column) for column in LIST_DEFERRED_COLUMNS]
+    ).order_by(
+        InfoSession.created_at.desc()
+    ).offset(skip).limit(limit).all()
 
     result = []
     for session in sessions:
-        session_data = InfoSessionResponse.model_validate(session).model_dump()
-        if session.assigned_recruiter_id and session.assigned_recruiter_id in recruiters_map:
-            session_data["assigned_recruiter_name"] = recruiters_map[session.assigned_recruiter_id]
+        session_data = InfoSessionSummary.model_validate(session).model_dump()
+        if session.assigned_recruiter:
+            session_data["assigned_recruiter_name"] = session.assigned_recruiter.name
         if session.is_in_exclusion_list:
-            exclusion_match_info = get_exclusion_match_info(db, session.first_name, session.last_name)
+            exclusion_match_info = get_exclusion_match_info(session)
             session_data["exclusion_match"] = exclusion_match_info.model_dump() if exclusion_match_info else None
         session_data["rejected"] = session.rejected
         session_data["drug_screen"] = session.drug_screen
@@ -831,8 +846,12 @@ async def delete_info_session(
     db.query(InfoSessionStep).filter(InfoSessionStep.info_session_id == session_id).delete()
     
     # Delete the session
+    identity_key = info_session.identity_key
     db.delete(info_session)
     db.commit()
+    live_feed.publish({"type": "delete", "id": session_id})
+    if identity_key:
+        notify_duplicates_changed(db, identity_key, session_id)
     
     return {"message": "Info session deleted successfully", "session_id": session_id}
 
@@ -840,25 +859,37 @@ async def delete_info_session(
 async def check_exclusion(
     first_name: str,
     last_name: str,
+    min_score: float = Query(FUZZY_MIN_SCORE, ge=0, le=1),
+    limit: int = Query(FUZZY_MAX_RESULTS, ge=1, le=50),
     db: Session = Depends(get_db)
 ):
-    """Check if a name is in exclusion list"""
+    """
+    Check if a name is in exclusion list
+    possible_matches lists similar-looking or similar-sounding entries (not exact matches) with a score
+    """
     try:
         matches = check_name_in_exclusion_list(db, first_name, last_name)
         is_excluded = len(matches) > 0
+        exact_ids = {match.id for match in matches}
+        similar = find_similar_exclusion_entries(db, first_name, last_name, min_score, limit)
+        
+        def entry_data(match):
+            return {
+                "id": match.id,
+                "name": match.name,
+                "code": match.code,
+                "ssn": match.ssn,
+                "dob": match.dob.isoformat() if match.dob else None,
+                "notes": match.notes
+            }
         
         return {
             "is_in_exclusion_list": is_excluded,
-            "matches": [
-                {
-                    "id": match.id,
-                    "name": match.name,
-                    "code": match.code,
-                    "ssn": match.ssn,
-                    "dob": match.dob.isoformat() if match.dob else None,
-                    "notes": match.notes
-                }
-                for match in matches
+            "matches": [entry_data(match) for match in matches],
+            "possible_matches": [
+                {**entry_data(match), "score": score}
+                for match, score in similar
+                if match.id not in exact_ids
             ],
             "warning_message": "Please verify social and data to verify that this person is on the PC or RR list" if is_excluded else None
         }
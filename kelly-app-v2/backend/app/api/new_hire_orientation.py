@@ -1,18 +1,21 @@
 """
 New Hire Orientation API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Request
 from fastapi.responses import JSONResponse, Response
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
 from pydantic import BaseModel, EmailStr, ConfigDict
 from typing import List, Optional
-from datetime import datetime, date
+from datetime import datetime
 
 from app.database import get_db
 from app.models.visit import NewHireOrientation, NewHireOrientationStep
+from app.models.info_session import normalize_email
 from app.models.new_hire_orientation_config import NewHireOrientationConfig
-from app.services.recruiter_service import get_next_recruiter, initialize_default_recruiters
+from app.services.recruiter_service import get_next_recruiter, initialize_default_recruiters, recruiter_assignment_lock
+from app.services.version_service import not_modified
+from app.utils.date_utils import miami_today, to_miami_date, local_date_range_filter
+from app.utils.json_response import json_response
 import json
 
 router = APIRouter()
@@ -52,6 +55,10 @@ class NewHireOrientationResponse(BaseModel):
 class NewHireOrientationWithSteps(NewHireOrientationResponse):
     steps: List[NewHireOrientationStepModel]
 
+class NewHireOrientationListItem(NewHireOrientationResponse):
+    """Row of the staff dashboard list"""
+    assigned_recruiter_name: Optional[str] = None
+
 # Default steps for New Hire Orientation
 DEFAULT_STEPS = [
     {
@@ -100,17 +107,19 @@ async def get_available_time_slots(db: Session = Depends(get_db)):
         return ["9:00 AM", "2:00 PM"]
 
 @router.post("/register", response_model=NewHireOrientationWithSteps, status_code=status.HTTP_201_CREATED)
-async def register_new_hire_orientation(
+def register_new_hire_orientation(
     registration: NewHireOrientationRegistration,
     db: Session = Depends(get_db)
 ):
     """Register a new hire orientation"""
     try:
         # Check for duplicate registration (same email + same time_slot on the same day)
-        existing = db.query(NewHireOrientation).filter(
-            func.lower(NewHireOrientation.email) == registration.email.lower(),
-            NewHireOrientation.time_slot == registration.time_slot,
-            func.date(NewHireOrientation.created_at) == date.today()
+        # ix_new_hire_orientations_email_date_slot serves this lookup
+        today = miami_today()
+        existing = db.query(NewHireOrientation.id).filter(
+            NewHireOrientation.email_normalized == normalize_email(registration.email),
+            NewHireOrientation.service_date == today,
+            NewHireOrientation.time_slot == registration.time_slot
         ).first()
         if existing:
             raise HTTPException(
@@ -136,23 +145,24 @@ async def register_new_hire_orientation(
                 print(f"Error parsing steps from config: {e}")
                 steps_to_create = DEFAULT_STEPS
         
-        # Assign recruiter equitably
-        assigned_recruiter = get_next_recruiter(db, registration.time_slot, date.today())
-        
-        # Create orientation record
-        orientation = NewHireOrientation(
-            first_name=registration.first_name,
-            last_name=registration.last_name,
-            email=registration.email,
-            phone=registration.phone,
-            time_slot=registration.time_slot,
-            status="in-progress",
-            assigned_recruiter_id=assigned_recruiter.id if assigned_recruiter else None,
-            badge_status="pending",  # Set default badge status
-        )
-        
-        db.add(orientation)
-        db.commit()
+        # Assign recruiter equitably (serialized with other assignments until commit)
+        with recruiter_assignment_lock(db):
+            assigned_recruiter = get_next_recruiter(db, registration.time_slot, today)
+            
+            # Create orientation record
+            orientation = NewHireOrientation(
+                first_name=registration.first_name,
+                last_name=registration.last_name,
+                email=registration.email,
+                phone=registration.phone,
+                time_slot=registration.time_slot,
+                status="in-progress",
+                assigned_recruiter_id=assigned_recruiter.id if assigned_recruiter else None,
+                badge_status="pending",  # Set default badge status
+            )
+            
+            db.add(orientation)
+            db.commit()
         db.refresh(orientation)
         
         # Create default steps
@@ -293,26 +303,36 @@ async def complete_new_hire_orientation(
     
     return {"message": "New hire orientation completed successfully", "orientation_id": orientation_id}
 
-@router.get("/", response_model=List[NewHireOrientationResponse])
+@router.get("/", response_model=List[NewHireOrientationListItem])
 async def list_new_hire_orientations(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 1000,
     status: Optional[str] = None,
     days_back: int = 7,
     db: Session = Depends(get_db)
 ):
-    """List all new hire orientations (for staff dashboard)"""
+    """
+    List all new hire orientations (for staff dashboard)
+    Answers 304 Not Modified when nothing changed since the client's ETag
+    """
     from datetime import timedelta
     from app.models.recruiter import Recruiter
 
+    cached = not_modified(request, response, "new_hire_orientations", "recruiters")
+    if cached:
+        return cached
+
     query = db.query(NewHireOrientation)
 
     if status:
         query = query.filter(NewHireOrientation.status == status)
 
+    # Same index as the ORDER BY
     if days_back > 0:
-        cutoff = date.today() - timedelta(days=days_back)
-        query = query.filter(func.date(NewHireOrientation.created_at) >= cutoff)
+        cutoff = miami_today() - timedelta(days=days_back)
+        query = query.filter(local_date_range_filter(db, NewHireOrientation.created_at, cutoff))
 
     orientations = query.order_by(NewHireOrientation.created_at.desc()).offset(skip).limit(limit).all()
 
@@ -323,14 +343,14 @@ async def list_new_hire_orientations(
         recruiters = db.query(Recruiter).filter(Recruiter.id.in_(recruiter_ids)).all()
         recruiters_map = {r.id: r.name for r in recruiters}
 
+    # Serialized through the response model (json_response skips FastAPI's validation)
     result = []
     for orientation in orientations:
-        orientation_data = NewHireOrientationResponse.model_validate(orientation).model_dump()
-        if orientation.assigned_recruiter_id and orientation.assigned_recruiter_id in recruiters_map:
-            orientation_data["assigned_recruiter_name"] = recruiters_map[orientation.assigned_recruiter_id]
-        result.append(orientation_data)
+        item = NewHireOrientationListItem.model_validate(orientation)
+        item.assigned_recruiter_name = recruiters_map.get(orientation.assigned_recruiter_id)
+        result.append(item.model_dump(mode="json"))
 
-    return result
+    return json_response(result, response)
 
 class NewHireOrientationUpdate(BaseModel):
     process_status: Optional[str] = None
@@ -408,19 +428,22 @@ async def delete_duplicate_orientations(db: Session = Depends(get_db)):
     all_orientations = db.query(NewHireOrientation).order_by(NewHireOrientation.created_at.asc()).all()
 
     seen: dict = {}
-    to_delete: List[int] = []
+    to_delete: List[NewHireOrientation] = []
 
     for o in all_orientations:
-        # Use UTC date for consistency with the registration duplicate check
-        day = o.created_at.date() if o.created_at else None
-        key = (o.email.lower().strip(), o.time_slot, day)
+        # Same Miami-local day as the registration duplicate check (service_date),
+        # converting created_at for rows that predate the column
+        day = o.service_date or (to_miami_date(o.created_at) if o.created_at else None)
+        key = (normalize_email(o.email), o.time_slot, day)
         if key in seen:
-            to_delete.append(o.id)
+            to_delete.append(o)
         else:
             seen[key] = o.id
 
     if to_delete:
-        db.query(NewHireOrientation).filter(NewHireOrientation.id.in_(to_delete)).delete(synchronize_session=False)
+        # Delete through the session so the statistics rollup sees each removed row
+        for o in to_delete:
+            db.delete(o)
         db.commit()
 
     return {"deleted": len(to_delete)}
@@ -2,14 +2,19 @@
 Recruiter API endpoints
 For recruiters to manage their status and view their assigned visitors
 """
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session, selectinload, defer
 from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
 from datetime import datetime, timezone
 from app.database import get_db
 from app.models.recruiter import Recruiter
 from app.models.info_session import InfoSession
+from app.api.info_session import notify_session_changed, get_duplicate_counts, INTERVIEW_ANSWER_COLUMNS
+from app.services.version_service import not_modified
+from app.services.recruiter_service import invalidate_interview_minutes
+from app.services.session_serializer import serialize_assigned_session
+from app.utils.json_response import json_response
 
 router = APIRouter()
 
@@ -110,42 +115,23 @@ async def update_recruiter_status(
 @router.get("/{recruiter_id}/assigned-sessions")
 async def get_assigned_sessions(
     recruiter_id: int,
+    request: Request,
+    response: Response,
     status: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get all info sessions assigned to a recruiter"""
+    """
+    Get all info sessions assigned to a recruiter
+    Answers 304 Not Modified when nothing changed since the client's ETag
+    """
     recruiter = db.query(Recruiter).filter(Recruiter.id == recruiter_id).first()
     if not recruiter:
         raise HTTPException(status_code=404, detail="Recruiter not found")
     
-    # First, assign recruiters to any unassigned sessions
-    from app.services.recruiter_service import get_next_recruiter, initialize_default_recruiters
-    from datetime import date
-    
-    initialize_default_recruiters(db)
-    
-    # Find all unassigned sessions and assign them
-    unassigned_sessions = db.query(InfoSession).filter(
-        InfoSession.assigned_recruiter_id == None
-    ).all()
-    
-    for session in unassigned_sessions:
-        session_date = session.created_at.date() if session.created_at else date.today()
-        assigned_recruiter = get_next_recruiter(db, session.time_slot, session_date)
-        
-        if assigned_recruiter:
-            session.assigned_recruiter_id = assigned_recruiter.id
-            print(f"✅ Auto-assigned session {session.id} ({session.first_name} {session.last_name}) to {assigned_recruiter.name}")
-        else:
-            # Fallback: only assign to available recruiters, never to busy ones
-            fallback_recruiter = db.query(Recruiter).filter(Recruiter.is_active == True, Recruiter.status == "available").first()
-            if fallback_recruiter:
-                session.assigned_recruiter_id = fallback_recruiter.id
-                print(f"✅ Auto-assigned session {session.id} ({session.first_name} {session.last_name}) to {fallback_recruiter.name} (fallback)")
-
-    if unassigned_sessions:
-        db.commit()
-        print(f"✅ Auto-assigned {len(unassigned_sessions)} unassigned sessions")
+    # Read-only: unassigned sessions are picked up by the background assignment worker
+    cached = not_modified(request, response, "info_sessions", "recruiters")
+    if cached:
+        return cached
 
     # Debug: Log recruiter info
     print(f"🔍 Getting sessions for recruiter ID: {recruiter_id}, Name: {recruiter.name}, Email: {recruiter.email}")
@@ -155,7 +141,11 @@ async def get_assigned_sessions(
     if status:
         query = query.filter(InfoSession.status == status)
     
-    sessions = query.order_by(InfoSession.created_at.desc()).all()
+    # generated_row is returned here; interview answers are not
+    sessions = query.options(
+        selectinload(InfoSession.assigned_recruiter),
+        *[defer(column) for column in INTERVIEW_ANSWER_COLUMNS]
+    ).order_by(InfoSession.created_at.desc()).all()
     
     # Debug: Log session count and details
     print(f"📋 Found {len(sessions)} sessions for recruiter {recruiter_id}")
@@ -163,55 +153,10 @@ async def get_assigned_sessions(
         print(f"   - Session ID: {session.id}, Name: {session.first_name} {session.last_name}, Status: {session.status}, Created: {session.created_at}")
     
     # Detect duplicates across ALL sessions (name + email)
-    all_sessions_for_dup = db.query(InfoSession).all()
-    name_counts: dict = {}
-    for s in all_sessions_for_dup:
-        nk = f"{s.first_name.strip().lower()}_{s.last_name.strip().lower()}_{s.email.strip().lower()}"
-        name_counts[nk] = name_counts.get(nk, 0) + 1
-    duplicate_names = {k for k, v in name_counts.items() if v > 1}
-
-    result = []
-    for session in sessions:
-        name_key = f"{session.first_name.strip().lower()}_{session.last_name.strip().lower()}_{session.email.strip().lower()}"
-        # Get recruiter name if assigned
-        assigned_recruiter_name = None
-        if session.assigned_recruiter_id:
-            assigned_recruiter = db.query(Recruiter).filter(Recruiter.id == session.assigned_recruiter_id).first()
-            if assigned_recruiter:
-                assigned_recruiter_name = assigned_recruiter.name
-
-        session_data = {
-            "id": session.id,
-            "first_name": session.first_name,
-            "last_name": session.last_name,
-            "email": session.email,
-            "phone": session.phone,
-            "zip_code": session.zip_code,
-            "session_type": session.session_type,
-            "time_slot": session.time_slot,
-            "status": session.status,
-            "is_in_exclusion_list": bool(session.is_in_exclusion_list) if hasattr(session, 'is_in_exclusion_list') and session.is_in_exclusion_list is not None else False,
-            "exclusion_warning_shown": bool(session.exclusion_warning_shown) if hasattr(session, 'exclusion_warning_shown') and session.exclusion_warning_shown is not None else False,
-            "ob365_sent": session.ob365_sent,
-            "i9_sent": session.i9_sent,
-            "existing_i9": session.existing_i9,
-            "ineligible": session.ineligible,
-            "rejected": session.rejected,
-            "drug_screen": session.drug_screen,
-            "questions": session.questions,
-            "started_at": session.started_at.isoformat() if session.started_at else None,
-            "completed_at": session.completed_at.isoformat() if session.completed_at else None,
-            "duration_minutes": session.duration_minutes,
-            "created_at": session.created_at.isoformat() if session.created_at else None,
-            "generated_row": session.generated_row if session.generated_row else None,
-            "assigned_recruiter_id": session.assigned_recruiter_id,
-            "assigned_recruiter_name": assigned_recruiter_name,
-            "is_duplicate": name_key in duplicate_names,
-            "duplicate_count": name_counts.get(name_key, 1),
-        }
-        result.append(session_data)
+    name_counts = get_duplicate_counts(db, sessions)
 
-    return {"sessions": result, "count": len(result)}
+    result = [serialize_assigned_session(session, name_counts) for session in sessions]
+    return json_response({"sessions": result, "count": len(result)}, response)
 
 @router.post("/{recruiter_id}/sessions/{session_id}/start")
 async def start_session(
@@ -319,6 +264,7 @@ async def start_session(
         session.generated_row = generated_row
     
     db.commit()
+    notify_session_changed(db, session_id)
     
     response = {"message": "Session started", "started_at": session.started_at.isoformat()}
     if generated_row:
@@ -397,7 +343,10 @@ async def complete_session(
             recruiter.status = "available"
         
         db.commit()
+        # New interview length for the capacity scheduler's rolling averages
+        invalidate_interview_minutes()
         db.refresh(session)
+        notify_session_changed(db, session_id)
         
         print(f"✅ Session {session_id} status after commit: {session.status}")
         
@@ -460,6 +409,7 @@ async def update_session_documents(
 
     db.commit()
     db.refresh(session)
+    notify_session_changed(db, session_id)
 
     return {"message": "Session updated successfully"}
 
@@ -495,6 +445,7 @@ async def reassign_session(
 
     db.commit()
     db.refresh(session)
+    notify_session_changed(db, session_id)
 
     print(f"✅ Reassigned session {session_id} from recruiter {old_recruiter_id} to {new_recruiter_id}")
 
@@ -12,9 +12,12 @@ import pytz
 
 from app.database import get_db
 from app.models.info_session import InfoSession
-from app.models.visit import NewHireOrientation, Badge, Fingerprint, TeamVisit
+from app.models.daily_activity_rollup import DailyActivityRollup
+from app.models.recruiter import Recruiter
 from app.api.auth import get_current_user
 from app.models.user import User
+from app.services.statistics_cache import get_cached_statistics
+from app.utils.date_utils import miami_today, local_date_range_filter, minutes_between
 
 router = APIRouter()
 
@@ -73,13 +76,22 @@ def get_date_range(period: str) -> tuple:
     
     return start, end
 
+# Rollup entity types in the daily / weekly / monthly stats, keyed by their field in each bucket
+COUNTED_ENTITIES = [
+    ("info_sessions", "info_session"),
+    ("new_hire_orientations", "new_hire_orientation"),
+    ("visits", "team_visit"),
+    ("badges", "badge"),
+    ("fingerprints", "fingerprint"),
+]
+
 @router.get("/", response_model=StatisticsResponse)
 async def get_statistics(
     period: str = Query("all", regex="^(day|week|month|year|all)$"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get comprehensive statistics for all visit types"""
+    """Get comprehensive statistics for all visit types (cached, identical for every allowed user)"""
     
     # Check if user has permission (staff, recruiter, management, admin, talent, frontdesk)
     if current_user.role not in ['admin', 'staff', 'recruiter', 'management', 'frontdesk', 'talent']:
@@ -89,288 +101,132 @@ async def get_statistics(
             detail="Not authorized to view statistics"
         )
     
+    # The date window moves at Miami midnight, so the date is part of the key
+    return await get_cached_statistics((period, miami_today()), lambda: compute_statistics(db, period))
+
+def compute_statistics(db: Session, period: str) -> StatisticsResponse:
+    """Compute the statistics for a period from the database"""
     start_date, end_date = get_date_range(period)
     
-    # Convert to datetime for querying
-    start_datetime = datetime.combine(start_date, datetime.min.time())
-    end_datetime = datetime.combine(end_date, datetime.max.time())
-    
-    # Total counts
-    total_info_sessions = db.query(InfoSession).filter(
-        func.date(InfoSession.created_at) >= start_date,
-        func.date(InfoSession.created_at) <= end_date
-    ).count()
-    
-    total_new_hire_orientations = db.query(NewHireOrientation).filter(
-        func.date(NewHireOrientation.created_at) >= start_date,
-        func.date(NewHireOrientation.created_at) <= end_date
-    ).count()
-    
-    total_visits = db.query(TeamVisit).filter(
-        func.date(TeamVisit.created_at) >= start_date,
-        func.date(TeamVisit.created_at) <= end_date
-    ).count()
-    
-    total_badges = db.query(Badge).filter(
-        func.date(Badge.created_at) >= start_date,
-        func.date(Badge.created_at) <= end_date
-    ).count()
-    
-    total_fingerprints = db.query(Fingerprint).filter(
-        func.date(Fingerprint.created_at) >= start_date,
-        func.date(Fingerprint.created_at) <= end_date
-    ).count()
+    # Totals, status distributions and average completion times - one grouped query over the rollup
+    period_rows = db.query(
+        DailyActivityRollup.entity_type,
+        DailyActivityRollup.status,
+        func.sum(DailyActivityRollup.count).label('count'),
+        func.sum(DailyActivityRollup.rejected_count).label('rejected'),
+        func.sum(DailyActivityRollup.timed_count).label('timed'),
+        func.sum(DailyActivityRollup.timed_minutes).label('minutes')
+    ).filter(
+        DailyActivityRollup.activity_date >= start_date,
+        DailyActivityRollup.activity_date <= end_date
+    ).group_by(DailyActivityRollup.entity_type, DailyActivityRollup.status).all()
 
-    total_rejected_info_sessions = db.query(InfoSession).filter(
-        func.date(InfoSession.created_at) >= start_date,
-        func.date(InfoSession.created_at) <= end_date,
-        InfoSession.rejected == True
-    ).count()
+    totals = {entity_type: 0 for _, entity_type in COUNTED_ENTITIES}
+    by_status = {entity_type: {} for _, entity_type in COUNTED_ENTITIES}
+    timed = {entity_type: [0, 0.0] for _, entity_type in COUNTED_ENTITIES}
+    total_rejected_info_sessions = 0
+    for row in period_rows:
+        if not row.count:
+            continue
+        totals[row.entity_type] += row.count
+        by_status[row.entity_type][row.status] = row.count
+        if row.entity_type == "info_session":
+            total_rejected_info_sessions += row.rejected
+        # Only completed rows carry timed measures
+        timed[row.entity_type][0] += row.timed
+        timed[row.entity_type][1] += row.minutes
 
-    # Status distributions
-    info_sessions_by_status = {}
-    status_counts = db.query(
-        InfoSession.status,
-        func.count(InfoSession.id).label('count')
-    ).filter(
-        func.date(InfoSession.created_at) >= start_date,
-        func.date(InfoSession.created_at) <= end_date
-    ).group_by(InfoSession.status).all()
-    for status, count in status_counts:
-        info_sessions_by_status[status or 'unknown'] = count
-    
-    new_hire_orientations_by_status = {}
-    nho_status_counts = db.query(
-        NewHireOrientation.status,
-        func.count(NewHireOrientation.id).label('count')
-    ).filter(
-        func.date(NewHireOrientation.created_at) >= start_date,
-        func.date(NewHireOrientation.created_at) <= end_date
-    ).group_by(NewHireOrientation.status).all()
-    for status, count in nho_status_counts:
-        new_hire_orientations_by_status[status or 'unknown'] = count
-    
-    visits_by_status = {}
-    visit_status_counts = db.query(
-        TeamVisit.status,
-        func.count(TeamVisit.id).label('count')
-    ).filter(
-        func.date(TeamVisit.created_at) >= start_date,
-        func.date(TeamVisit.created_at) <= end_date
-    ).group_by(TeamVisit.status).all()
-    for status, count in visit_status_counts:
-        visits_by_status[status or 'unknown'] = count
-    
-    # Average completion times - optimized query
-    completed_info_sessions_query = db.query(
-        InfoSession.started_at,
-        InfoSession.completed_at
-    ).filter(
-        InfoSession.status == 'completed',
-        InfoSession.started_at.isnot(None),
-        InfoSession.completed_at.isnot(None),
-        func.date(InfoSession.created_at) >= start_date,
-        func.date(InfoSession.created_at) <= end_date
-    ).all()
-    
-    avg_completion_info = None
-    if completed_info_sessions_query:
-        durations = [
-            (to_miami_timezone(s.completed_at) - to_miami_timezone(s.started_at)).total_seconds() / 60
-            for s in completed_info_sessions_query
-            if s.started_at and s.completed_at
-        ]
-        if durations:
-            avg_completion_info = sum(durations) / len(durations)
-    
-    completed_nho_query = db.query(
-        NewHireOrientation.started_at,
-        NewHireOrientation.completed_at
-    ).filter(
-        NewHireOrientation.status == 'completed',
-        NewHireOrientation.started_at.isnot(None),
-        NewHireOrientation.completed_at.isnot(None),
-        func.date(NewHireOrientation.created_at) >= start_date,
-        func.date(NewHireOrientation.created_at) <= end_date
-    ).all()
-    
-    avg_completion_nho = None
-    if completed_nho_query:
-        durations = [
-            (to_miami_timezone(n.completed_at) - to_miami_timezone(n.started_at)).total_seconds() / 60
-            for n in completed_nho_query
-            if n.started_at and n.completed_at
-        ]
-        if durations:
-            avg_completion_nho = sum(durations) / len(durations)
-    
-    # Daily stats - optimized with single query per table
+    def average_minutes(entity_type: str) -> Optional[float]:
+        """Average completion time in minutes, None when nothing completed"""
+        count, minutes = timed[entity_type]
+        return minutes / count if count else None
+
+    total_info_sessions = totals["info_session"]
+    total_new_hire_orientations = totals["new_hire_orientation"]
+    total_visits = totals["team_visit"]
+    total_badges = totals["badge"]
+    total_fingerprints = totals["fingerprint"]
+    info_sessions_by_status = by_status["info_session"]
+    new_hire_orientations_by_status = by_status["new_hire_orientation"]
+    visits_by_status = by_status["team_visit"]
+    avg_completion_info = average_minutes("info_session")
+    avg_completion_nho = average_minutes("new_hire_orientation")
+    
+    # Daily stats - from the rollup
     daily_stats = []
     # Limit to last 90 days for performance
     max_days = 90
     days_diff = (end_date - start_date).days
     if days_diff > max_days:
         start_date = end_date - timedelta(days=max_days)
-    
-    # Get all daily counts in one query per table
-    info_sessions_daily = db.query(
-        func.date(InfoSession.created_at).label('day'),
-        func.count(InfoSession.id).label('count')
-    ).filter(
-        func.date(InfoSession.created_at) >= start_date,
-        func.date(InfoSession.created_at) <= end_date
-    ).group_by(func.date(InfoSession.created_at)).all()
-    
-    nho_daily = db.query(
-        func.date(NewHireOrientation.created_at).label('day'),
-        func.count(NewHireOrientation.id).label('count')
-    ).filter(
-        func.date(NewHireOrientation.created_at) >= start_date,
-        func.date(NewHireOrientation.created_at) <= end_date
-    ).group_by(func.date(NewHireOrientation.created_at)).all()
-    
-    visits_daily = db.query(
-        func.date(TeamVisit.created_at).label('day'),
-        func.count(TeamVisit.id).label('count')
-    ).filter(
-        func.date(TeamVisit.created_at) >= start_date,
-        func.date(TeamVisit.created_at) <= end_date
-    ).group_by(func.date(TeamVisit.created_at)).all()
-    
-    badges_daily = db.query(
-        func.date(Badge.created_at).label('day'),
-        func.count(Badge.id).label('count')
-    ).filter(
-        func.date(Badge.created_at) >= start_date,
-        func.date(Badge.created_at) <= end_date
-    ).group_by(func.date(Badge.created_at)).all()
-    
-    fingerprints_daily = db.query(
-        func.date(Fingerprint.created_at).label('day'),
-        func.count(Fingerprint.id).label('count')
+
+    # The first week and month buckets start before start_date, so fetch daily counts from
+    # the earliest bucket start; weekly and monthly stats are then summed from these days
+    first_week_start = start_date - timedelta(days=start_date.weekday())
+    first_month_start = start_date.replace(day=1)
+    counts_start = min(first_week_start, first_month_start)
+    daily_counts = {key: {} for key, _ in COUNTED_ENTITIES}
+    daily_rows = db.query(
+        DailyActivityRollup.activity_date,
+        DailyActivityRollup.entity_type,
+        func.sum(DailyActivityRollup.count).label('count')
     ).filter(
-        func.date(Fingerprint.created_at) >= start_date,
-        func.date(Fingerprint.created_at) <= end_date
-    ).group_by(func.date(Fingerprint.created_at)).all()
-    
-    # Create dictionaries for quick lookup
-    info_sessions_dict = {str(row.day): row.count for row in info_sessions_daily}
-    nho_dict = {str(row.day): row.count for row in nho_daily}
-    visits_dict = {str(row.day): row.count for row in visits_daily}
-    badges_dict = {str(row.day): row.count for row in badges_daily}
-    fingerprints_dict = {str(row.day): row.count for row in fingerprints_daily}
-    
+        DailyActivityRollup.activity_date >= counts_start,
+        DailyActivityRollup.activity_date <= end_date
+    ).group_by(DailyActivityRollup.activity_date, DailyActivityRollup.entity_type).all()
+    output_keys = {entity_type: key for key, entity_type in COUNTED_ENTITIES}
+    for row in daily_rows:
+        daily_counts[output_keys[row.entity_type]][row.activity_date.isoformat()] = row.count
+
+    def bucket_counts(bucket_start: date, bucket_end: date) -> Dict[str, int]:
+        """Counts per visit type (plus total) for the days bucket_start..bucket_end"""
+        days = [
+            (bucket_start + timedelta(days=offset)).isoformat()
+            for offset in range((bucket_end - bucket_start).days + 1)
+        ]
+        counts = {
+            key: sum(daily_counts[key].get(day, 0) for day in days)
+            for key, _ in COUNTED_ENTITIES
+        }
+        counts["total"] = sum(counts.values())
+        return counts
+
     current_date = start_date
     while current_date <= end_date:
-        date_str = current_date.isoformat()
-        day_info_sessions = info_sessions_dict.get(date_str, 0)
-        day_nho = nho_dict.get(date_str, 0)
-        day_visits = visits_dict.get(date_str, 0)
-        day_badges = badges_dict.get(date_str, 0)
-        day_fingerprints = fingerprints_dict.get(date_str, 0)
-        
         daily_stats.append({
-            "date": date_str,
-            "info_sessions": day_info_sessions,
-            "new_hire_orientations": day_nho,
-            "visits": day_visits,
-            "badges": day_badges,
-            "fingerprints": day_fingerprints,
-            "total": day_info_sessions + day_nho + day_visits + day_badges + day_fingerprints
+            "date": current_date.isoformat(),
+            **bucket_counts(current_date, current_date)
         })
         current_date += timedelta(days=1)
     
-    # Weekly stats (group by week) - optimized
+    # Weekly stats (group by week) - summed from the daily counts
     weekly_stats = []
-    week_start = start_date - timedelta(days=start_date.weekday())
+    week_start = first_week_start
     # Limit to last 52 weeks for performance
     max_weeks = 52
     weeks_count = 0
     while week_start <= end_date and weeks_count < max_weeks:
         week_end = min(week_start + timedelta(days=6), end_date)
-        week_info_sessions = db.query(InfoSession).filter(
-            func.date(InfoSession.created_at) >= week_start,
-            func.date(InfoSession.created_at) <= week_end
-        ).count()
-        week_nho = db.query(NewHireOrientation).filter(
-            func.date(NewHireOrientation.created_at) >= week_start,
-            func.date(NewHireOrientation.created_at) <= week_end
-        ).count()
-        week_visits = db.query(TeamVisit).filter(
-            func.date(TeamVisit.created_at) >= week_start,
-            func.date(TeamVisit.created_at) <= week_end
-        ).count()
-        week_badges = db.query(Badge).filter(
-            func.date(Badge.created_at) >= week_start,
-            func.date(Badge.created_at) <= week_end
-        ).count()
-        week_fingerprints = db.query(Fingerprint).filter(
-            func.date(Fingerprint.created_at) >= week_start,
-            func.date(Fingerprint.created_at) <= week_end
-        ).count()
-        
         weekly_stats.append({
             "week_start": week_start.isoformat(),
             "week_end": week_end.isoformat(),
-            "info_sessions": week_info_sessions,
-            "new_hire_orientations": week_nho,
-            "visits": week_visits,
-            "badges": week_badges,
-            "fingerprints": week_fingerprints,
-            "total": week_info_sessions + week_nho + week_visits + week_badges + week_fingerprints
+            **bucket_counts(week_start, week_end)
         })
         week_start += timedelta(days=7)
         weeks_count += 1
     
-    # Monthly stats
+    # Monthly stats - summed from the daily counts
     monthly_stats = []
-    month_start = start_date.replace(day=1)
+    month_start = first_month_start
     while month_start <= end_date:
-        if month_start.month == 12:
-            month_end = month_start.replace(year=month_start.year + 1, month=1) - timedelta(days=1)
-        else:
-            month_end = month_start.replace(month=month_start.month + 1) - timedelta(days=1)
-        
-        if month_end > end_date:
-            month_end = end_date
-        
-        month_info_sessions = db.query(InfoSession).filter(
-            func.date(InfoSession.created_at) >= month_start,
-            func.date(InfoSession.created_at) <= month_end
-        ).count()
-        month_nho = db.query(NewHireOrientation).filter(
-            func.date(NewHireOrientation.created_at) >= month_start,
-            func.date(NewHireOrientation.created_at) <= month_end
-        ).count()
-        month_visits = db.query(TeamVisit).filter(
-            func.date(TeamVisit.created_at) >= month_start,
-            func.date(TeamVisit.created_at) <= month_end
-        ).count()
-        month_badges = db.query(Badge).filter(
-            func.date(Badge.created_at) >= month_start,
-            func.date(Badge.created_at) <= month_end
-        ).count()
-        month_fingerprints = db.query(Fingerprint).filter(
-            func.date(Fingerprint.created_at) >= month_start,
-            func.date(Fingerprint.created_at) <= month_end
-        ).count()
-        
+        month_end = min(month_start + relativedelta(months=1) - timedelta(days=1), end_date)
         monthly_stats.append({
             "month": month_start.strftime("%Y-%m"),
             "month_start": month_start.isoformat(),
             "month_end": month_end.isoformat(),
-            "info_sessions": month_info_sessions,
-            "new_hire_orientations": month_nho,
-            "visits": month_visits,
-            "badges": month_badges,
-            "fingerprints": month_fingerprints,
-            "total": month_info_sessions + month_nho + month_visits + month_badges + month_fingerprints
+            **bucket_counts(month_start, month_end)
         })
-        
-        if month_start.month == 12:
-            month_start = month_start.replace(year=month_start.year + 1, month=1)
-        else:
-            month_start = month_start.replace(month=month_start.month + 1)
+        month_start += relativedelta(months=1)
     
     # Heatmap data (for calendar view) - reuse daily_stats data
     heatmap_data = []
@@ -388,38 +244,72 @@ async def get_statistics(
     # Time slot distribution
     time_slot_distribution = {}
     time_slots = db.query(
-        InfoSession.time_slot,
-        func.count(InfoSession.id).label('count')
+        DailyActivityRollup.time_slot,
+        func.sum(DailyActivityRollup.count).label('count')
     ).filter(
-        func.date(InfoSession.created_at) >= start_date,
-        func.date(InfoSession.created_at) <= end_date
-    ).group_by(InfoSession.time_slot).all()
+        DailyActivityRollup.entity_type == "info_session",
+        DailyActivityRollup.activity_date >= start_date,
+        DailyActivityRollup.activity_date <= end_date
+    ).group_by(DailyActivityRollup.time_slot).having(func.sum(DailyActivityRollup.count) > 0).all()
     for slot, count in time_slots:
         time_slot_distribution[slot or 'unknown'] = count
     
-    # Recruiter performance
+    # Recruiter performance - one statement for every recruiter: sessions assigned in the
+    # window, completed, and interview duration (started_at -> completed_at) average and p90
+    timed_duration = case(
+        (
+            (InfoSession.status == 'completed') & InfoSession.started_at.isnot(None) & InfoSession.completed_at.isnot(None),
+            minutes_between(db, InfoSession.started_at, InfoSession.completed_at)
+        )
+    )
+    sessions = db.query(
+        InfoSession.assigned_recruiter_id.label('recruiter_id'),
+        InfoSession.status.label('status'),
+        timed_duration.label('duration'),
+        # Share of the recruiter's timed sessions at or below this duration (nearest-rank percentile)
+        func.cume_dist().over(
+            partition_by=(InfoSession.assigned_recruiter_id, timed_duration.is_(None)),
+            order_by=timed_duration
+        ).label('cume_dist')
+    ).filter(
+        InfoSession.assigned_recruiter_id.isnot(None),
+        local_date_range_filter(db, InfoSession.created_at, start_date, end_date)
+    ).subquery()
+    per_recruiter = db.query(
+        sessions.c.recruiter_id,
+        func.count().label('assigned'),
+        func.sum(case((sessions.c.status == 'completed', 1), else_=0)).label('completed'),
+        func.avg(sessions.c.duration).label('average_duration'),
+        func.min(case((sessions.c.cume_dist >= 0.9, sessions.c.duration))).label('p90_duration')
+    ).group_by(sessions.c.recruiter_id).subquery()
+    recruiter_rows = db.query(
+        Recruiter.id,
+        Recruiter.name,
+        Recruiter.is_active,
+        per_recruiter.c.assigned,
+        per_recruiter.c.completed,
+        per_recruiter.c.average_duration,
+        per_recruiter.c.p90_duration
+    ).outerjoin(
+        per_recruiter, per_recruiter.c.recruiter_id == Recruiter.id
+    ).filter(
+        # Inactive recruiters only appear for windows in which they had sessions
+        (Recruiter.is_active == True) | (per_recruiter.c.assigned > 0)
+    ).order_by(Recruiter.id).all()
+
     recruiter_performance = []
-    from app.models.recruiter import Recruiter
-    recruiters = db.query(Recruiter).all()
-    for recruiter in recruiters:
-        assigned_sessions = db.query(InfoSession).filter(
-            InfoSession.assigned_recruiter_id == recruiter.id,
-            func.date(InfoSession.created_at) >= start_date,
-            func.date(InfoSession.created_at) <= end_date
-        ).count()
-        completed_sessions = db.query(InfoSession).filter(
-            InfoSession.assigned_recruiter_id == recruiter.id,
-            InfoSession.status == 'completed',
-            func.date(InfoSession.created_at) >= start_date,
-            func.date(InfoSession.created_at) <= end_date
-        ).count()
-        
+    for row in recruiter_rows:
+        assigned_sessions = row.assigned or 0
+        completed_sessions = row.completed or 0
         recruiter_performance.append({
-            "recruiter_id": recruiter.id,
-            "recruiter_name": recruiter.name,
+            "recruiter_id": row.id,
+            "recruiter_name": row.name,
+            "is_active": bool(row.is_active),
             "assigned_sessions": assigned_sessions,
             "completed_sessions": completed_sessions,
-            "completion_rate": (completed_sessions / assigned_sessions * 100) if assigned_sessions > 0 else 0
+            "completion_rate": (completed_sessions / assigned_sessions * 100) if assigned_sessions > 0 else 0,
+            "average_duration_minutes": round(row.average_duration, 1) if row.average_duration is not None else None,
+            "p90_duration_minutes": round(row.p90_duration, 1) if row.p90_duration is not None else None
         })
     
     return StatisticsResponse(
@@ -1,5 +1,5 @@
 from app.models.info_session import InfoSession, InfoSessionStep
-from app.models.exclusion_list import ExclusionList
+from app.models.exclusion_list import ExclusionList, ExclusionListVersion
 from app.models.announcement import Announcement
 from app.models.recruiter import Recruiter
 from app.models.info_session_config import InfoSessionConfig
@@ -8,6 +8,7 @@ from app.models.row_template import RowTemplate, ColumnDefinition
 from app.models.user import User, UserRole
 from app.models.visit import NewHireOrientation, NewHireOrientationStep, Badge, Fingerprint, TeamVisit
 from app.models.event import Event, EventAttendee
+from app.models.daily_activity_rollup import DailyActivityRollup
 
-__all__ = ["InfoSession", "InfoSessionStep", "ExclusionList", "Announcement", "Recruiter", "InfoSessionConfig", "NewHireOrientationConfig", "RowTemplate", "ColumnDefinition", "User", "UserRole", "NewHireOrientation", "NewHireOrientationStep", "Badge", "Fingerprint", "TeamVisit", "Event", "EventAttendee"]
+__all__ = ["InfoSession", "InfoSessionStep", "ExclusionList", "ExclusionListVersion", "Announcement", "Recruiter", "InfoSessionConfig", "NewHireOrientationConfig", "RowTemplate", "ColumnDefinition", "User", "UserRole", "NewHireOrientation", "NewHireOrientationStep", "Badge", "Fingerprint", "TeamVisit", "Event", "EventAttendee", "DailyActivityRollup"]
 
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Float, Date, UniqueConstraint
+from app.database import Base
+
+class DailyActivityRollup(Base):
+    """
+    Per-day activity counts for the statistics dashboard
+    Maintained on every ORM write by app.services.activity_rollup; rebuild with rebuild_activity_rollup.py
+    """
+    __tablename__ = "daily_activity_rollup"
+    __table_args__ = (
+        UniqueConstraint("activity_date", "entity_type", "status", "time_slot", "recruiter_id", name="uq_daily_activity_rollup_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    activity_date = Column(Date, nullable=False, index=True)  # Miami-local date of created_at
+    entity_type = Column(String(50), nullable=False)  # info_session, new_hire_orientation, team_visit, badge, fingerprint
+    status = Column(String(50), nullable=False, default="unknown")
+    time_slot = Column(String(20), nullable=False, default="unknown")
+    recruiter_id = Column(Integer, nullable=False, default=0)  # 0 when unassigned
+    count = Column(Integer, nullable=False, default=0)
+    rejected_count = Column(Integer, nullable=False, default=0)
+    # Completed rows with started_at and completed_at, for average completion time
+    timed_count = Column(Integer, nullable=False, default=0)
+    timed_minutes = Column(Float, nullable=False, default=0.0)
@@ -11,6 +11,23 @@ class ExclusionList(Base):
     dob = Column(Date, nullable=True)  # Date of Birth
     ssn = Column(String(20), nullable=True)  # Social Security Number
     notes = Column(Text, nullable=True)
+    row_hash = Column(String(40), nullable=True, index=True)  # sha1 of name/code/dob/ssn, used by merge uploads
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+class ExclusionListVersion(Base):
+    """One record per upload/clear of the exclusion list"""
+    __tablename__ = "exclusion_list_versions"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    mode = Column(String(20), nullable=False)  # replace, merge, clear
+    filename = Column(String(255), nullable=True)
+    uploaded_by = Column(String(255), nullable=True)  # admin email
+    total_rows = Column(Integer, default=0)  # entries in the list after this version
+    added = Column(Integer, default=0)
+    removed = Column(Integer, default=0)
+    changed = Column(Integer, default=0)
+    unchanged = Column(Integer, default=0)
+    content_hash = Column(String(40), nullable=True)  # sha1 of the sorted row hashes
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
@@ -1,22 +1,44 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, ForeignKey, Text, Index
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from datetime import datetime
 from app.database import Base
+from app.utils.date_utils import miami_today
+
+def normalize_email(email: str) -> str:
+    """Lowercased, trimmed email used for indexed duplicate lookups"""
+    return (email or '').strip().lower()
+
+def build_identity_key(first_name: str, last_name: str, email: str) -> str:
+    """Normalized name+email key used to detect repeat registrations"""
+    return f"{(first_name or '').strip().lower()}_{(last_name or '').strip().lower()}_{(email or '').strip().lower()}"
 
 class InfoSession(Base):
     __tablename__ = "info_sessions"
+    # Fetch server defaults (created_at) in the INSERT itself so registration needs no refresh
+    __mapper_args__ = {"eager_defaults": True}
+    # Duplicate-registration check: same email, same Miami day, same time slot
+    __table_args__ = (
+        Index("ix_info_sessions_email_date_slot", "email_normalized", "service_date", "time_slot"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     first_name = Column(String(100), nullable=False)
     last_name = Column(String(100), nullable=False)
     email = Column(String(255), nullable=False)
+    email_normalized = Column(String(255), nullable=True)  # normalize_email(email), kept in sync by validate_identity_fields
+    identity_key = Column(String(500), nullable=True, index=True)  # build_identity_key(first_name, last_name, email), kept in sync by validate_identity_fields
     phone = Column(String(20), nullable=False)
     zip_code = Column(String(10), nullable=False)  # New field
     session_type = Column(String(50), nullable=False)  # new-hire or reactivation
     time_slot = Column(String(20), nullable=False)  # 8:30 AM or 1:30 PM
     is_in_exclusion_list = Column(Boolean, default=False)
     exclusion_warning_shown = Column(Boolean, default=False)
+    # Exclusion list match captured at registration (refreshed when a new list is uploaded)
+    exclusion_match_id = Column(Integer, nullable=True)  # exclusion_list.id - no FK, the list is replaced on upload
+    exclusion_match_name = Column(String(255), nullable=True)
+    exclusion_match_code = Column(String(50), nullable=True)
+    exclusion_match_ssn = Column(String(20), nullable=True)
     status = Column(String(50), default="registered")  # registered, in-progress, initiated, answers_submitted, interview_in_progress, completed
     
     # Document status checkboxes
@@ -29,7 +51,7 @@ class InfoSession(Base):
     questions = Column(Boolean, default=False)
 
     # Recruiter assignment
-    assigned_recruiter_id = Column(Integer, ForeignKey("recruiters.id"), nullable=True)
+    assigned_recruiter_id = Column(Integer, ForeignKey("recruiters.id"), nullable=True, index=True)
     
     # Time tracking
     started_at = Column(DateTime(timezone=True), nullable=True)  # When recruiter starts with visitor
@@ -50,14 +72,27 @@ class InfoSession(Base):
     question_7_response = Column(Text, nullable=True)
     question_8_response = Column(Text, nullable=True)
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    service_date = Column(Date, default=miami_today, index=True)  # Miami-local date of created_at
     
     # Relationship with steps
     steps = relationship("InfoSessionStep", back_populates="info_session", cascade="all, delete-orphan")
 
+    # Assigned recruiter (list endpoints load it with selectinload to avoid per-row lookups)
+    assigned_recruiter = relationship("Recruiter")
+
+    @validates("first_name", "last_name", "email")
+    def validate_identity_fields(self, key, value):
+        fields = {"first_name": self.first_name, "last_name": self.last_name, "email": self.email, key: value}
+        self.identity_key = build_identity_key(fields["first_name"], fields["last_name"], fields["email"])
+        if key == "email":
+            self.email_normalized = normalize_email(value)
+        return value
+
 class InfoSessionStep(Base):
     __tablename__ = "info_session_steps"
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, index=True)
     info_session_id = Column(Integer, ForeignKey("info_sessions.id"), nullable=False)
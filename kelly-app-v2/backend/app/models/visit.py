@@ -1,15 +1,22 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, ForeignKey, Text, Index
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from app.database import Base
+from app.models.info_session import normalize_email
+from app.utils.date_utils import miami_today
 
 class NewHireOrientation(Base):
     __tablename__ = "new_hire_orientations"
+    # Duplicate-registration check: same email, same Miami day, same time slot
+    __table_args__ = (
+        Index("ix_new_hire_orientations_email_date_slot", "email_normalized", "service_date", "time_slot"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     first_name = Column(String(100), nullable=False)
     last_name = Column(String(100), nullable=False)
     email = Column(String(255), nullable=False)
+    email_normalized = Column(String(255), nullable=True)  # normalize_email(email), kept in sync by validate_email
     phone = Column(String(20), nullable=False)
     time_slot = Column(String(20), nullable=False)
     status = Column(String(50), default="in-progress")  # registered, in-progress, completed
@@ -25,12 +32,18 @@ class NewHireOrientation(Base):
     completed_at = Column(DateTime(timezone=True), nullable=True)
     duration_minutes = Column(Integer, nullable=True)
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    service_date = Column(Date, default=miami_today, index=True)  # Miami-local date of created_at
     
     # Relationship with steps
     steps = relationship("NewHireOrientationStep", back_populates="orientation", cascade="all, delete-orphan")
 
+    @validates("email")
+    def validate_email(self, key, email):
+        self.email_normalized = normalize_email(email)
+        return email
+
 class NewHireOrientationStep(Base):
     __tablename__ = "new_hire_orientation_steps"
     
@@ -57,7 +70,7 @@ class Badge(Base):
     appointment_time = Column(String(20), nullable=False)
     status = Column(String(50), default="registered")
     assigned_recruiter_id = Column(Integer, ForeignKey("recruiters.id"), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
 class Fingerprint(Base):
@@ -73,7 +86,7 @@ class Fingerprint(Base):
     fingerprint_type = Column(String(50), nullable=False)  # regular or dcf
     status = Column(String(50), default="registered")
     assigned_recruiter_id = Column(Integer, ForeignKey("recruiters.id"), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
 class TeamVisit(Base):
@@ -89,7 +102,7 @@ class TeamVisit(Base):
     reason = Column(Text, nullable=False)
     status = Column(String(50), default="pending")  # pending, notified, completed
     notified_at = Column(DateTime(timezone=True), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
 class MeetGreet(Base):
@@ -104,7 +117,7 @@ class MeetGreet(Base):
     inquiry_detail = Column(Text, nullable=True)
     subparty_suggestion = Column(Text, nullable=True)
     status = Column(String(50), default="registered")  # registered, in-progress, completed
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
 
@@ -1,4 +1,4 @@
 # Services
 
-
-
+# Registered on import of any service (including from scripts) so every write keeps the statistics rollup current
+from app.services import activity_rollup
@@ -0,0 +1,204 @@
+"""
+Service for the daily_activity_rollup table behind the statistics dashboard
+Every ORM flush that inserts, updates or deletes a visit row moves that row's contribution
+between rollup keys on the same connection, so the rollup commits or rolls back with the write
+"""
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, MANYTOONE
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Tuple
+import pytz
+
+from app.database import SessionLocal
+from app.models.daily_activity_rollup import DailyActivityRollup
+from app.models.info_session import InfoSession
+from app.models.visit import NewHireOrientation, TeamVisit, Badge, Fingerprint
+from app.utils.date_utils import miami_today, to_miami_date
+
+ROLLUP_ENTITIES = {
+    InfoSession: "info_session",
+    NewHireOrientation: "new_hire_orientation",
+    TeamVisit: "team_visit",
+    Badge: "badge",
+    Fingerprint: "fingerprint",
+}
+
+# Columns that decide a row's rollup key and measures (each model has a subset)
+TRACKED_ATTRIBUTES = ("created_at", "status", "time_slot", "assigned_recruiter_id", "rejected", "started_at", "completed_at")
+KEY_COLUMNS = ("activity_date", "entity_type", "status", "time_slot", "recruiter_id")
+MEASURE_COLUMNS = ("count", "rejected_count", "timed_count", "timed_minutes")
+REBUILD_BATCH_SIZE = 5000
+
+RollupKey = Tuple
+Measures = List[float]
+
+def tracked_attributes(model) -> List[str]:
+    """The TRACKED_ATTRIBUTES this model actually has"""
+    return [name for name in TRACKED_ATTRIBUTES if name in model.__table__.columns]
+
+def _as_utc(value: datetime) -> datetime:
+    """Naive timestamps are UTC (as SQLite returns them)"""
+    return pytz.UTC.localize(value) if value.tzinfo is None else value
+
+def contribution(entity_type: str, values: Dict) -> Tuple[RollupKey, Measures]:
+    """Rollup key and measures (count, rejected, timed count, timed minutes) of one row"""
+    created_at = values.get("created_at")
+    status = values.get("status") or "unknown"
+    key = (
+        to_miami_date(created_at) if created_at else miami_today(),
+        entity_type,
+        status,
+        values.get("time_slot") or "unknown",
+        values.get("assigned_recruiter_id") or 0,
+    )
+    started_at, completed_at = values.get("started_at"), values.get("completed_at")
+    timed = status == "completed" and started_at is not None and completed_at is not None
+    minutes = (_as_utc(completed_at) - _as_utc(started_at)).total_seconds() / 60 if timed else 0.0
+    return key, [1, 1 if values.get("rejected") else 0, 1 if timed else 0, minutes]
+
+def _related_ids(obj, attributes: List[str]) -> Dict:
+    """Foreign keys set through a many-to-one relationship (the flush copies them to the column later)"""
+    state = inspect(obj)
+    values = {}
+    for relationship in state.mapper.relationships:
+        if relationship.direction is not MANYTOONE:
+            continue
+        history = state.attrs[relationship.key].history
+        if not history.added:
+            continue
+        related = history.added[0]
+        for local, remote in relationship.local_remote_pairs:
+            if local.key in attributes:
+                values[local.key] = getattr(related, remote.key) if related is not None else None
+    return values
+
+def _pending_values(obj, attributes: List[str]) -> Dict:
+    """Values a new row will be inserted with (scalar column defaults applied)"""
+    columns = type(obj).__table__.columns
+    values = {}
+    for name in attributes:
+        value = getattr(obj, name)
+        default = columns[name].default
+        if value is None and default is not None and default.is_scalar:
+            value = default.arg
+        values[name] = value
+    values.update(_related_ids(obj, attributes))
+    return values
+
+def _flushed_and_pending_values(session: Session, obj, attributes: List[str]) -> Tuple[Dict, Dict]:
+    """
+    (values in the database, values after this flush) of a persistent row
+    Attribute history covers loaded attributes; expired or unloaded ones are read back in one query
+    """
+    state = inspect(obj)
+    old, new, missing = {}, {}, []
+    for name in attributes:
+        history = state.attrs[name].history
+        if history.deleted:
+            old[name] = history.deleted[0]
+        elif history.unchanged:
+            old[name] = history.unchanged[0]
+        else:
+            missing.append(name)
+        if history.added:
+            new[name] = history.added[0]
+    new.update(_related_ids(obj, attributes))
+    if missing:
+        table = type(obj).__table__
+        row = session.connection().execute(
+            select(*[table.c[name] for name in missing]).where(table.c.id == state.identity[0])
+        ).first()
+        if row is not None:
+            old.update(zip(missing, row))
+    return old, {**old, **new}
+
+def _histories(obj, attributes: List[str]):
+    """Change history of the tracked columns and of many-to-one relationships that set them"""
+    state = inspect(obj)
+    yield from (state.attrs[name].history for name in attributes)
+    for relationship in state.mapper.relationships:
+        if relationship.direction is MANYTOONE and any(column.key in attributes for column in relationship.local_columns):
+            yield state.attrs[relationship.key].history
+
+def _add(deltas: Dict[RollupKey, Measures], key: RollupKey, measures: Measures, sign: int):
+    totals = deltas[key]
+    for i, value in enumerate(measures):
+        totals[i] += sign * value
+
+def apply_deltas(session: Session, deltas: Dict[RollupKey, Measures]):
+    """Add measure deltas to their rollup rows (insert-or-increment) on the session's connection"""
+    rows = [
+        {**dict(zip(KEY_COLUMNS, key)), **dict(zip(MEASURE_COLUMNS, measures))}
+        for key, measures in deltas.items()
+        if any(measures)
+    ]
+    if not rows:
+        return
+    connection = session.connection()
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    table = DailyActivityRollup.__table__
+    statement = insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c[name] for name in KEY_COLUMNS],
+        set_={name: table.c[name] + statement.excluded[name] for name in MEASURE_COLUMNS},
+    )
+    connection.execute(statement, rows)
+
+@event.listens_for(SessionLocal, "before_flush")
+def _update_rollup(session: Session, flush_context, instances):
+    deltas: Dict[RollupKey, Measures] = defaultdict(lambda: [0, 0, 0, 0.0])
+    for obj in session.new:
+        entity_type = ROLLUP_ENTITIES.get(type(obj))
+        if entity_type:
+            key, measures = contribution(entity_type, _pending_values(obj, tracked_attributes(type(obj))))
+            _add(deltas, key, measures, 1)
+    for obj in session.dirty:
+        entity_type = ROLLUP_ENTITIES.get(type(obj))
+        if not entity_type or obj in session.deleted:
+            continue
+        attributes = tracked_attributes(type(obj))
+        if not any(history.has_changes() for history in _histories(obj, attributes)):
+            continue
+        old, new = _flushed_and_pending_values(session, obj, attributes)
+        old_key, old_measures = contribution(entity_type, old)
+        new_key, new_measures = contribution(entity_type, new)
+        _add(deltas, old_key, old_measures, -1)
+        _add(deltas, new_key, new_measures, 1)
+    for obj in session.deleted:
+        entity_type = ROLLUP_ENTITIES.get(type(obj))
+        if entity_type:
+            old, _ = _flushed_and_pending_values(session, obj, tracked_attributes(type(obj)))
+            key, measures = contribution(entity_type, old)
+            _add(deltas, key, measures, -1)
+    apply_deltas(session, deltas)
+
+def rebuild_activity_rollup(db: Session) -> int:
+    """
+    Recompute the whole rollup from the visit tables (caller commits)
+    Returns the number of visit rows counted
+    """
+    db.query(DailyActivityRollup).delete(synchronize_session=False)
+    totals: Dict[RollupKey, Measures] = defaultdict(lambda: [0, 0, 0, 0.0])
+    counted = 0
+    for model, entity_type in ROLLUP_ENTITIES.items():
+        attributes = tracked_attributes(model)
+        columns = [getattr(model, name) for name in attributes]
+        for row in db.query(*columns).yield_per(REBUILD_BATCH_SIZE):
+            key, measures = contribution(entity_type, dict(zip(attributes, row)))
+            _add(totals, key, measures, 1)
+            counted += 1
+    rows = [
+        {**dict(zip(KEY_COLUMNS, key)), **dict(zip(MEASURE_COLUMNS, measures))}
+        for key, measures in totals.items()
+    ]
+    for i in range(0, len(rows), REBUILD_BATCH_SIZE):
+        db.execute(DailyActivityRollup.__table__.insert(), rows[i:i + REBUILD_BATCH_SIZE])
+    return counted
+
+def rollup_is_empty(db: Session) -> bool:
+    """True when the rollup has never been built"""
+    return db.query(DailyActivityRollup.id).first() is None
@@ -0,0 +1,109 @@
+"""
+Background worker that assigns recruiters to unassigned info sessions
+Runs on a short schedule (or when woken) so the recruiter and staff list
+endpoints stay read-only and their latency does not depend on the backlog
+"""
+from sqlalchemy.orm import Session
+from typing import List, Optional
+import threading
+
+from app.database import SessionLocal
+from app.models.info_session import InfoSession
+from app.models.recruiter import Recruiter
+from app.services.recruiter_service import get_next_recruiter, recruiter_assignment_lock
+from app.utils.date_utils import miami_today
+
+SWEEP_INTERVAL_SECONDS = 15
+SWEEP_BATCH_SIZE = 200
+SWEEP_LOCK_CHUNK = 10  # sessions assigned per hold of the assignment lock
+
+_wake = threading.Event()
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+def assign_unassigned_sessions(db: Session, batch_size: int = SWEEP_BATCH_SIZE) -> List[int]:
+    """
+    Assign a recruiter to up to batch_size unassigned sessions (oldest first)
+    The assignment lock is taken per chunk of SWEEP_LOCK_CHUNK sessions and each chunk is
+    committed, so registrations are never stalled behind a whole batch
+    Returns the ids of the sessions that got a recruiter
+    """
+    unassigned_ids = [session_id for (session_id,) in db.query(InfoSession.id).filter(
+        InfoSession.assigned_recruiter_id == None
+    ).order_by(InfoSession.id).limit(batch_size)]
+
+    assigned_ids = []
+    for i in range(0, len(unassigned_ids), SWEEP_LOCK_CHUNK):
+        with recruiter_assignment_lock(db):
+            # Re-read under the lock: a step completion may have assigned some meanwhile
+            chunk = db.query(InfoSession).filter(
+                InfoSession.id.in_(unassigned_ids[i:i + SWEEP_LOCK_CHUNK]),
+                InfoSession.assigned_recruiter_id == None
+            ).order_by(InfoSession.id).all()
+            for session in chunk:
+                recruiter = get_next_recruiter(db, session.time_slot, session.service_date or miami_today())
+                if not recruiter:
+                    # Fallback: only assign to available recruiters, never to busy ones
+                    recruiter = db.query(Recruiter).filter(Recruiter.is_active == True, Recruiter.status == "available").first()
+                if recruiter:
+                    session.assigned_recruiter_id = recruiter.id
+                    assigned_ids.append(session.id)
+                    print(f"✅ Auto-assigned session {session.id} ({session.first_name} {session.last_name}) to {recruiter.name}")
+                    # Flush so the next session in this chunk sees the updated loads
+                    db.flush()
+            db.commit()
+    return assigned_ids
+
+def run_sweep() -> int:
+    """Assign every unassigned session in batches and push the changes to the live feed"""
+    # Imported here: the API module imports this service
+    from app.api.info_session import notify_session_changed
+
+    total = 0
+    db = SessionLocal()
+    try:
+        while True:
+            assigned_ids = assign_unassigned_sessions(db)
+            for session_id in assigned_ids:
+                notify_session_changed(db, session_id)
+            total += len(assigned_ids)
+            if len(assigned_ids) < SWEEP_BATCH_SIZE:
+                break
+    except Exception as e:
+        db.rollback()
+        print(f"⚠️ Recruiter assignment sweep failed: {e}")
+    finally:
+        db.close()
+    if total:
+        print(f"✅ Auto-assigned {total} unassigned sessions")
+    return total
+
+def request_sweep():
+    """Wake the worker now instead of waiting for the next scheduled run"""
+    _wake.set()
+
+def _run():
+    while not _stop.is_set():
+        run_sweep()
+        _wake.wait(SWEEP_INTERVAL_SECONDS)
+        _wake.clear()
+
+def start_assignment_worker():
+    """Start the background sweep thread (idempotent)"""
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="recruiter-assignment-worker", daemon=True)
+    _thread.start()
+    print(f"🧵 Recruiter assignment worker started (every {SWEEP_INTERVAL_SECONDS}s)")
+
+def stop_assignment_worker(timeout: float = 5.0):
+    """Stop the background sweep thread and wait for the current run to finish"""
+    global _thread
+    if _thread is None:
+        return
+    _stop.set()
+    _wake.set()
+    _thread.join(timeout)
+    _thread = None
@@ -1,60 +1,335 @@
 """
 Service for checking exclusion list
+Screening runs against an in-memory index of the list, rebuilt when the list changes
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
-from app.models.exclusion_list import ExclusionList
-from typing import List, Optional
+from sqlalchemy import or_, update
+from app.models.exclusion_list import ExclusionList, ExclusionListVersion
+from app.models.info_session import InfoSession
+from app.services.name_matching import FuzzyNameIndex, FUZZY_MIN_SCORE, FUZZY_MAX_RESULTS
+from app.utils.date_utils import miami_today
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+import csv
+import hashlib
+import io
+import threading
 
-def check_name_in_exclusion_list(db: Session, first_name: str, last_name: str) -> List[ExclusionList]:
+import pandas as pd
+
+# Completed registrations older than this are left alone by rescreen_info_sessions
+RESCREEN_DAYS_BACK = 30
+
+class ExclusionEntry(NamedTuple):
+    """Read-only copy of an exclusion_list row held by the index"""
+    id: int
+    name: str
+    code: Optional[str]
+    dob: Optional[date]
+    ssn: Optional[str]
+    notes: Optional[str]
+
+class ExclusionIndex:
+    """
+    Immutable snapshot of the exclusion list with an inverted index
+    name token -> entry ids, and token trigram -> tokens to find tokens containing a word.
+    A word without whitespace can only occur inside a single whitespace-separated token,
+    so the index yields a superset of the substring matches, which are then verified.
+    """
+
+    def __init__(self, entries: Iterable[ExclusionEntry]):
+        self.entries: Dict[int, ExclusionEntry] = {entry.id: entry for entry in sorted(entries, key=lambda e: e.id)}
+        self.names: Dict[int, str] = {entry_id: entry.name.upper() for entry_id, entry in self.entries.items()}
+        token_ids: Dict[str, Set[int]] = defaultdict(set)
+        for entry_id, name in self.names.items():
+            for token in name.split():
+                token_ids[token].add(entry_id)
+        token_grams: Dict[str, Set[str]] = defaultdict(set)
+        for token in token_ids:
+            for gram in _trigrams(token):
+                token_grams[gram].add(token)
+        self.token_ids: Dict[str, FrozenSet[int]] = {token: frozenset(ids) for token, ids in token_ids.items()}
+        self.token_grams: Dict[str, FrozenSet[str]] = {gram: frozenset(tokens) for gram, tokens in token_grams.items()}
+        # Fuzzy/phonetic postings address entries by position in id order
+        self.entry_ids: List[int] = list(self.entries)
+        self.fuzzy = FuzzyNameIndex([self.entries[entry_id].name for entry_id in self.entry_ids])
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _ids_containing(self, word: str) -> Set[int]:
+        """Ids of entries with a token that contains word"""
+        if len(word) >= 3:
+            gram_sets = sorted((self.token_grams.get(gram, frozenset()) for gram in _trigrams(word)), key=len)
+            tokens = set(gram_sets[0]).intersection(*gram_sets[1:])
+        else:
+            tokens = self.token_ids.keys()
+        ids: Set[int] = set()
+        for token in tokens:
+            if word in token:
+                ids |= self.token_ids[token]
+        return ids
+
+    def match(self, first_name_upper: str, last_name_upper: str) -> List[ExclusionEntry]:
+        """Entries whose uppercase name contains both strings, in id order"""
+        words = set(first_name_upper.split()) | set(last_name_upper.split())
+        candidates: Optional[Set[int]] = None
+        # Longest words first: they have the fewest postings
+        for word in sorted(words, key=len, reverse=True):
+            ids = self._ids_containing(word)
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return []
+        if candidates is None:
+            candidates = set(self.entries)
+        return [
+            self.entries[entry_id]
+            for entry_id in sorted(candidates)
+            if first_name_upper in self.names[entry_id] and last_name_upper in self.names[entry_id]
+        ]
+
+    def fuzzy_match(
+        self,
+        first_name: str,
+        last_name: str,
+        min_score: float = FUZZY_MIN_SCORE,
+        limit: int = FUZZY_MAX_RESULTS
+    ) -> List[Tuple[ExclusionEntry, float]]:
+        """Entries that look or sound like the name, with scores, best first"""
+        return [
+            (self.entries[self.entry_ids[match.position]], match.score)
+            for match in self.fuzzy.search(first_name, last_name, min_score, limit)
+        ]
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+# Current snapshot; replaced as a whole (single process, so a module global is enough)
+_index: Optional[ExclusionIndex] = None
+_index_lock = threading.Lock()
+
+def build_exclusion_index(db: Session) -> ExclusionIndex:
+    """Read the exclusion list visible to this session (including its flushed, uncommitted changes)"""
+    rows = db.query(
+        ExclusionList.id, ExclusionList.name, ExclusionList.code,
+        ExclusionList.dob, ExclusionList.ssn, ExclusionList.notes
+    ).all()
+    return ExclusionIndex(ExclusionEntry(*row) for row in rows)
+
+def swap_exclusion_index(index: ExclusionIndex):
+    """Make index the one used for screening (call after the list change is committed)"""
+    global _index
+    _index = index
+    print(f"🗂️ Exclusion index ready: {len(index)} entries, {len(index.token_ids)} tokens")
+
+def rebuild_exclusion_index(db: Session) -> ExclusionIndex:
+    """Build a fresh index from the database and swap it in"""
+    index = build_exclusion_index(db)
+    swap_exclusion_index(index)
+    return index
+
+def get_exclusion_index(db: Session) -> ExclusionIndex:
+    """Current index, built on first use if startup did not build it"""
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                rebuild_exclusion_index(db)
+    return _index
+
+def check_name_in_exclusion_list(
+    db: Session,
+    first_name: str,
+    last_name: str,
+    index: Optional[ExclusionIndex] = None
+) -> List[ExclusionEntry]:
     """
     Check if a name is in the exclusion list
-    Returns list of matching records
+    Returns the entries whose name contains both the first and the last name
     Compares names case-insensitively (names in DB are stored in uppercase)
     """
     if not first_name or not last_name:
         print(f"⚠️ Exclusion check skipped: first_name='{first_name}', last_name='{last_name}'")
         return []
 
+    if index is None:
+        index = get_exclusion_index(db)
+    matches = screen_name(index, first_name, last_name)
+    print(f"🔍 Exclusion index: '{first_name.strip().upper()} {last_name.strip().upper()}' -> {len(matches)} matches")
+    return matches
+
+def screen_name(index: ExclusionIndex, first_name: str, last_name: str) -> List[ExclusionEntry]:
+    """Exact exclusion check against an index, without logging (used for batch re-screens)"""
+    if not first_name or not last_name:
+        return []
     # Normalize names for comparison - convert to uppercase to match DB storage
-    first_name_upper = first_name.strip().upper()
-    last_name_upper = last_name.strip().upper()
-    full_name_upper = f"{first_name_upper} {last_name_upper}"
-
-    print(f"🔍 Searching exclusion list:")
-    print(f"   Input: '{first_name}' '{last_name}'")
-    print(f"   Normalized: '{first_name_upper}' '{last_name_upper}'")
-    print(f"   Full name: '{full_name_upper}'")
-
-    # Check total records in DB
-    total_count = db.query(ExclusionList).count()
-    print(f"   Total exclusion records in DB: {total_count}")
-
-    # Search for matches - names in DB are stored in uppercase
-    # Check if first and last name match any record
-    matches = db.query(ExclusionList).filter(
-        or_(
-            func.upper(ExclusionList.name).like(f"%{first_name_upper}%"),
-            func.upper(ExclusionList.name).like(f"%{last_name_upper}%"),
-            func.upper(ExclusionList.name).like(f"%{full_name_upper}%")
-        )
-    ).all()
+    return index.match(first_name.strip().upper(), last_name.strip().upper())
+
+def find_similar_exclusion_entries(
+    db: Session,
+    first_name: str,
+    last_name: str,
+    min_score: float = FUZZY_MIN_SCORE,
+    limit: int = FUZZY_MAX_RESULTS
+) -> List[Tuple[ExclusionEntry, float]]:
+    """
+    Fuzzy/phonetic screening for names the exact check misses
+    (typos, accents, hyphenated surnames, swapped order). Returns ranked (entry, score)
+    pairs with score in [0, 1]; exact matches are included and score highest.
+    """
+    if not (first_name or "").strip() and not (last_name or "").strip():
+        return []
+    return get_exclusion_index(db).fuzzy_match(first_name, last_name, min_score, limit)
+
+def _clean_text_column(df: pd.DataFrame, column: str) -> pd.Series:
+    """Stripped strings with blanks, NaN and 'nan' turned into None (vectorized)"""
+    if column not in df.columns:
+        return pd.Series([None] * len(df), index=df.index, dtype=object)
+    values = df[column]
+    text = values.astype(str).str.strip()
+    keep = values.notna() & (text != "") & (text != "nan")
+    return text.astype(object).where(keep, None)
+
+def normalize_exclusion_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Turn an uploaded sheet (columns already lowercased) into rows ready to insert
+    name (uppercase, required), code, dob (date) and ssn, with None for missing values
+    """
+    frame = pd.DataFrame({
+        "name": _clean_text_column(df, "name").str.upper(),
+        "code": _clean_text_column(df, "code"),
+        "dob": pd.Series([None] * len(df), index=df.index, dtype=object),
+        "ssn": _clean_text_column(df, "ssn"),
+    })
+    if "dob" in df.columns:
+        # Excel dates arrive as datetimes, text dates are parsed; anything else is left blank
+        dob = pd.to_datetime(df["dob"], errors="coerce", format="mixed")
+        frame["dob"] = dob.dt.date.astype(object).where(dob.notna(), None)
+    frame = frame[frame["name"].notna()].reset_index(drop=True)
+    frame["row_hash"] = [
+        exclusion_row_hash(name, code, dob_value, ssn)
+        for name, code, dob_value, ssn in zip(frame["name"], frame["code"], frame["dob"], frame["ssn"])
+    ]
+    return frame
+
+def exclusion_row_hash(name: str, code: Optional[str], dob: Optional[date], ssn: Optional[str]) -> str:
+    """Content hash of an exclusion entry (what merge uploads compare)"""
+    parts = [name or "", code or "", dob.isoformat() if dob else "", ssn or ""]
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+EXCLUSION_COLUMNS = ["name", "code", "dob", "ssn", "row_hash"]
+
+def _insert_exclusion_rows(db: Session, frame: pd.DataFrame):
+    """COPY on PostgreSQL, a single executemany elsewhere"""
+    if frame.empty:
+        return
+    if db.get_bind().dialect.name == "postgresql":
+        buffer = io.StringIO()
+        frame[EXCLUSION_COLUMNS].to_csv(buffer, index=False, header=False, quoting=csv.QUOTE_MINIMAL)
+        buffer.seek(0)
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY exclusion_list ({', '.join(EXCLUSION_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        finally:
+            cursor.close()
+    else:
+        db.execute(ExclusionList.__table__.insert(), frame[EXCLUSION_COLUMNS].to_dict("records"))
+
+def bulk_load_exclusion_list(db: Session, frame: pd.DataFrame) -> Dict[str, int]:
+    """
+    Replace all exclusion_list rows inside the session's transaction
+    DELETE (not TRUNCATE, so readers are never blocked and keep seeing the old list
+    until commit) followed by a bulk insert. Does not commit. Returns the diff counts.
+    """
+    removed = db.query(ExclusionList).delete(synchronize_session=False)
+    _insert_exclusion_rows(db, frame)
+    return {"added": len(frame), "removed": removed, "changed": 0, "unchanged": 0}
+
+def merge_exclusion_list(db: Session, frame: pd.DataFrame) -> Dict[str, int]:
+    """
+    Apply only the difference between the uploaded rows and the current list
+    Rows are compared by content hash (duplicates count). A removed and an added row
+    with the same name, DOB and SSN are one changed entry, updated in place so it
+    keeps its id and created_at. Does not commit. Returns the diff counts.
+    """
+    current = db.query(
+        ExclusionList.id, ExclusionList.name, ExclusionList.code,
+        ExclusionList.dob, ExclusionList.ssn, ExclusionList.row_hash
+    ).order_by(ExclusionList.id).all()
 
-    print(f"   Initial matches (before filtering): {len(matches)}")
-    for match in matches[:5]:  # Show first 5
-        print(f"      - {match.name}")
+    # Unmatched uploaded rows per hash, consumed by identical current rows
+    pending = Counter(frame["row_hash"])
+    removed_rows = []
+    for row in current:
+        row_hash = row.row_hash or exclusion_row_hash(row.name, row.code, row.dob, row.ssn)
+        if pending[row_hash] > 0:
+            pending[row_hash] -= 1
+        else:
+            removed_rows.append(row)
+    unchanged = len(current) - len(removed_rows)
 
-    # Filter to ensure both first and last name are present in the match
-    filtered_matches = []
-    for match in matches:
-        match_name_upper = match.name.upper()
-        if first_name_upper in match_name_upper and last_name_upper in match_name_upper:
-            filtered_matches.append(match)
-            print(f"   ✅ MATCH FOUND: '{match.name}' matches '{first_name_upper} {last_name_upper}'")
+    removed_by_key = defaultdict(list)
+    for row in removed_rows:
+        removed_by_key[(row.name, row.ssn, row.dob)].append(row.id)
+    insert_positions = []
+    updates = []
+    now = datetime.now(timezone.utc)
+    for position, (name, code, dob, ssn, row_hash) in enumerate(frame[EXCLUSION_COLUMNS].itertuples(index=False, name=None)):
+        if pending[row_hash] <= 0:
+            continue
+        pending[row_hash] -= 1
+        same_entry = removed_by_key.get((name, ssn, dob))
+        if same_entry:
+            updates.append({"id": same_entry.pop(0), "code": code, "row_hash": row_hash, "updated_at": now})
+        else:
+            insert_positions.append(position)
 
-    print(f"   Final filtered matches: {len(filtered_matches)}")
+    delete_ids = [entry_id for ids in removed_by_key.values() for entry_id in ids]
+    for i in range(0, len(delete_ids), 500):
+        db.query(ExclusionList).filter(ExclusionList.id.in_(delete_ids[i:i + 500])).delete(synchronize_session=False)
+    for i in range(0, len(updates), 500):
+        db.execute(update(ExclusionList), updates[i:i + 500])
+    _insert_exclusion_rows(db, frame.iloc[insert_positions])
 
-    return filtered_matches
+    return {"added": len(insert_positions), "removed": len(delete_ids), "changed": len(updates), "unchanged": unchanged}
+
+def record_exclusion_version(
+    db: Session,
+    mode: str,
+    diff: Dict[str, int],
+    row_hashes: Iterable[str] = (),
+    filename: Optional[str] = None,
+    uploaded_by: Optional[str] = None
+) -> ExclusionListVersion:
+    """Add a version record for an upload or clear (committed with the list change)"""
+    row_hashes = sorted(row_hashes)
+    version = ExclusionListVersion(
+        mode=mode,
+        filename=filename,
+        uploaded_by=uploaded_by,
+        total_rows=len(row_hashes),
+        added=diff.get("added", 0),
+        removed=diff.get("removed", 0),
+        changed=diff.get("changed", 0),
+        unchanged=diff.get("unchanged", 0),
+        content_hash=hashlib.sha1("\n".join(row_hashes).encode("utf-8")).hexdigest(),
+    )
+    db.add(version)
+    db.flush()
+    return version
+
+def backfill_exclusion_row_hashes(db: Session) -> int:
+    """Fill row_hash for entries loaded before it existed. Does not commit."""
+    rows = db.query(
+        ExclusionList.id, ExclusionList.name, ExclusionList.code, ExclusionList.dob, ExclusionList.ssn
+    ).filter(ExclusionList.row_hash == None).all()
+    updates = [
+        {"id": row.id, "row_hash": exclusion_row_hash(row.name, row.code, row.dob, row.ssn)}
+        for row in rows
+    ]
+    for i in range(0, len(updates), 500):
+        db.execute(update(ExclusionList), updates[i:i + 500])
+    return len(updates)
 
 def is_in_exclusion_list(db: Session, first_name: str, last_name: str) -> bool:
     """
@@ -64,4 +339,87 @@ def is_in_exclusion_list(db: Session, first_name: str, last_name: str) -> bool:
     matches = check_name_in_exclusion_list(db, first_name, last_name)
     return len(matches) > 0
 
+def apply_exclusion_snapshot(info_session: InfoSession, match: Optional[ExclusionEntry]):
+    """Store (or clear) the exclusion list match on the session row"""
+    info_session.exclusion_match_id = match.id if match else None
+    info_session.exclusion_match_name = match.name if match else None
+    info_session.exclusion_match_code = match.code if match else None
+    info_session.exclusion_match_ssn = match.ssn if match else None
+
+def refresh_exclusion_snapshots(db: Session, only_missing: bool = False, index: Optional[ExclusionIndex] = None) -> int:
+    """
+    Re-screen flagged info sessions against the exclusion list (the given index,
+    or the current one) and update their stored match. Called after the list is
+    uploaded or cleared. Does not commit. Returns the number of sessions refreshed.
+    """
+    query = db.query(InfoSession).filter(InfoSession.is_in_exclusion_list == True)
+    if only_missing:
+        query = query.filter(InfoSession.exclusion_match_name == None)
+    flagged_sessions = query.all()
+    for info_session in flagged_sessions:
+        matches = check_name_in_exclusion_list(db, info_session.first_name, info_session.last_name, index)
+        apply_exclusion_snapshot(info_session, matches[0] if matches else None)
+    print(f"🔄 Refreshed exclusion match for {len(flagged_sessions)} flagged info sessions")
+    return len(flagged_sessions)
+
+def rescreen_info_sessions(
+    db: Session,
+    index: Optional[ExclusionIndex] = None,
+    days_back: int = RESCREEN_DAYS_BACK
+) -> Dict[str, Any]:
+    """
+    Re-screen open, recent and currently flagged info sessions against the exclusion
+    list (the given index, or the current one) in one batched pass. Updates
+    is_in_exclusion_list and the stored match; does not commit.
+    Returns counts plus the ids of sessions whose flag or match changed.
+    """
+    if index is None:
+        index = get_exclusion_index(db)
+    cutoff = miami_today() - timedelta(days=days_back)
+    rows = db.query(
+        InfoSession.id, InfoSession.first_name, InfoSession.last_name, InfoSession.is_in_exclusion_list,
+        InfoSession.exclusion_match_id, InfoSession.exclusion_match_name,
+        InfoSession.exclusion_match_code, InfoSession.exclusion_match_ssn
+    ).filter(
+        or_(
+            InfoSession.status != "completed",
+            InfoSession.service_date >= cutoff,
+            InfoSession.is_in_exclusion_list == True
+        )
+    ).all()
+
+    report = {"checked": len(rows), "newly_flagged": 0, "cleared": 0, "match_updated": 0}
+    updates = []
+    for row in rows:
+        matches = screen_name(index, row.first_name, row.last_name)
+        match = matches[0] if matches else None
+        flagged = match is not None
+        snapshot = (match.id, match.name, match.code, match.ssn) if match else (None, None, None, None)
+        old_snapshot = (row.exclusion_match_id, row.exclusion_match_name, row.exclusion_match_code, row.exclusion_match_ssn)
+        was_flagged = bool(row.is_in_exclusion_list)
+        if flagged == was_flagged and snapshot == old_snapshot:
+            continue
+        if flagged and not was_flagged:
+            report["newly_flagged"] += 1
+        elif was_flagged and not flagged:
+            report["cleared"] += 1
+        else:
+            report["match_updated"] += 1
+        updates.append({
+            "id": row.id,
+            "is_in_exclusion_list": flagged,
+            "exclusion_match_id": snapshot[0],
+            "exclusion_match_name": snapshot[1],
+            "exclusion_match_code": snapshot[2],
+            "exclusion_match_ssn": snapshot[3],
+        })
+
+    # ORM bulk UPDATE by primary key (executemany)
+    for i in range(0, len(updates), 500):
+        db.execute(update(InfoSession), updates[i:i + 500])
 
+    report["flags_changed"] = report["newly_flagged"] + report["cleared"]
+    report["changed_session_ids"] = [item["id"] for item in updates]
+    print(f"🔄 Exclusion re-screen: {report['checked']} checked, {report['newly_flagged']} newly flagged, "
+          f"{report['cleared']} cleared, {report['match_updated']} match updated")
+    return report
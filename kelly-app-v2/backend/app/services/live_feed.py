@@ -0,0 +1,49 @@
+"""
+Service for pushing info session changes to open dashboards
+In-process pub/sub used by the Server-Sent Events stream
+"""
+import asyncio
+from typing import Any, Dict, Set, Tuple
+
+from app.utils.json_response import dumps
+
+# Max pending events per subscriber before it is told to resync
+MAX_QUEUE_SIZE = 500
+
+_subscribers: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = set()
+
+def subscribe() -> Tuple[asyncio.AbstractEventLoop, asyncio.Queue]:
+    """Register a new subscriber on the running event loop and return its handle"""
+    subscriber = (asyncio.get_running_loop(), asyncio.Queue(maxsize=MAX_QUEUE_SIZE))
+    _subscribers.add(subscriber)
+    print(f"📡 Live feed subscriber connected ({len(_subscribers)} open)")
+    return subscriber
+
+def unsubscribe(subscriber: Tuple[asyncio.AbstractEventLoop, asyncio.Queue]):
+    """Remove a subscriber (called when the client disconnects)"""
+    _subscribers.discard(subscriber)
+    print(f"📡 Live feed subscriber disconnected ({len(_subscribers)} open)")
+
+def _enqueue(queue: asyncio.Queue, event: Dict[str, Any]):
+    """Put an event on a subscriber queue; a slow client gets a single resync instead"""
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait({"type": "resync"})
+
+def publish(event: Dict[str, Any]):
+    """
+    Send an event to every subscriber
+    Safe to call from the event loop or from a worker thread
+    """
+    for loop, queue in list(_subscribers):
+        if loop.is_closed():
+            _subscribers.discard((loop, queue))
+            continue
+        loop.call_soon_threadsafe(_enqueue, queue, event)
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Encode an event as a Server-Sent Events message"""
+    return f"event: {event['type']}\ndata: {dumps(event).decode('utf-8')}\n\n"
@@ -0,0 +1,194 @@
+"""
+Service for fuzzy and phonetic name matching against the exclusion list
+Catches typos, accents, hyphenated surnames and swapped name order that the
+exact substring check misses. Scoring is vectorized with numpy over posting lists.
+"""
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Set
+import re
+import unicodedata
+
+import numpy as np
+
+# Tunable defaults (the exclusion check endpoint accepts overrides)
+FUZZY_MIN_SCORE = 0.6
+FUZZY_MAX_RESULTS = 10
+TRIGRAM_WEIGHT = 0.6
+PHONETIC_WEIGHT = 0.4
+
+_NON_LETTERS = re.compile(r"[^A-Z]+")
+_VOWELS = set("AEIOU")
+
+def normalize_name(name: str) -> List[str]:
+    """Uppercase ASCII tokens: accents stripped, hyphens/apostrophes/punctuation split or dropped"""
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    ascii_name = "".join(ch for ch in decomposed if not unicodedata.combining(ch)).upper()
+    # O'NEIL -> ONEIL, GARCIA-LOPEZ -> GARCIA LOPEZ
+    ascii_name = ascii_name.replace("'", "").replace("’", "")
+    return [token for token in _NON_LETTERS.split(ascii_name) if token]
+
+@lru_cache(maxsize=65536)
+def token_trigrams(token: str) -> FrozenSet[str]:
+    """Padded trigrams of a single token"""
+    padded = f"  {token} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+def name_trigrams(tokens: Iterable[str]) -> Set[str]:
+    """Trigrams of all tokens (order-independent, so swapped names still match)"""
+    grams: Set[str] = set()
+    for token in tokens:
+        grams |= token_trigrams(token)
+    return grams
+
+@lru_cache(maxsize=65536)
+def phonetic_key(token: str) -> str:
+    """
+    Simplified Metaphone key for an uppercase ASCII token
+    Similar-sounding spellings (SMITH/SMYTH, JON/JOHN, KATHY/CATHY) share a key
+    """
+    word = token
+    for prefix, replacement in (("KN", "N"), ("GN", "N"), ("PN", "N"), ("AE", "E"), ("WR", "R"), ("WH", "W")):
+        if word.startswith(prefix):
+            word = replacement + word[2:]
+            break
+    if word.startswith("X"):
+        word = "S" + word[1:]
+
+    key = []
+    length = len(word)
+    i = 0
+    while i < length:
+        ch = word[i]
+        prev = word[i - 1] if i > 0 else ""
+        nxt = word[i + 1] if i + 1 < length else ""
+        after = word[i + 2] if i + 2 < length else ""
+        code = ""
+        if ch == prev and ch != "C":
+            i += 1
+            continue
+        if ch in _VOWELS:
+            code = ch if i == 0 else ""
+        elif ch == "B":
+            code = "" if prev == "M" and i == length - 1 else "B"
+        elif ch == "C":
+            if nxt == "H" or (nxt == "I" and after == "A"):
+                code = "X"
+            elif nxt in ("I", "E", "Y"):
+                code = "S"
+            else:
+                code = "K"
+        elif ch == "D":
+            code = "J" if nxt == "G" and after in ("E", "I", "Y") else "T"
+        elif ch == "G":
+            if nxt == "H" and after and after not in _VOWELS:
+                code = ""
+            elif nxt == "N" and (i + 2 == length or word[i + 2:] == "ED"):
+                code = ""
+            elif nxt in ("I", "E", "Y"):
+                code = "J"
+            else:
+                code = "K"
+        elif ch == "H":
+            code = "H" if nxt in _VOWELS and prev not in ("C", "S", "P", "T", "G") else ""
+        elif ch == "K":
+            code = "" if prev == "C" else "K"
+        elif ch == "P":
+            code = "F" if nxt == "H" else "P"
+        elif ch == "Q":
+            code = "K"
+        elif ch == "S":
+            code = "X" if nxt == "H" or (nxt == "I" and after in ("O", "A")) else "S"
+        elif ch == "T":
+            if nxt == "I" and after in ("O", "A"):
+                code = "X"
+            elif nxt == "H":
+                code = "0"
+            else:
+                code = "T"
+        elif ch == "V":
+            code = "F"
+        elif ch in ("W", "Y"):
+            code = ch if nxt in _VOWELS else ""
+        elif ch == "X":
+            code = "KS"
+        elif ch == "Z":
+            code = "S"
+        else:
+            code = ch
+        key.append(code)
+        i += 1
+    return "".join(key) or token[:1]
+
+class FuzzyMatch(NamedTuple):
+    """A ranked candidate: position in the index plus its scores"""
+    position: int
+    score: float
+    trigram_score: float
+    phonetic_score: float
+
+class FuzzyNameIndex:
+    """
+    Trigram and phonetic-key posting lists over a fixed list of names
+    Built once per exclusion list snapshot; search is a few numpy bincounts
+    """
+
+    def __init__(self, names: List[str]):
+        self.size = len(names)
+        gram_postings: Dict[str, List[int]] = defaultdict(list)
+        key_postings: Dict[str, List[int]] = defaultdict(list)
+        gram_counts = np.zeros(self.size, dtype=np.int32)
+        for position, name in enumerate(names):
+            tokens = normalize_name(name)
+            grams = name_trigrams(tokens)
+            gram_counts[position] = len(grams)
+            for gram in grams:
+                gram_postings[gram].append(position)
+            for key in {phonetic_key(token) for token in tokens}:
+                key_postings[key].append(position)
+        self.gram_counts = gram_counts
+        self.gram_postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in gram_postings.items()}
+        self.key_postings = {key: np.array(ids, dtype=np.int32) for key, ids in key_postings.items()}
+
+    def _hits(self, postings: Dict[str, np.ndarray], keys: Iterable[str]) -> np.ndarray:
+        """Per-name count of how many of keys it contains"""
+        arrays = [postings[key] for key in keys if key in postings]
+        if not arrays:
+            return np.zeros(self.size, dtype=np.int32)
+        return np.bincount(np.concatenate(arrays), minlength=self.size)
+
+    def search(
+        self,
+        first_name: str,
+        last_name: str,
+        min_score: float = FUZZY_MIN_SCORE,
+        limit: int = FUZZY_MAX_RESULTS
+    ) -> List[FuzzyMatch]:
+        """
+        Rank names by similarity to first + last name (best first)
+        score = TRIGRAM_WEIGHT * trigram similarity + PHONETIC_WEIGHT * share of query tokens
+        whose phonetic key appears in the name. Trigram similarity averages query coverage
+        with the Dice coefficient, so extra middle names cost less than typos.
+        """
+        tokens = normalize_name(f"{first_name} {last_name}")
+        if not tokens or self.size == 0:
+            return []
+        grams = name_trigrams(tokens)
+        keys = {phonetic_key(token) for token in tokens}
+
+        shared = self._hits(self.gram_postings, grams).astype(np.float64)
+        coverage = shared / len(grams)
+        dice = 2.0 * shared / (len(grams) + self.gram_counts)
+        trigram_scores = (coverage + dice) / 2.0
+        phonetic_scores = self._hits(self.key_postings, keys) / len(keys)
+        scores = TRIGRAM_WEIGHT * trigram_scores + PHONETIC_WEIGHT * phonetic_scores
+
+        candidates = np.flatnonzero(scores >= min_score)
+        if candidates.size > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        ranked = candidates[np.lexsort((candidates, -scores[candidates]))]
+        return [
+            FuzzyMatch(int(position), round(float(scores[position]), 3),
+                       round(float(trigram_scores[position]), 3), round(float(phonetic_scores[position]), 3))
+            for position in ranked
+        ]
@@ -1,13 +1,115 @@
 """
 Service for recruiter assignment
-Implements equitable distribution among recruiters
+Implements equitable distribution among recruiters and queue-aware (capacity) scheduling
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import and_, case, func, text
 from app.models.recruiter import Recruiter
 from app.models.info_session import InfoSession
-from typing import Optional
-from datetime import datetime, date
+from app.utils.date_utils import miami_today
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from datetime import datetime, date, timedelta, timezone
+import math
+import threading
+import time
+
+ACTIVE_STATUSES = ("registered", "in-progress")
+WAITING_STATUSES = ("registered", "initiated", "answers_submitted")
+INTERVIEW_STATUS = "in-progress"
+
+# Capacity-aware scheduling
+DEFAULT_INTERVIEW_MINUTES = 15.0  # until there is history
+INTERVIEW_HISTORY_SIZE = 20  # completed interviews per recruiter in the rolling average
+INTERVIEW_HISTORY_DAYS = 30
+INTERVIEW_MINUTES_TTL_SECONDS = 300
+MAX_INTERVIEW_MINUTES = 120
+REGISTRATION_STAMP_SECONDS = 5  # older rows had started_at stamped at registration, not by /start
+MIN_REMAINING_MINUTES = 1.0  # an interview running past its average still takes a moment to wrap up
+WAIT_TIE_MINUTES = 1.0
+
+_interview_minutes_cache: Dict[date, Tuple[float, Dict[int, float], float]] = {}
+
+# Arbitrary app-wide key for the PostgreSQL advisory lock around assignment
+ASSIGNMENT_LOCK_KEY = 7017
+_assignment_lock = threading.Lock()
+
+@contextmanager
+def recruiter_assignment_lock(db: Session):
+    """
+    Serialize recruiter assignment from reading the loads until the new row is committed
+    Without it, parallel registrations read the same counts and land on the same recruiter.
+    A process-wide lock covers this worker; on PostgreSQL a transaction-scoped advisory
+    lock also covers other workers/replicas and is released when the transaction ends.
+    Callers commit once, at the end of the block (only flush inside it: an earlier commit
+    releases the advisory lock), and keep slow work (screening, validation) outside it.
+    The lock blocks, so enter it from sync endpoints (threadpool) or worker threads,
+    never directly on the event loop.
+    """
+    with _assignment_lock:
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": ASSIGNMENT_LOCK_KEY})
+        yield
+
+class RecruiterLoad(NamedTuple):
+    """One recruiter's sessions for the day"""
+    slot_active: int = 0  # registered/in-progress in the requested time slot
+    day_active: int = 0  # registered/in-progress across the day
+    waiting: int = 0  # assigned but not started yet (queue length)
+    interviewing_since: Optional[datetime] = None  # start of the interview in progress, if any
+
+NO_LOAD = RecruiterLoad()
+
+def get_recruiter_loads(db: Session, time_slot: str, session_date: date) -> Tuple[Dict[int, RecruiterLoad], int]:
+    """
+    One grouped query over the day's sessions
+    Returns ({recruiter_id: RecruiterLoad}, all sessions today)
+    """
+    is_active = InfoSession.status.in_(ACTIVE_STATUSES)
+    rows = db.query(
+        InfoSession.assigned_recruiter_id,
+        func.sum(case((and_(is_active, InfoSession.time_slot == time_slot), 1), else_=0)),
+        func.sum(case((is_active, 1), else_=0)),
+        func.sum(case((InfoSession.status.in_(WAITING_STATUSES), 1), else_=0)),
+        func.max(case((InfoSession.status == INTERVIEW_STATUS, InfoSession.started_at))),
+        func.count(InfoSession.id)
+    ).filter(
+        InfoSession.service_date == session_date
+    ).group_by(InfoSession.assigned_recruiter_id).all()
+
+    loads = {}
+    all_sessions_today = 0
+    for recruiter_id, slot_active, day_active, waiting, interviewing_since, total in rows:
+        all_sessions_today += total
+        if recruiter_id is not None:
+            loads[recruiter_id] = RecruiterLoad(int(slot_active or 0), int(day_active or 0), int(waiting or 0), interviewing_since)
+    return loads, all_sessions_today
+
+def pick_equitably(candidates: List[Recruiter], loads: Dict[int, RecruiterLoad], all_sessions_today: int) -> Recruiter:
+    """
+    Fewest active assignments in the slot, then fewest active today,
+    then round-robin over the remaining candidates (ordered by id)
+    """
+    min_assignments = min(loads.get(recruiter.id, NO_LOAD).slot_active for recruiter in candidates)
+    candidates = [recruiter for recruiter in candidates if loads.get(recruiter.id, NO_LOAD).slot_active == min_assignments]
+
+    # If multiple candidates, prefer the one with the fewest active assignments today
+    if len(candidates) > 1:
+        min_total = min(loads.get(recruiter.id, NO_LOAD).day_active for recruiter in candidates)
+        candidates = [recruiter for recruiter in candidates if loads.get(recruiter.id, NO_LOAD).day_active == min_total]
+
+    # If still multiple candidates with same assignments, use round-robin
+    # Candidates are already ordered by ID, so rotation is consistent
+    if len(candidates) > 1:
+        # All sessions today (including completed) determine the round-robin position
+        selected_index = all_sessions_today % len(candidates)
+        selected_recruiter = candidates[selected_index]
+
+        print(f"🔄 Round-robin selection: {len(candidates)} candidates, total sessions today: {all_sessions_today}, selected index: {selected_index}, recruiter: {selected_recruiter.name}")
+        return selected_recruiter
+
+    return candidates[0]
 
 def get_next_recruiter(db: Session, time_slot: str, session_date: date = None) -> Optional[Recruiter]:
     """
@@ -16,19 +118,23 @@ def get_next_recruiter(db: Session, time_slot: str, session_date: date = None) -
     falls back to all active recruiters to prevent applicants from being left unassigned.
     Uses round-robin approach based on current assignments for the same time slot.
     ALWAYS returns a recruiter - creates default recruiters if none exist.
+    Call inside recruiter_assignment_lock so concurrent callers see each other's rows.
     """
     if session_date is None:
-        session_date = date.today()
-    
-    # Ensure default recruiters exist
-    initialize_default_recruiters(db)
+        session_date = miami_today()
     
     # Get only available recruiters (status == "available" AND is_active == True)
     # Recruiters with status "busy" are NEVER assigned new applicants
-    available_recruiters = db.query(Recruiter).filter(
+    available_query = db.query(Recruiter).filter(
         Recruiter.is_active == True,
         Recruiter.status == "available"
-    ).order_by(Recruiter.id).all()
+    ).order_by(Recruiter.id)
+    available_recruiters = available_query.all()
+
+    # Ensure default recruiters exist (only needed when nobody is available)
+    if not available_recruiters:
+        initialize_default_recruiters(db)
+        available_recruiters = available_query.all()
 
     print(f"📊 Found {len(available_recruiters)} available recruiters for assignment")
     
@@ -42,74 +148,146 @@ def get_next_recruiter(db: Session, time_slot: str, session_date: date = None) -
             status="available"
         )
         db.add(fallback_recruiter)
-        db.commit()
-        db.refresh(fallback_recruiter)
+        # Flush only: the caller commits together with the assignment
+        db.flush()
         return fallback_recruiter
     
-    # Count assignments per recruiter for this time slot and date
-    # Only count active sessions (in-progress or registered), not completed ones
-    assignments = {}
-    for recruiter in available_recruiters:
-        count = db.query(InfoSession).filter(
-            InfoSession.assigned_recruiter_id == recruiter.id,
-            InfoSession.time_slot == time_slot,
-            func.date(InfoSession.created_at) == session_date,
-            InfoSession.status.in_(["registered", "in-progress"])  # Only count active sessions
-        ).count()
-        assignments[recruiter.id] = count
-    
-    # Find recruiter with minimum assignments (equitable distribution)
-    min_assignments = min(assignments.values()) if assignments else 0
+    # Active (registered/in-progress) assignments per recruiter for this time slot
+    # and for the whole day, plus all of today's sessions for the round-robin position
+    loads, all_sessions_today = get_recruiter_loads(db, time_slot, session_date)
+    return pick_equitably(available_recruiters, loads, all_sessions_today)
+
+def _as_utc(value: datetime) -> datetime:
+    """SQLite returns naive datetimes; everything here is stored in UTC"""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+def invalidate_interview_minutes():
+    """Drop the cached averages (call when an interview is completed)"""
+    _interview_minutes_cache.clear()
+
+def get_average_interview_minutes(db: Session, session_date: date) -> Tuple[Dict[int, float], float]:
+    """
+    Rolling average interview length per recruiter over their last INTERVIEW_HISTORY_SIZE
+    completed interviews, plus the overall average for recruiters without history.
+    Measured from started_at (set by /start) to completed_at: duration_minutes runs from
+    registration, so it includes the lobby wait this is trying to predict. Rows whose
+    started_at was stamped at registration (before /start owned it) are skipped.
+    Cached for INTERVIEW_MINUTES_TTL_SECONDS (and dropped when an interview completes).
+    """
+    cached = _interview_minutes_cache.get(session_date)
+    if cached and cached[0] > time.monotonic():
+        return cached[1], cached[2]
+
+    rows = db.query(
+        InfoSession.assigned_recruiter_id, InfoSession.created_at, InfoSession.started_at, InfoSession.completed_at
+    ).filter(
+        InfoSession.status == "completed",
+        InfoSession.assigned_recruiter_id != None,
+        InfoSession.started_at != None,
+        InfoSession.completed_at != None,
+        InfoSession.service_date <= session_date,
+        InfoSession.service_date > session_date - timedelta(days=INTERVIEW_HISTORY_DAYS)
+    ).order_by(InfoSession.completed_at.desc()).all()
+
+    history: Dict[int, List[float]] = defaultdict(list)
+    for recruiter_id, created_at, started_at, completed_at in rows:
+        if len(history[recruiter_id]) >= INTERVIEW_HISTORY_SIZE:
+            continue
+        if created_at is not None and abs((_as_utc(started_at) - _as_utc(created_at)).total_seconds()) < REGISTRATION_STAMP_SECONDS:
+            continue
+        minutes = (_as_utc(completed_at) - _as_utc(started_at)).total_seconds() / 60
+        # Skip implausible lengths (a session left open overnight, a start clicked by mistake)
+        if 1 <= minutes <= MAX_INTERVIEW_MINUTES:
+            history[recruiter_id].append(minutes)
+
+    averages = {recruiter_id: sum(values) / len(values) for recruiter_id, values in history.items() if values}
+    all_values = [minutes for values in history.values() for minutes in values]
+    overall = sum(all_values) / len(all_values) if all_values else DEFAULT_INTERVIEW_MINUTES
+    _interview_minutes_cache.clear()
+    _interview_minutes_cache[session_date] = (time.monotonic() + INTERVIEW_MINUTES_TTL_SECONDS, averages, overall)
+    return averages, overall
+
+def estimate_free_in_minutes(load: RecruiterLoad, average_minutes: float, now: datetime) -> float:
+    """Minutes until the recruiter can start a new interview: the rest of the current one plus everyone queued"""
+    remaining = 0.0
+    if load.interviewing_since is not None:
+        elapsed = (now - _as_utc(load.interviewing_since)).total_seconds() / 60
+        remaining = max(average_minutes - elapsed, MIN_REMAINING_MINUTES)
+    return remaining + load.waiting * average_minutes
+
+class RecruiterAssignment(NamedTuple):
+    recruiter: Recruiter
+    estimated_wait_minutes: Optional[int]
+
+def assign_recruiter_by_capacity(
+    db: Session,
+    time_slot: str,
+    session_date: date = None,
+    now: datetime = None
+) -> RecruiterAssignment:
+    """
+    Queue-aware assignment: the applicant goes to the recruiter predicted to be free soonest,
+    using each recruiter's rolling average interview length and current queue.
+    Recruiters busy in an interview still take applicants (the interview is part of their queue);
+    recruiters marked busy with no interview in progress (break, away) are skipped.
+    Predictions within WAIT_TIE_MINUTES are ties and fall back to the equitable rules,
+    so empty queues at the start of a slot are still shared evenly.
+    Call inside recruiter_assignment_lock.
+    """
+    if session_date is None:
+        session_date = miami_today()
+    if now is None:
+        now = datetime.now(timezone.utc)
+
+    recruiters = db.query(Recruiter).filter(Recruiter.is_active == True).order_by(Recruiter.id).all()
+    loads, all_sessions_today = get_recruiter_loads(db, time_slot, session_date)
     candidates = [
-        recruiter for recruiter in available_recruiters
-        if assignments.get(recruiter.id, 0) == min_assignments
+        recruiter for recruiter in recruiters
+        if recruiter.status == "available" or loads.get(recruiter.id, NO_LOAD).interviewing_since is not None
     ]
-    
-    # If multiple candidates, use round-robin based on total assignments
-    if len(candidates) > 1:
-        # Get total assignments across all time slots for today
-        # Only count active sessions (in-progress or registered), not completed ones
-        total_assignments = {}
-        for recruiter in candidates:
-            total = db.query(InfoSession).filter(
-                InfoSession.assigned_recruiter_id == recruiter.id,
-                func.date(InfoSession.created_at) == session_date,
-                InfoSession.status.in_(["registered", "in-progress"])  # Only count active sessions
-            ).count()
-            total_assignments[recruiter.id] = total
-        
-        # Select recruiter with minimum total assignments
-        min_total = min(total_assignments.values())
-        candidates = [
-            recruiter for recruiter in candidates
-            if total_assignments.get(recruiter.id, 0) == min_total
-        ]
-    
-    # If still multiple candidates with same assignments, use round-robin
-    # Sort consistently by ID to ensure fair rotation
-    if len(candidates) > 1:
-        candidates.sort(key=lambda r: r.id)
-        
-        # Count all sessions for today (including completed) to determine round-robin position
-        # This ensures fair rotation even when all have same active assignments
-        all_sessions_today = db.query(InfoSession).filter(
-            func.date(InfoSession.created_at) == session_date
-        ).count()
-        
-        # Use modulo to rotate through candidates
-        selected_index = all_sessions_today % len(candidates)
-        selected_recruiter = candidates[selected_index]
-        
-        print(f"🔄 Round-robin selection: {len(candidates)} candidates, total sessions today: {all_sessions_today}, selected index: {selected_index}, recruiter: {selected_recruiter.name}")
-        return selected_recruiter
-    
-    # Return the single candidate or first available recruiter
-    return candidates[0] if candidates else available_recruiters[0]
+    if not candidates:
+        return RecruiterAssignment(get_next_recruiter(db, time_slot, session_date), None)
+
+    averages, overall = get_average_interview_minutes(db, session_date)
+    free_in = {
+        recruiter.id: estimate_free_in_minutes(loads.get(recruiter.id, NO_LOAD), averages.get(recruiter.id, overall), now)
+        for recruiter in candidates
+    }
+    soonest = min(free_in.values())
+    tied = [recruiter for recruiter in candidates if free_in[recruiter.id] - soonest < WAIT_TIE_MINUTES]
+    recruiter = pick_equitably(tied, loads, all_sessions_today)
+    print(f"⏱️ Capacity assignment: {recruiter.name} free in ~{free_in[recruiter.id]:.0f} min ({len(tied)}/{len(candidates)} tied)")
+    return RecruiterAssignment(recruiter, math.ceil(free_in[recruiter.id]))
+
+def estimate_wait_for_session(db: Session, session: InfoSession, now: datetime = None) -> Optional[int]:
+    """
+    Live wait estimate for an applicant who has not started yet: the rest of their recruiter's
+    current interview plus the applicants assigned to that recruiter before them
+    None once the interview started, for other days, or without a recruiter
+    """
+    if session.status not in WAITING_STATUSES or not session.assigned_recruiter_id:
+        return None
+    if session.service_date != miami_today():
+        return None
+    if now is None:
+        now = datetime.now(timezone.utc)
+
+    ahead, interviewing_since = db.query(
+        func.sum(case((and_(InfoSession.status.in_(WAITING_STATUSES), InfoSession.id < session.id), 1), else_=0)),
+        func.max(case((InfoSession.status == INTERVIEW_STATUS, InfoSession.started_at)))
+    ).filter(
+        InfoSession.assigned_recruiter_id == session.assigned_recruiter_id,
+        InfoSession.service_date == session.service_date
+    ).one()
+
+    averages, overall = get_average_interview_minutes(db, session.service_date)
+    load = RecruiterLoad(waiting=int(ahead or 0), interviewing_since=interviewing_since)
+    return math.ceil(estimate_free_in_minutes(load, averages.get(session.assigned_recruiter_id, overall), now))
 
 def initialize_default_recruiters(db: Session):
     """
     Initialize 5 default recruiters if they don't exist
-    All start as available
+    All start as available. Only flushes - the caller commits (it may hold the assignment lock)
     """
     existing_count = db.query(Recruiter).count()
     
@@ -126,5 +304,5 @@ def initialize_default_recruiters(db: Session):
             recruiter = Recruiter(**recruiter_data)
             db.add(recruiter)
         
-        db.commit()
+        db.flush()
 
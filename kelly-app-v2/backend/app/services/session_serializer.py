@@ -0,0 +1,73 @@
+"""
+Service for serializing info sessions on the dashboard list endpoints
+/live, /completed, recruiter assigned sessions and the live feed share these rows
+"""
+from typing import Any, Dict
+
+from app.models.info_session import InfoSession, build_identity_key
+
+def serialize_session_row(session: InfoSession, name_counts: Dict[str, int]) -> Dict[str, Any]:
+    """
+    Fields common to every list row
+    Expects assigned_recruiter to be loaded; datetimes are returned as ISO strings
+    """
+    name_key = session.identity_key or build_identity_key(session.first_name, session.last_name, session.email)
+    duplicate_count = name_counts.get(name_key, 1)
+    recruiter = session.assigned_recruiter
+    started_at = session.started_at
+    completed_at = session.completed_at
+    created_at = session.created_at
+    return {
+        "id": session.id,
+        "first_name": session.first_name,
+        "last_name": session.last_name,
+        "email": session.email,
+        "phone": session.phone,
+        "zip_code": session.zip_code or "",
+        "session_type": session.session_type,
+        "time_slot": session.time_slot,
+        "is_in_exclusion_list": bool(session.is_in_exclusion_list),
+        "exclusion_warning_shown": bool(session.exclusion_warning_shown),
+        "status": session.status,
+        "ob365_sent": bool(session.ob365_sent),
+        "i9_sent": bool(session.i9_sent),
+        "existing_i9": bool(session.existing_i9),
+        "ineligible": bool(session.ineligible),
+        "rejected": bool(session.rejected),
+        "drug_screen": bool(session.drug_screen),
+        "questions": bool(session.questions),
+        "assigned_recruiter_id": session.assigned_recruiter_id,
+        "assigned_recruiter_name": recruiter.name if recruiter else None,
+        "started_at": started_at.isoformat() if started_at else None,
+        "completed_at": completed_at.isoformat() if completed_at else None,
+        "duration_minutes": session.duration_minutes,
+        "created_at": created_at.isoformat() if created_at else None,
+        "is_duplicate": duplicate_count > 1,
+        "duplicate_count": duplicate_count,
+    }
+
+def serialize_live_session(session: InfoSession, name_counts: Dict[str, int]) -> Dict[str, Any]:
+    """Row for /live, /completed and the live feed: adds the exclusion match and steps"""
+    row = serialize_session_row(session, name_counts)
+    row["exclusion_match"] = None
+    if session.is_in_exclusion_list and session.exclusion_match_name:
+        row["exclusion_match"] = {
+            "name": session.exclusion_match_name,
+            "code": session.exclusion_match_code or None,
+            "ssn": session.exclusion_match_ssn or None,
+        }
+    row["steps"] = [
+        {
+            "step_name": step.step_name,
+            "step_description": step.step_description or "",
+            "is_completed": step.is_completed,
+        }
+        for step in session.steps
+    ]
+    return row
+
+def serialize_assigned_session(session: InfoSession, name_counts: Dict[str, int]) -> Dict[str, Any]:
+    """Row for the recruiter's assigned sessions: adds the generated Excel row"""
+    row = serialize_session_row(session, name_counts)
+    row["generated_row"] = session.generated_row or None
+    return row
@@ -0,0 +1,67 @@
+"""
+Process-local cache for the statistics dashboard
+An entry is reused until a committed write bumps the version of a table it was computed from
+(see version_service) or STATISTICS_CACHE_TTL_SECONDS pass, whichever comes first. The TTL
+covers writes made outside this process (scripts, rebuild_activity_rollup.py, other workers).
+Concurrent misses for the same key compute the result once (single-flight) off the event loop.
+"""
+from fastapi.concurrency import run_in_threadpool
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Tuple
+import threading
+import time
+
+from app.services.version_service import get_version
+
+STATISTICS_CACHE_TTL_SECONDS = 60
+LOCK_STRIPES = 16  # keys share a fixed set of locks, so the lock table never grows
+
+# Tables the statistics are computed from (the rollup is maintained on writes to the visit tables)
+STATISTICS_TABLES = ("info_sessions", "new_hire_orientations", "team_visits", "badges", "fingerprints", "recruiters")
+
+class _Entry(NamedTuple):
+    versions: Tuple[int, ...]
+    expires_at: float
+    value: Any
+
+_entries: Dict[Hashable, _Entry] = {}
+_key_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+def _current_versions() -> Tuple[int, ...]:
+    return tuple(get_version(table_name) for table_name in STATISTICS_TABLES)
+
+def _fresh_value(key: Hashable):
+    """Cached value for key if it is still valid, else None"""
+    entry = _entries.get(key)
+    if entry and entry.expires_at > time.monotonic() and entry.versions == _current_versions():
+        return entry.value
+    return None
+
+def _compute_once(key: Hashable, compute: Callable[[], Any]):
+    with _key_locks[hash(key) % LOCK_STRIPES]:
+        # Another request may have filled the entry while this one waited
+        value = _fresh_value(key)
+        if value is not None:
+            return value
+        # Read versions before computing, so a write that lands mid-computation invalidates the entry
+        versions = _current_versions()
+        value = compute()
+        now = time.monotonic()
+        # Drop expired entries (e.g. yesterday's keys) so the cache stays small
+        for expired_key in [k for k, entry in list(_entries.items()) if entry.expires_at <= now]:
+            _entries.pop(expired_key, None)
+        _entries[key] = _Entry(versions, now + STATISTICS_CACHE_TTL_SECONDS, value)
+        return value
+
+async def get_cached_statistics(key: Hashable, compute: Callable[[], Any]):
+    """
+    Return the cached statistics for key, computing them with compute() on a miss
+    key should include everything the result depends on besides the data (period, date, office...)
+    """
+    value = _fresh_value(key)
+    if value is not None:
+        return value
+    return await run_in_threadpool(_compute_once, key, compute)
+
+def clear_statistics_cache():
+    """Drop every cached entry"""
+    _entries.clear()
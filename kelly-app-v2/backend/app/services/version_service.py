@@ -0,0 +1,72 @@
+"""
+Service for per-table data versions used by conditional GET (ETag / 304)
+Every committed ORM write bumps the version of the tables it touched
+"""
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from collections import defaultdict
+from typing import Optional
+import hashlib
+import uuid
+
+from app.database import SessionLocal
+from app.utils.date_utils import miami_today
+
+# Versions live in process memory (single uvicorn process), so a restart must invalidate old ETags
+_process_token = uuid.uuid4().hex
+_versions = defaultdict(int)
+
+def bump(*table_names: str):
+    """Mark tables as changed"""
+    for table_name in table_names:
+        _versions[table_name] += 1
+
+def get_version(table_name: str) -> int:
+    """Current version of a table"""
+    return _versions[table_name]
+
+@event.listens_for(SessionLocal, "after_flush")
+def _track_flushed_tables(session: Session, flush_context):
+    changed = session.info.setdefault("changed_tables", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table_name = getattr(obj, "__tablename__", None)
+        if table_name:
+            changed.add(table_name)
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _track_bulk_statements(orm_execute_state):
+    # query(...).update() / .delete() skip the flush
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and orm_execute_state.bind_mapper is not None:
+        changed = orm_execute_state.session.info.setdefault("changed_tables", set())
+        changed.add(orm_execute_state.bind_mapper.local_table.name)
+
+@event.listens_for(SessionLocal, "after_commit")
+def _bump_committed_tables(session: Session):
+    bump(*session.info.pop("changed_tables", set()))
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_rolled_back_tables(session: Session):
+    session.info.pop("changed_tables", None)
+
+def compute_etag(request: Request, *table_names: str) -> str:
+    """
+    Weak ETag for a GET response that depends only on the given tables,
+    the query string and the current Miami date (date-windowed endpoints)
+    """
+    parts = [_process_token, request.url.path, request.url.query, miami_today().isoformat()]
+    parts += [f"{table_name}:{_versions[table_name]}" for table_name in table_names]
+    return 'W/"' + hashlib.md5("|".join(parts).encode()).hexdigest() + '"'
+
+def not_modified(request: Request, response: Response, *table_names: str) -> Optional[Response]:
+    """
+    Return a 304 response if the client already has the current data,
+    otherwise set the ETag header on the outgoing response and return None
+    """
+    etag = compute_etag(request, *table_names)
+    client_etags = [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]
+    if etag in client_etags:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return None
@@ -0,0 +1,64 @@
+"""
+Date helpers for Miami-local reporting windows
+Timestamps are stored in UTC; the office works in America/New_York
+"""
+from sqlalchemy import and_, func, literal, String
+from sqlalchemy.orm import Session
+from datetime import datetime, date, time, timedelta
+from typing import Optional, Tuple
+import pytz
+
+MIAMI_TZ = pytz.timezone('America/New_York')
+
+def miami_today() -> date:
+    """Current date in Miami"""
+    return datetime.now(MIAMI_TZ).date()
+
+def to_miami_datetime(value: datetime) -> datetime:
+    """Miami-local time of a stored timestamp (naive values are UTC, as SQLite returns them)"""
+    if value.tzinfo is None:
+        value = pytz.UTC.localize(value)
+    return value.astimezone(MIAMI_TZ)
+
+def to_miami_date(value: datetime) -> date:
+    """Miami-local date of a stored timestamp (naive values are UTC, as SQLite returns them)"""
+    return to_miami_datetime(value).date()
+
+def local_dates_to_utc_bounds(start_date: date, end_date: date) -> Tuple[datetime, datetime]:
+    """
+    Convert an inclusive range of Miami-local dates to UTC timestamp bounds
+    Returns (start, end) for use as: start <= created_at < end
+    """
+    start_local = MIAMI_TZ.localize(datetime.combine(start_date, time.min))
+    end_local = MIAMI_TZ.localize(datetime.combine(end_date + timedelta(days=1), time.min))
+    return start_local.astimezone(pytz.UTC), end_local.astimezone(pytz.UTC)
+
+def timestamp_param(db: Session, value: datetime):
+    """
+    Bind a UTC timestamp for comparison against a DateTime(timezone=True) column
+    PostgreSQL compares timestamptz natively. SQLite stores text, and rows written by
+    server_default=func.now() have no microseconds, so the value is bound in that format.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return value
+    if value.tzinfo is not None:
+        value = value.astimezone(pytz.UTC).replace(tzinfo=None)
+    text_format = "%Y-%m-%d %H:%M:%S.%f" if value.microsecond else "%Y-%m-%d %H:%M:%S"
+    return literal(value.strftime(text_format), String)
+
+def local_date_range_filter(db: Session, column, start_date: date, end_date: Optional[date] = None):
+    """
+    Predicate for a UTC timestamp column falling on Miami-local dates start_date..end_date
+    (no upper bound when end_date is None). Compares the bare column, so an index on it is used.
+    """
+    range_start, range_end = local_dates_to_utc_bounds(start_date, end_date or start_date)
+    predicate = column >= timestamp_param(db, range_start)
+    if end_date is None:
+        return predicate
+    return and_(predicate, column < timestamp_param(db, range_end))
+
+def minutes_between(db: Session, start_column, end_column):
+    """SQL expression for the minutes from start_column to end_column (NULL if either is NULL)"""
+    if db.get_bind().dialect.name == "sqlite":
+        return (func.julianday(end_column) - func.julianday(start_column)) * 1440
+    return func.extract("epoch", end_column - start_column) / 60
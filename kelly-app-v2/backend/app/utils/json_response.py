@@ -0,0 +1,42 @@
+"""
+Fast JSON responses for the large list endpoints
+Uses orjson when it is installed and falls back to the standard library encoder
+"""
+from fastapi.responses import Response
+from typing import Any, Optional
+from datetime import date
+import json
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+def _default(value: Any) -> str:
+    """Match orjson's output for dates/datetimes when falling back to the json module"""
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+def dumps(content: Any) -> bytes:
+    """Encode dicts, lists, strings, numbers, booleans, None and datetimes to bytes"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+class FastJSONResponse(Response):
+    """JSON response encoded straight to bytes (no jsonable_encoder pass)"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def json_response(content: Any, response: Optional[Response] = None) -> FastJSONResponse:
+    """
+    Build a FastJSONResponse for content that is already JSON-ready
+    Headers set on the endpoint's injected response (ETag, X-Next-Cursor) are carried over
+    """
+    headers = None
+    if response is not None:
+        headers = {key: value for key, value in response.headers.items() if key != "content-length"}
+    return FastJSONResponse(content, headers=headers)
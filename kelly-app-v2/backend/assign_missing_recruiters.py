@@ -21,6 +21,7 @@ def assign_missing_recruiters():
     try:
         # Initialize default recruiters if needed
         initialize_default_recruiters(db)
+        db.commit()
         
         # Find all sessions without assigned recruiter
         unassigned_sessions = db.query(InfoSession).filter(
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark for exclusion list screening against a large synthetic list
+Reports index build time and p50/p99 latency of the exact and fuzzy checks
+
+Usage:
+    python benchmark_exclusion_matching.py --entries 100000 --queries 500
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services.exclusion_service import ExclusionEntry, ExclusionIndex
+
+FIRST_NAMES = ["JOHN", "MARIA", "JOSE", "ANA", "MICHAEL", "JENNIFER", "CARLOS", "LUIS", "ASHLEY", "DAVID",
+               "YOLANDA", "KATHERINE", "JESUS", "CHRISTOPHER", "GABRIELA", "ROBERT", "DANIELA", "JAMES", "SOFIA", "PEDRO"]
+LAST_NAMES = ["SMITH", "GARCIA", "RODRIGUEZ", "JOHNSON", "MARTINEZ", "HERNANDEZ", "LOPEZ", "GONZALEZ", "PEREZ", "WILLIAMS",
+              "SANCHEZ", "RAMIREZ", "TORRES", "FLORES", "O'NEIL", "DE LA CRUZ", "MUÑOZ", "BROWN", "DIAZ", "REYES"]
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def synthetic_name(rng: random.Random) -> str:
+    """FIRST [MIDDLE] LAST [LAST2] with a random suffix so names are mostly unique"""
+    parts = [rng.choice(FIRST_NAMES)]
+    if rng.random() < 0.3:
+        parts.append(rng.choice(FIRST_NAMES))
+    parts.append(rng.choice(LAST_NAMES) + rng.choice(["", "", "S", "EZ", "SON", "O"]))
+    if rng.random() < 0.2:
+        parts.append(rng.choice(LAST_NAMES))
+    return " ".join(parts)
+
+def time_queries(label: str, func, queries):
+    """Run func over the queries and print latency percentiles"""
+    latencies = []
+    hits = 0
+    for first_name, last_name in queries:
+        start = time.perf_counter()
+        hits += bool(func(first_name, last_name))
+        latencies.append((time.perf_counter() - start) * 1000)
+    print(f"   {label:<8} p50 {percentile(latencies, 50):7.3f} ms   p99 {percentile(latencies, 99):7.3f} ms   "
+          f"queries with results: {hits}/{len(queries)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark exclusion list screening")
+    parser.add_argument("--entries", type=int, default=100000, help="Synthetic exclusion list size")
+    parser.add_argument("--queries", type=int, default=500, help="Names to screen")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    entries = [ExclusionEntry(i + 1, synthetic_name(rng), "PC", None, None, None) for i in range(args.entries)]
+
+    print(f"🚀 Building index for {args.entries} entries")
+    start = time.perf_counter()
+    index = ExclusionIndex(entries)
+    print(f"   Built in {time.perf_counter() - start:.2f} s ({len(index.token_ids)} tokens, {len(index.fuzzy.gram_postings)} trigrams)")
+
+    # Mix of registrants: exact names, typos, swapped order and people not on the list
+    queries = []
+    for _ in range(args.queries):
+        name = rng.choice(entries).name.split()
+        first_name, last_name = name[0], name[-1]
+        roll = rng.random()
+        if roll < 0.25 and len(last_name) > 3:
+            i = rng.randrange(1, len(last_name) - 1)
+            last_name = last_name[:i] + last_name[i + 1:]
+        elif roll < 0.5:
+            first_name, last_name = last_name, first_name
+        elif roll < 0.75:
+            first_name, last_name = "ZED", "QUINTERO"
+        queries.append((first_name.title(), last_name.title()))
+
+    print(f"\n📊 Screening {len(queries)} names")
+    time_queries("exact", lambda f, l: index.match(f.upper(), l.upper()), queries)
+    time_queries("fuzzy", lambda f, l: index.fuzzy_match(f, l), queries)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark for info session registration under morning-rush concurrency
+Runs the app in-process and reports p50/p99 latency and queries per registration
+
+Usage:
+    python benchmark_registration.py --registrations 300 --concurrency 40
+    DATABASE_URL=postgresql://... python benchmark_registration.py   # against a scratch database
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Default to a throwaway SQLite file so the real database is never touched
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/benchmark.db"
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import httpx
+from sqlalchemy import event
+
+TIME_SLOTS = ["8:30 AM", "1:30 PM"]
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+async def run_benchmark(registrations: int, concurrency: int):
+    """Fire registrations concurrently and collect latency / query counts"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        import main
+        from app.database import engine
+
+    query_count = 0
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_query(conn, cursor, statement, parameters, context, executemany):
+        nonlocal query_count
+        query_count += 1
+
+    latencies = []
+    statuses = {}
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=main.app)
+
+    async def register(client: httpx.AsyncClient, i: int):
+        payload = {
+            "first_name": f"Bench{i}",
+            "last_name": "Candidate",
+            "email": f"bench{i}@example.com",
+            "phone": "3055550100",
+            "zip_code": "33101",
+            "session_type": "new-hire",
+            "time_slot": TIME_SLOTS[i % len(TIME_SLOTS)],
+        }
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post("/api/info-session/register", json=payload)
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    # App prints a line per registration; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        async with main.app.router.lifespan_context(main.app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+                # Warm-up request so startup work is not counted
+                await register(client, -1)
+                latencies.clear()
+                statuses.clear()
+                query_count = 0
+
+                wall_start = time.perf_counter()
+                await asyncio.gather(*(register(client, i) for i in range(registrations)))
+                wall_seconds = time.perf_counter() - wall_start
+
+    return latencies, statuses, query_count, wall_seconds
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmark info session registration")
+    parser.add_argument("--registrations", type=int, default=200, help="Number of registrations to send")
+    parser.add_argument("--concurrency", type=int, default=40, help="Concurrent in-flight registrations")
+    args = parser.parse_args()
+
+    print(f"🚀 Registering {args.registrations} candidates with concurrency {args.concurrency}")
+    print(f"   Database: {os.environ['DATABASE_URL']}")
+
+    latencies, statuses, query_count, wall_seconds = asyncio.run(
+        run_benchmark(args.registrations, args.concurrency)
+    )
+
+    print("\n📊 Results")
+    print(f"   Status codes:      {statuses}")
+    print(f"   Throughput:        {len(latencies) / wall_seconds:.1f} registrations/s")
+    print(f"   Latency p50:       {percentile(latencies, 50):.1f} ms")
+    print(f"   Latency p99:       {percentile(latencies, 99):.1f} ms")
+    print(f"   Latency max:       {max(latencies):.1f} ms")
+    print(f"   Queries/register:  {query_count / len(latencies):.1f}")
+
+if __name__ == "__main__":
+    main_cli()
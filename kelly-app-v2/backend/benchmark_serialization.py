@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the /live list serialization
+Compares the previous path (dict rows + jsonable_encoder + json.dumps, as FastAPI
+does for plain return values) against the shared serializer + FastJSONResponse
+
+Usage:
+    python benchmark_serialization.py --rows 500 --repeat 50
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models.info_session import InfoSession, InfoSessionStep, build_identity_key
+from app.models.recruiter import Recruiter
+from app.services.session_serializer import serialize_live_session
+from app.utils import json_response
+
+def build_sessions(count: int):
+    """Transient InfoSession rows shaped like a busy day on /live"""
+    recruiter = Recruiter(id=1, name="Benchmark Recruiter", email="bench@kellyeducation.com", status="available")
+    start = datetime(2025, 1, 6, 13, 0, tzinfo=timezone.utc)
+    sessions = []
+    for i in range(count):
+        session = InfoSession(
+            id=i + 1,
+            first_name=f"First{i}",
+            last_name=f"Last{i}",
+            email=f"candidate{i}@example.com",
+            phone="3055550100",
+            zip_code="33101",
+            session_type="new-hire",
+            time_slot="8:30 AM",
+            status="in-progress",
+            is_in_exclusion_list=False,
+            exclusion_warning_shown=False,
+            ob365_sent=i % 2 == 0,
+            i9_sent=False,
+            existing_i9=False,
+            ineligible=False,
+            rejected=False,
+            drug_screen=False,
+            questions=True,
+            assigned_recruiter_id=recruiter.id,
+            started_at=start + timedelta(minutes=i),
+            created_at=start + timedelta(seconds=i),
+        )
+        session.identity_key = build_identity_key(session.first_name, session.last_name, session.email)
+        session.assigned_recruiter = recruiter
+        session.steps = [
+            InfoSessionStep(step_name=f"step_{n}", step_description="Step description " * 5, is_completed=n < 2)
+            for n in range(4)
+        ]
+        sessions.append(session)
+    return sessions
+
+def previous_path(sessions, name_counts) -> bytes:
+    """Rows as dicts, then FastAPI's jsonable_encoder and the standard JSONResponse render"""
+    rows = [serialize_live_session(session, name_counts) for session in sessions]
+    return json.dumps(jsonable_encoder(rows), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+def fast_path(sessions, name_counts) -> bytes:
+    """Rows as dicts encoded straight to bytes"""
+    return json_response.dumps([serialize_live_session(session, name_counts) for session in sessions])
+
+def time_it(label: str, func, sessions, repeat: int):
+    """Best-of-N timing per call and per row"""
+    name_counts = {}
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(sessions, name_counts)
+        best = min(best, time.perf_counter() - start)
+    print(f"   {label:<32} {best * 1000:8.2f} ms/response   {best * 1e6 / len(sessions):7.2f} µs/row")
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /live serialization")
+    parser.add_argument("--rows", type=int, default=500, help="Rows per response")
+    parser.add_argument("--repeat", type=int, default=30, help="Timed repetitions (best is reported)")
+    args = parser.parse_args()
+
+    sessions = build_sessions(args.rows)
+    assert json.loads(previous_path(sessions, {})) == json.loads(fast_path(sessions, {})), "Outputs differ"
+
+    encoder = "orjson" if json_response.orjson is not None else "json (orjson not installed)"
+    print(f"🚀 Serializing {args.rows} rows, best of {args.repeat} runs (encoder: {encoder})")
+    previous = time_it("jsonable_encoder + json.dumps", previous_path, sessions, args.repeat)
+    fast = time_it("FastJSONResponse", fast_path, sessions, args.repeat)
+    print(f"\n📊 Speedup: {previous / fast:.1f}x")
+
+if __name__ == "__main__":
+    main()
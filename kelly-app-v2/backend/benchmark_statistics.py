@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the statistics dashboard endpoint
+Seeds a scratch database with two years of visits, then reports p50/p99 latency and
+queries per request of GET /api/statistics/ for each period
+
+Usage:
+    python benchmark_statistics.py --per-day 40 --requests 20
+    python benchmark_statistics.py --output stats.json   # save the responses to diff between versions
+    python benchmark_statistics.py --cached   # measure cache hits instead of computing every request
+    DATABASE_URL=postgresql://... python benchmark_statistics.py --no-seed   # against existing data
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Default to a throwaway SQLite file so the real database is never touched
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/statistics_benchmark.db"
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+PERIODS = ["day", "week", "month", "year", "all"]
+SEED_DAYS = 800
+BENCHMARK_EMAIL = "statistics.benchmark@example.com"
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def seed_visits(db, per_day: int, seed: int):
+    """Insert per_day records a day, spread over the five visit tables, for the last SEED_DAYS days"""
+    from app.models.info_session import InfoSession
+    from app.models.visit import NewHireOrientation, Badge, Fingerprint, TeamVisit
+
+    rng = random.Random(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    rows = []
+    for day in range(SEED_DAYS):
+        for i in range(per_day):
+            created_at = now - timedelta(days=day, seconds=rng.randrange(86400))
+            kind = rng.random()
+            person = dict(first_name=f"Stat{day}", last_name=f"Visitor{i}", email=f"stat{day}x{i}@example.com", phone="3055550100")
+            if kind < 0.5:
+                rows.append(InfoSession(
+                    **person, zip_code="33101", session_type="new-hire",
+                    time_slot=rng.choice(["8:30 AM", "1:30 PM"]),
+                    status=rng.choice(["completed", "completed", "in-progress", "initiated"]),
+                    started_at=created_at, completed_at=created_at + timedelta(minutes=rng.randrange(20, 90)),
+                    created_at=created_at,
+                ))
+            elif kind < 0.65:
+                rows.append(NewHireOrientation(**person, time_slot="9:00 AM", status="completed", created_at=created_at))
+            elif kind < 0.8:
+                rows.append(TeamVisit(visitor_name=person["first_name"], team="Payroll", reason="Benchmark", created_at=created_at))
+            elif kind < 0.9:
+                rows.append(Badge(**person, appointment_time="10:00 AM", created_at=created_at))
+            else:
+                rows.append(Fingerprint(**person, appointment_time="10:00 AM", fingerprint_type="regular", created_at=created_at))
+        if len(rows) >= 5000:
+            db.add_all(rows)
+            db.commit()
+            rows = []
+    db.add_all(rows)
+    db.commit()
+
+def ensure_admin(db) -> str:
+    """Create the benchmark admin user if needed and return a bearer token for it"""
+    from app.api.auth import create_access_token
+    from app.models.user import User
+
+    if not db.query(User).filter(User.email == BENCHMARK_EMAIL).first():
+        db.add(User(email=BENCHMARK_EMAIL, password_hash=User.hash_password("benchmark"),
+                    full_name="Statistics Benchmark", role="admin"))
+        db.commit()
+    return create_access_token({"sub": BENCHMARK_EMAIL})
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmark the statistics endpoint")
+    parser.add_argument("--per-day", type=int, default=40, help="Seeded records per day")
+    parser.add_argument("--requests", type=int, default=20, help="Requests per period")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--no-seed", action="store_true", help="Use the data already in DATABASE_URL")
+    parser.add_argument("--output", help="Write the response for each period to this JSON file")
+    parser.add_argument("--cached", action="store_true", help="Keep the statistics cache between requests")
+    args = parser.parse_args()
+
+    # The app prints on startup; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        import main
+        from app.database import SessionLocal, engine
+        from app.services.statistics_cache import clear_statistics_cache
+
+    db = SessionLocal()
+    try:
+        if not args.no_seed:
+            print(f"🌱 Seeding {args.per_day} records/day for {SEED_DAYS} days")
+            seed_visits(db, args.per_day, args.seed)
+        token = ensure_admin(db)
+    finally:
+        db.close()
+
+    query_count = 0
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_query(conn, cursor, statement, parameters, context, executemany):
+        nonlocal query_count
+        query_count += 1
+
+    print(f"🚀 {args.requests} requests per period")
+    print(f"   Database: {os.environ['DATABASE_URL']}")
+    print("\n📊 Results")
+
+    responses = {}
+    client = TestClient(main.app)
+    headers = {"Authorization": f"Bearer {token}"}
+    for period in PERIODS:
+        latencies = []
+        query_count = 0
+        for _ in range(args.requests):
+            if not args.cached:
+                clear_statistics_cache()
+            start = time.perf_counter()
+            response = client.get("/api/statistics/", params={"period": period}, headers=headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+        responses[period] = response.json()
+        print(f"   {period:<6} p50 {percentile(latencies, 50):8.1f} ms   p99 {percentile(latencies, 99):8.1f} ms   "
+              f"queries/request {query_count / args.requests:6.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(responses, f, indent=2, sort_keys=True)
+        print(f"\n💾 Responses written to {args.output}")
+
+if __name__ == "__main__":
+    main_cli()
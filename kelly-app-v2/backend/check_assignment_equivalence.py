@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Equivalence check for the grouped-load recruiter picker
+Replays seeded random registrations against a scratch database and, before every
+assignment, asks both the old per-recruiter counting (one COUNT per recruiter, as
+get_next_recruiter worked before get_recruiter_loads) and the current get_next_recruiter
+for a recruiter. Exits non-zero if the two ever pick a different recruiter.
+
+The dataset mixes time slots, days, statuses, busy/inactive recruiters and
+unassigned rows, so every tie-breaking rule (slot load, day load, round-robin) is hit.
+
+Usage:
+    python check_assignment_equivalence.py --seeds 30 --registrations 120
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List
+
+# Always check against a throwaway SQLite file so the real database is never touched
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/assignment_equivalence.db"
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.database import Base, SessionLocal, engine
+from app.models.info_session import InfoSession, InfoSessionStep
+from app.models.recruiter import Recruiter
+from app.services.recruiter_service import get_next_recruiter
+
+TIME_SLOTS = ["8:30 AM", "1:30 PM"]
+STATUSES = ["initiated", "registered", "in-progress", "answers_submitted", "completed"]
+FIRST_DAY = date(2025, 1, 6)
+DAYS = 3
+RECRUITERS = 5
+
+def legacy_get_next_recruiter(db: Session, time_slot: str, session_date: date) -> Recruiter:
+    """
+    The counting get_next_recruiter replaced by the grouped query, kept verbatim apart from
+    initialize_default_recruiters and the fallback recruiter (the dataset always has one available)
+    """
+    available_recruiters = db.query(Recruiter).filter(
+        Recruiter.is_active == True,
+        Recruiter.status == "available"
+    ).order_by(Recruiter.id).all()
+
+    assignments = {}
+    for recruiter in available_recruiters:
+        assignments[recruiter.id] = db.query(InfoSession).filter(
+            InfoSession.assigned_recruiter_id == recruiter.id,
+            InfoSession.time_slot == time_slot,
+            InfoSession.service_date == session_date,
+            InfoSession.status.in_(["registered", "in-progress"])
+        ).count()
+
+    min_assignments = min(assignments.values()) if assignments else 0
+    candidates = [
+        recruiter for recruiter in available_recruiters
+        if assignments.get(recruiter.id, 0) == min_assignments
+    ]
+
+    if len(candidates) > 1:
+        total_assignments = {}
+        for recruiter in candidates:
+            total_assignments[recruiter.id] = db.query(InfoSession).filter(
+                InfoSession.assigned_recruiter_id == recruiter.id,
+                InfoSession.service_date == session_date,
+                InfoSession.status.in_(["registered", "in-progress"])
+            ).count()
+        min_total = min(total_assignments.values())
+        candidates = [
+            recruiter for recruiter in candidates
+            if total_assignments.get(recruiter.id, 0) == min_total
+        ]
+
+    if len(candidates) > 1:
+        candidates.sort(key=lambda r: r.id)
+        all_sessions_today = db.query(InfoSession).filter(
+            InfoSession.service_date == session_date
+        ).count()
+        return candidates[all_sessions_today % len(candidates)]
+
+    return candidates[0] if candidates else available_recruiters[0]
+
+def reset_database(db: Session, rng: random.Random):
+    """Empty the tables and add the recruiters (the first one is always available)"""
+    db.query(InfoSessionStep).delete()
+    db.query(InfoSession).delete()
+    db.query(Recruiter).delete()
+    for i in range(RECRUITERS):
+        db.add(Recruiter(
+            name=f"Recruiter {i}",
+            email=f"recruiter{i}@example.com",
+            status="available" if i == 0 or rng.random() < 0.8 else "busy",
+            is_active=i == 0 or rng.random() < 0.9
+        ))
+    db.commit()
+
+def replay_seed(db: Session, seed: int, registrations: int, counter: dict) -> List[str]:
+    """Play one seeded sequence; returns a line for every step where the pickers disagreed"""
+    rng = random.Random(seed)
+    reset_database(db, rng)
+    recruiters = db.query(Recruiter).order_by(Recruiter.id).all()
+    mismatches = []
+
+    for i in range(registrations):
+        # Recruiters go on break and come back (the first one stays available)
+        if rng.random() < 0.1:
+            recruiter = rng.choice(recruiters[1:])
+            recruiter.status = "busy" if recruiter.status == "available" else "available"
+            db.flush()
+
+        time_slot = rng.choice(TIME_SLOTS)
+        session_date = FIRST_DAY + timedelta(days=rng.randrange(DAYS))
+
+        counter["queries"] = 0
+        expected = legacy_get_next_recruiter(db, time_slot, session_date)
+        counter["legacy"] += counter["queries"]
+        counter["queries"] = 0
+        actual = get_next_recruiter(db, time_slot, session_date)
+        counter["grouped"] += counter["queries"]
+        counter["steps"] += 1
+
+        if actual.id != expected.id:
+            mismatches.append(f"seed {seed} step {i}: {time_slot} {session_date} old={expected.id} new={actual.id}")
+
+        # Some registrations stay unassigned (left for the background sweep)
+        db.add(InfoSession(
+            first_name=f"Replay{i}",
+            last_name="Candidate",
+            email=f"replay{seed}x{i}@example.com",
+            phone="3055550100",
+            zip_code="33101",
+            session_type="new-hire",
+            time_slot=time_slot,
+            status=rng.choice(STATUSES),
+            service_date=session_date,
+            assigned_recruiter_id=None if rng.random() < 0.1 else expected.id
+        ))
+        db.flush()
+
+    db.commit()
+    return mismatches
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Check that the grouped-load picker assigns like the old per-recruiter counting")
+    parser.add_argument("--seeds", type=int, default=30, help="Number of seeded sequences to replay")
+    parser.add_argument("--registrations", type=int, default=120, help="Registrations per sequence")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    counter = {"queries": 0, "legacy": 0, "grouped": 0, "steps": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_query(conn, cursor, statement, parameters, context, executemany):
+        counter["queries"] += 1
+
+    print(f"🔁 Replaying {args.seeds} seeds x {args.registrations} registrations")
+    mismatches = 0
+    db = SessionLocal()
+    try:
+        for seed in range(args.seeds):
+            # get_next_recruiter prints a line per round-robin pick; keep the report readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                seed_mismatches = replay_seed(db, seed, args.registrations, counter)
+            for line in seed_mismatches:
+                print(f"❌ {line}")
+            mismatches += len(seed_mismatches)
+    finally:
+        db.close()
+
+    print("\n📊 Results")
+    print(f"   Assignments compared:  {counter['steps']}")
+    print(f"   Queries/assign (old):  {counter['legacy'] / counter['steps']:.1f}")
+    print(f"   Queries/assign (new):  {counter['grouped'] / counter['steps']:.1f}")
+    if mismatches:
+        print(f"❌ {mismatches} assignments differ")
+        sys.exit(1)
+    print("✅ Old and new pickers made the same assignments")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Check that the scheduler's interview averages measure the interview, not the lobby wait
+Registers applicants through the API, lets each wait in the lobby, starts and completes
+them through the recruiter endpoints and compares get_average_interview_minutes with the
+known interview lengths. Time is simulated by moving the stored timestamps back.
+Exits non-zero if registration stamps started_at, /start is refused, or the average is off.
+
+Usage:
+    python check_interview_average.py
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+# Always check against a throwaway SQLite file so the real database is never touched
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/interview_average.db"
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fastapi.testclient import TestClient
+
+LOBBY_MINUTES = 30
+INTERVIEW_MINUTES = [10, 12, 14]
+TOLERANCE_MINUTES = 0.5
+
+def run_flow(client: TestClient, i: int, interview_minutes: int) -> str:
+    """registered -> started -> completed for one applicant; returns an error or an empty string"""
+    from app.database import SessionLocal
+    from app.models.info_session import InfoSession
+
+    response = client.post("/api/info-session/register", json={
+        "first_name": f"Average{i}",
+        "last_name": "Candidate",
+        "email": f"average{i}@example.com",
+        "phone": "3055550100",
+        "zip_code": "33101",
+        "session_type": "new-hire",
+        "time_slot": "8:30 AM",
+    })
+    response.raise_for_status()
+    session = response.json()
+    if session["started_at"] is not None:
+        return f"registration stamped started_at={session['started_at']}"
+    session_id, recruiter_id = session["id"], session["assigned_recruiter_id"]
+
+    def shift(**minutes_back):
+        """Move stored timestamps back, as if that much time had passed since they were written"""
+        db = SessionLocal()
+        try:
+            row = db.get(InfoSession, session_id)
+            for column, minutes in minutes_back.items():
+                setattr(row, column, getattr(row, column) - timedelta(minutes=minutes))
+            db.commit()
+        finally:
+            db.close()
+
+    # The applicant waits in the lobby, then the interview runs
+    shift(created_at=LOBBY_MINUTES)
+    response = client.post(f"/api/recruiter/{recruiter_id}/sessions/{session_id}/start")
+    if response.status_code != 200:
+        return f"/start answered {response.status_code}: {response.text}"
+    shift(created_at=interview_minutes, started_at=interview_minutes)
+    response = client.post(f"/api/recruiter/{recruiter_id}/sessions/{session_id}/complete", json={})
+    response.raise_for_status()
+    return ""
+
+def main_cli():
+    # The app prints a line per request; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        import main
+        from app.database import SessionLocal
+        from app.services.recruiter_service import get_average_interview_minutes, invalidate_interview_minutes
+        from app.utils.date_utils import miami_today
+
+        # No lifespan: the background assignment worker is not needed here
+        client = TestClient(main.app)
+        errors = [run_flow(client, i, minutes) for i, minutes in enumerate(INTERVIEW_MINUTES)]
+
+        invalidate_interview_minutes()
+        db = SessionLocal()
+        try:
+            _, overall = get_average_interview_minutes(db, miami_today())
+        finally:
+            db.close()
+
+    expected = sum(INTERVIEW_MINUTES) / len(INTERVIEW_MINUTES)
+    print(f"⏱️ {len(INTERVIEW_MINUTES)} interviews of {INTERVIEW_MINUTES} min after a {LOBBY_MINUTES} min lobby wait")
+    print(f"   Expected average: {expected:.1f} min")
+    print(f"   Scheduler average: {overall:.1f} min")
+    errors = [error for error in errors if error]
+    for error in errors:
+        print(f"❌ {error}")
+    if errors or abs(overall - expected) > TOLERANCE_MINUTES:
+        print("❌ The average does not match the interview lengths")
+        sys.exit(1)
+    print("✅ The average measures the interview only")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Query-count check for the info session list endpoints
+Seeds a scratch database with N sessions (each with a recruiter and steps), calls every
+list endpoint and counts SQL statements with a before_cursor_execute listener.
+Recruiters and steps are loaded with selectinload, so the count must not grow with N;
+exits non-zero if any endpoint issues a different number of statements for the two sizes.
+
+Usage:
+    python check_list_query_counts.py
+    python check_list_query_counts.py --small 10 --large 200
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Always check against a throwaway SQLite file so the real database is never touched
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/list_query_counts.db"
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+RECRUITERS = 5
+ENDPOINTS = [
+    "/api/info-session/live",
+    "/api/info-session/completed",
+    "/api/info-session/",
+    "/api/recruiter/{recruiter_id}/assigned-sessions",
+]
+
+def seed_sessions(count: int) -> int:
+    """Replace all sessions with count fresh ones spread over the recruiters; returns a recruiter id"""
+    from app.database import SessionLocal
+    from app.models.info_session import InfoSession, InfoSessionStep
+    from app.models.recruiter import Recruiter
+
+    db = SessionLocal()
+    try:
+        db.query(InfoSessionStep).delete()
+        db.query(InfoSession).delete()
+        recruiters = db.query(Recruiter).order_by(Recruiter.id).all()
+        for i in range(count):
+            db.add(InfoSession(
+                first_name=f"List{i}",
+                last_name="Candidate",
+                email=f"list{i}@example.com",
+                phone="3055550100",
+                zip_code="33101",
+                session_type="new-hire",
+                time_slot="8:30 AM",
+                # Every other session is completed so /completed has rows too
+                status="completed" if i % 2 else "in-progress",
+                assigned_recruiter_id=recruiters[i % len(recruiters)].id,
+                steps=[
+                    InfoSessionStep(step_name=f"step_{n}", step_description="Step description", is_completed=n < 2)
+                    for n in range(3)
+                ]
+            ))
+        db.commit()
+        return recruiters[0].id
+    finally:
+        db.close()
+
+def count_queries(client: TestClient, engine, count: int) -> dict:
+    """Statements issued by each endpoint with count sessions in the database"""
+    recruiter_id = seed_sessions(count)
+    statements = 0
+
+    def _count_query(conn, cursor, statement, parameters, context, executemany):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", _count_query)
+    try:
+        counts = {}
+        for endpoint in ENDPOINTS:
+            statements = 0
+            response = client.get(endpoint.format(recruiter_id=recruiter_id))
+            response.raise_for_status()
+            counts[endpoint] = statements
+        return counts
+    finally:
+        event.remove(engine, "before_cursor_execute", _count_query)
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Check that list endpoints issue a constant number of queries")
+    parser.add_argument("--small", type=int, default=10, help="Sessions in the small run")
+    parser.add_argument("--large", type=int, default=200, help="Sessions in the large run")
+    args = parser.parse_args()
+
+    # The app prints a line per session on some paths; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        import main
+        from app.database import SessionLocal, engine
+        from app.services.recruiter_service import initialize_default_recruiters
+
+        db = SessionLocal()
+        try:
+            initialize_default_recruiters(db)
+            db.commit()
+        finally:
+            db.close()
+
+        # No lifespan: the background assignment worker would add its own queries
+        client = TestClient(main.app)
+        small = count_queries(client, engine, args.small)
+        large = count_queries(client, engine, args.large)
+
+    print(f"🔎 Statements per request with {args.small} and {args.large} sessions")
+    failures = 0
+    for endpoint in ENDPOINTS:
+        same = small[endpoint] == large[endpoint]
+        failures += not same
+        print(f"   {'✅' if same else '❌'} {endpoint}: {small[endpoint]} vs {large[endpoint]}")
+    if failures:
+        print(f"❌ {failures} endpoints issue more queries as the page grows")
+        sys.exit(1)
+    print("✅ Query counts do not depend on the number of sessions")
+
+if __name__ == "__main__":
+    main_cli()
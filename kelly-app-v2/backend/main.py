@@ -11,6 +11,10 @@ import os
 from app.api import info_session, admin, announcements, info_session_config, new_hire_orientation_config, new_hire_orientation, recruiter, auth, visits, exclusion_list, row_template, chr, statistics, event, meet_greet, paraprofessional_config, storage
 from app.database import engine, Base, SessionLocal
 from app.services.user_service import initialize_default_admin
+from app.services.recruiter_service import initialize_default_recruiters
+from app.services.assignment_worker import start_assignment_worker, stop_assignment_worker
+from app.services.activity_rollup import rebuild_activity_rollup, rollup_is_empty
+from contextlib import asynccontextmanager
 import sqlite3
 from pathlib import Path
 
@@ -29,7 +33,8 @@ from app.models import (
     visit as visit_model,
     event as event_model,
     paraprofessional_config as paraprofessional_config_model,
-    storage as storage_model
+    storage as storage_model,
+    daily_activity_rollup as daily_activity_rollup_model
 )
 
 # Create database tables (models must be imported first)
@@ -135,6 +140,90 @@ except Exception as e:
     print(f"⚠️  Warning: Could not add fields: {e}")
     print("   The fields will be added automatically on next database creation.")
 
+# Columns and indexes added for list/registration performance (SQLite and PostgreSQL)
+# create_all only creates missing tables, so existing databases get them here
+ADDED_COLUMNS = [
+    ("info_sessions", "identity_key", "VARCHAR(500)"),
+    ("info_sessions", "exclusion_match_id", "INTEGER"),
+    ("info_sessions", "exclusion_match_name", "VARCHAR(255)"),
+    ("info_sessions", "exclusion_match_code", "VARCHAR(50)"),
+    ("info_sessions", "exclusion_match_ssn", "VARCHAR(20)"),
+    ("info_sessions", "email_normalized", "VARCHAR(255)"),
+    ("info_sessions", "service_date", "DATE"),
+    ("new_hire_orientations", "email_normalized", "VARCHAR(255)"),
+    ("new_hire_orientations", "service_date", "DATE"),
+    ("exclusion_list", "row_hash", "VARCHAR(40)"),
+]
+ADDED_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_info_sessions_identity_key ON info_sessions (identity_key)",
+    "CREATE INDEX IF NOT EXISTS ix_info_sessions_service_date ON info_sessions (service_date)",
+    "CREATE INDEX IF NOT EXISTS ix_info_sessions_email_date_slot ON info_sessions (email_normalized, service_date, time_slot)",
+    "CREATE INDEX IF NOT EXISTS ix_info_sessions_assigned_recruiter_id ON info_sessions (assigned_recruiter_id)",
+    "CREATE INDEX IF NOT EXISTS ix_new_hire_orientations_service_date ON new_hire_orientations (service_date)",
+    "CREATE INDEX IF NOT EXISTS ix_new_hire_orientations_email_date_slot ON new_hire_orientations (email_normalized, service_date, time_slot)",
+    "CREATE INDEX IF NOT EXISTS ix_exclusion_list_row_hash ON exclusion_list (row_hash)",
+    # Reporting windows filter and sort on created_at (local dates converted to UTC bounds)
+    "CREATE INDEX IF NOT EXISTS ix_info_sessions_created_at ON info_sessions (created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_new_hire_orientations_created_at ON new_hire_orientations (created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_team_visits_created_at ON team_visits (created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_badges_created_at ON badges (created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_fingerprints_created_at ON fingerprints (created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_meet_greets_created_at ON meet_greets (created_at)",
+]
+try:
+    from sqlalchemy import text, inspect
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table_name, column_name, column_type in ADDED_COLUMNS:
+            existing_columns = [col['name'] for col in inspector.get_columns(table_name)]
+            if column_name not in existing_columns:
+                print(f"📝 Adding '{column_name}' column to {table_name}...")
+                conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}"))
+                print(f"✅ Column '{column_name}' added successfully")
+        for index_sql in ADDED_INDEXES:
+            conn.execute(text(index_sql))
+
+    # Backfill derived columns for rows created before they existed
+    db = SessionLocal()
+    try:
+        missing_keys = db.query(info_session_model.InfoSession).filter(
+            info_session_model.InfoSession.identity_key == None
+        ).all()
+        for session in missing_keys:
+            session.identity_key = info_session_model.build_identity_key(session.first_name, session.last_name, session.email)
+        if missing_keys:
+            db.commit()
+            print(f"✅ Backfilled identity_key for {len(missing_keys)} info sessions")
+        from app.utils.date_utils import to_miami_date
+        for model in (info_session_model.InfoSession, visit_model.NewHireOrientation):
+            missing_dates = db.query(model).filter(
+                (model.service_date == None) | (model.email_normalized == None)
+            ).all()
+            for row in missing_dates:
+                row.email_normalized = info_session_model.normalize_email(row.email)
+                if row.service_date is None and row.created_at is not None:
+                    row.service_date = to_miami_date(row.created_at)
+            if missing_dates:
+                db.commit()
+                print(f"✅ Backfilled email_normalized/service_date for {len(missing_dates)} {model.__tablename__}")
+        from app.services.exclusion_service import refresh_exclusion_snapshots, rebuild_exclusion_index, backfill_exclusion_row_hashes
+        hashed = backfill_exclusion_row_hashes(db)
+        if hashed:
+            db.commit()
+            print(f"✅ Backfilled row_hash for {hashed} exclusion list entries")
+        rebuild_exclusion_index(db)
+        if refresh_exclusion_snapshots(db, only_missing=True):
+            db.commit()
+        if rollup_is_empty(db):
+            counted = rebuild_activity_rollup(db)
+            db.commit()
+            if counted:
+                print(f"✅ Built daily_activity_rollup from {counted} visit rows")
+    finally:
+        db.close()
+except Exception as e:
+    print(f"⚠️  Warning: Could not apply performance migrations: {e}")
+
 # Initialize default admin user (non-blocking)
 try:
     db = SessionLocal()
@@ -146,10 +235,29 @@ except Exception as e:
     print(f"⚠️  Warning: Could not initialize admin user: {e}")
     print("   You can create the admin user manually later or fix the database.")
 
+# Seed the default recruiters once (the assignment worker no longer does it on every sweep)
+try:
+    db = SessionLocal()
+    try:
+        initialize_default_recruiters(db)
+        db.commit()
+    finally:
+        db.close()
+except Exception as e:
+    print(f"⚠️  Warning: Could not initialize default recruiters: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Unassigned sessions are picked up in the background, never on GET requests
+    start_assignment_worker()
+    yield
+    stop_assignment_worker()
+
 app = FastAPI(
     title="Kelly Education Front Desk API",
     description="Backend API for Kelly Education Miami Dade Front Desk",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # CORS configuration - AGGRESSIVE FIX for Railway
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Script to rebuild the daily_activity_rollup table from the visit tables
+The app keeps the rollup current on every write (and builds it on first start);
+run this after bulk SQL changes or restores that bypassed the app.
+Rebuilds in one transaction, so run it when the front desk is quiet.
+
+Usage:
+    python rebuild_activity_rollup.py
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.database import SessionLocal, engine, Base
+from app.models.daily_activity_rollup import DailyActivityRollup
+from app.services.activity_rollup import rebuild_activity_rollup
+
+def main():
+    """Recompute every rollup row"""
+    Base.metadata.create_all(bind=engine, tables=[DailyActivityRollup.__table__])
+    db = SessionLocal()
+    try:
+        counted = rebuild_activity_rollup(db)
+        db.commit()
+        rows = db.query(DailyActivityRollup).count()
+        print(f"✅ Rebuilt daily_activity_rollup: {rows} rows from {counted} visit rows")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Replay / simulation harness for recruiter assignment
+Plays a day of registrations, interview starts and completions (plus recruiter
+breaks) in simulated time against a scratch database, driving the same
+assignment function the registration endpoint uses. Reports assignment throughput
+and latency, per-recruiter load and how long applicants wait for their interview.
+
+A day is either generated (arrival bursts around each time slot) or replayed from
+the info_sessions of a real database (arrival times, slots and interview lengths).
+Several strategies can be compared on the same day in one run.
+
+Usage:
+    python simulate_assignment.py --registrations 120 --recruiters 5
+    python simulate_assignment.py --strategy capacity --strategy equitable --strategy round_robin --break-rate 0.5
+    python simulate_assignment.py --replay-url sqlite:///./kelly_app.db --replay-date 2025-01-06
+"""
+import argparse
+import contextlib
+import heapq
+import io
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter, deque
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+# Always simulate against a throwaway SQLite file so the real database is never touched
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/simulation.db"
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.database import Base, SessionLocal, engine
+from app.models.info_session import InfoSession, InfoSessionStep
+from app.models.recruiter import Recruiter
+from app.services.recruiter_service import (
+    RecruiterAssignment, assign_recruiter_by_capacity, get_next_recruiter, invalidate_interview_minutes
+)
+from app.utils.date_utils import to_miami_datetime
+
+TIME_SLOTS = {"8:30 AM": (8, 30), "1:30 PM": (13, 30)}
+SIMULATED_DAY = date(2025, 1, 6)  # a Monday
+
+class Arrival(NamedTuple):
+    """One applicant: when they register, for which slot, and how long their steps and interview take"""
+    minute: float
+    time_slot: str
+    prep_minutes: float
+    interview_minutes: float
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def slot_minute(time_slot: str) -> int:
+    hour, minute = TIME_SLOTS.get(time_slot, (8, 30))
+    return hour * 60 + minute
+
+def generate_day(args, rng: random.Random) -> List[Arrival]:
+    """Arrival bursts around each slot start (most people scan the QR in the first minutes)"""
+    arrivals = []
+    slots = list(TIME_SLOTS)
+    for i in range(args.registrations):
+        time_slot = slots[i % len(slots)]
+        offset = rng.triangular(-20, 30, 0)
+        arrivals.append(Arrival(
+            minute=slot_minute(time_slot) + offset,
+            time_slot=time_slot,
+            prep_minutes=max(5.0, rng.gauss(args.prep_minutes, args.prep_minutes / 4)),
+            interview_minutes=max(2.0, rng.lognormvariate(0, 0.4) * args.interview_minutes),
+        ))
+    return sorted(arrivals)
+
+def replay_day(args, rng: random.Random) -> List[Arrival]:
+    """Arrivals, slots and interview lengths of one service date in a real database (read-only)"""
+    source = sessionmaker(bind=create_engine(args.replay_url))()
+    try:
+        rows = source.query(
+            InfoSession.created_at, InfoSession.time_slot, InfoSession.started_at, InfoSession.completed_at
+        ).filter(
+            InfoSession.service_date == date.fromisoformat(args.replay_date)
+        ).order_by(InfoSession.created_at).all()
+    finally:
+        source.close()
+
+    arrivals = []
+    for created_at, time_slot, started_at, completed_at in rows:
+        if created_at is None:
+            continue
+        interview = None
+        if started_at and completed_at and completed_at > started_at:
+            interview = (completed_at - started_at).total_seconds() / 60
+        if interview is None or not 1 <= interview <= 120:
+            interview = max(2.0, rng.lognormvariate(0, 0.4) * args.interview_minutes)
+        # created_at is stored in UTC; slot times are Miami-local
+        local = to_miami_datetime(created_at)
+        arrivals.append(Arrival(
+            minute=local.hour * 60 + local.minute + local.second / 60,
+            time_slot=time_slot,
+            prep_minutes=max(5.0, rng.gauss(args.prep_minutes, args.prep_minutes / 4)),
+            interview_minutes=interview,
+        ))
+    return arrivals
+
+# ---------------------------------------------------------------------------
+# Strategies: (db, time_slot, session_date, now) -> RecruiterAssignment
+# ---------------------------------------------------------------------------
+
+AssignFunction = Callable[[Session, str, date, datetime], RecruiterAssignment]
+
+def equitable_strategy() -> AssignFunction:
+    """Count-based balancing (get_next_recruiter): available recruiters only"""
+    return lambda db, time_slot, session_date, now: RecruiterAssignment(get_next_recruiter(db, time_slot, session_date), None)
+
+def round_robin_strategy() -> AssignFunction:
+    """Baseline: next available recruiter by id, ignoring load"""
+    last_id = [0]
+
+    def assign(db: Session, time_slot: str, session_date: date, now: datetime) -> RecruiterAssignment:
+        available = db.query(Recruiter).filter(
+            Recruiter.is_active == True, Recruiter.status == "available"
+        ).order_by(Recruiter.id).all()
+        if not available:
+            return RecruiterAssignment(get_next_recruiter(db, time_slot, session_date), None)
+        chosen = next((recruiter for recruiter in available if recruiter.id > last_id[0]), available[0])
+        last_id[0] = chosen.id
+        return RecruiterAssignment(chosen, None)
+
+    return assign
+
+STRATEGIES: Dict[str, Callable[[], AssignFunction]] = {
+    "capacity": lambda: assign_recruiter_by_capacity,  # what registration uses
+    "equitable": equitable_strategy,
+    "round_robin": round_robin_strategy,
+}
+
+# ---------------------------------------------------------------------------
+# Discrete-event simulation
+# ---------------------------------------------------------------------------
+
+class RecruiterState:
+    """In-memory desk state for one staffed recruiter"""
+    def __init__(self, recruiter_id: int, speed: float):
+        self.recruiter_id = recruiter_id
+        self.speed = speed  # multiplies interview lengths (0.8 = 20% faster than typical)
+        self.queue = deque()
+        self.serving: Optional[int] = None
+        self.on_break = False
+
+def reset_database(recruiters: int) -> List[int]:
+    """Empty the scratch tables and seed the staffed recruiters"""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.query(InfoSessionStep).delete()
+        db.query(InfoSession).delete()
+        db.query(Recruiter).delete()
+        db.add_all([
+            Recruiter(name=f"Recruiter {i + 1}", email=f"recruiter{i + 1}@kellyeducation.com", status="available")
+            for i in range(recruiters)
+        ])
+        db.commit()
+        return [recruiter_id for (recruiter_id,) in db.query(Recruiter.id).order_by(Recruiter.id)]
+    finally:
+        db.close()
+
+def simulate(strategy_name: str, arrivals: List[Arrival], args, query_counter: List[int]) -> dict:
+    """Run one strategy over the day and collect metrics"""
+    staffed_ids = reset_database(args.recruiters)
+    invalidate_interview_minutes()
+    rng = random.Random(args.seed + 1)
+    desks = {
+        recruiter_id: RecruiterState(recruiter_id, rng.uniform(1 - args.speed_spread, 1 + args.speed_spread))
+        for recruiter_id in staffed_ids
+    }
+    assign = STRATEGIES[strategy_name]()
+    day_start = datetime.combine(SIMULATED_DAY, datetime.min.time(), tzinfo=timezone.utc)
+
+    def at(minute: float) -> datetime:
+        return day_start + timedelta(minutes=minute)
+
+    events = []
+    sequence = 0
+
+    def schedule(minute: float, kind: str, payload):
+        nonlocal sequence
+        sequence += 1
+        heapq.heappush(events, (minute, sequence, kind, payload))
+
+    for arrival in arrivals:
+        schedule(arrival.minute, "arrive", arrival)
+    if args.break_rate > 0:
+        first, last = min(a.minute for a in arrivals), max(a.minute for a in arrivals) + 120
+        for recruiter_id in staffed_ids:
+            minute = first
+            while True:
+                minute += rng.expovariate(args.break_rate / 60)
+                if minute > last:
+                    break
+                schedule(minute, "break_start", recruiter_id)
+
+    assign_latencies = []
+    assign_queries = 0
+    assigned_to = Counter()
+    ready_at: Dict[int, float] = {}
+    interview_length: Dict[int, float] = {}
+    waits = []
+    unstaffed = 0
+    last_completion = 0.0
+    db = SessionLocal()
+
+    def set_recruiter_status(recruiter_id: int, status: str):
+        db.query(Recruiter).filter(Recruiter.id == recruiter_id).update({"status": status})
+
+    def try_start(desk: RecruiterState, minute: float):
+        """Start the next ready applicant if the recruiter is free (recruiter goes busy, like /start)"""
+        if desk.serving is not None or desk.on_break or not desk.queue:
+            return
+        session_id = desk.queue.popleft()
+        desk.serving = session_id
+        waits.append(minute - ready_at[session_id])
+        db.query(InfoSession).filter(InfoSession.id == session_id).update(
+            {"status": "in-progress", "started_at": at(minute)}
+        )
+        set_recruiter_status(desk.recruiter_id, "busy")
+        db.commit()
+        schedule(minute + interview_length[session_id] * desk.speed, "complete", desk.recruiter_id)
+
+    try:
+        while events:
+            minute, _, kind, payload = heapq.heappop(events)
+            if kind == "arrive":
+                query_counter[0] = 0
+                start = time.perf_counter()
+                recruiter = assign(db, payload.time_slot, SIMULATED_DAY, at(minute)).recruiter
+                session = InfoSession(
+                    first_name="Sim", last_name=f"Applicant{sequence}", email=f"sim{sequence}@example.com",
+                    phone="3055550100", zip_code="33101", session_type="new-hire", time_slot=payload.time_slot,
+                    status="initiated", assigned_recruiter_id=recruiter.id, service_date=SIMULATED_DAY,
+                    started_at=at(minute), created_at=at(minute),
+                )
+                db.add(session)
+                db.commit()
+                assign_latencies.append((time.perf_counter() - start) * 1000)
+                assign_queries += query_counter[0]
+                assigned_to[recruiter.id] += 1
+                interview_length[session.id] = payload.interview_minutes
+                schedule(minute + payload.prep_minutes, "ready", (session.id, recruiter.id))
+            elif kind == "ready":
+                session_id, recruiter_id = payload
+                db.query(InfoSession).filter(InfoSession.id == session_id).update({"status": "answers_submitted"})
+                db.commit()
+                desk = desks.get(recruiter_id)
+                if desk is None:
+                    # Assigned to a recruiter nobody staffs (e.g. the auto-created fallback)
+                    unstaffed += 1
+                    continue
+                ready_at[session_id] = minute
+                desk.queue.append(session_id)
+                try_start(desk, minute)
+            elif kind == "complete":
+                desk = desks[payload]
+                db.query(InfoSession).filter(InfoSession.id == desk.serving).update(
+                    {"status": "completed", "completed_at": at(minute)}
+                )
+                desk.serving = None
+                set_recruiter_status(desk.recruiter_id, "available")
+                db.commit()
+                invalidate_interview_minutes()
+                last_completion = max(last_completion, minute)
+                try_start(desk, minute)
+            elif kind == "break_start":
+                desk = desks[payload]
+                if desk.serving is None and not desk.on_break:
+                    desk.on_break = True
+                    set_recruiter_status(desk.recruiter_id, "busy")
+                    db.commit()
+                    schedule(minute + args.break_minutes, "break_end", payload)
+            elif kind == "break_end":
+                desk = desks[payload]
+                desk.on_break = False
+                set_recruiter_status(desk.recruiter_id, "available")
+                db.commit()
+                try_start(desk, minute)
+        extra_recruiters = db.query(Recruiter).count() - len(staffed_ids)
+    finally:
+        db.close()
+
+    staffed_loads = [assigned_to.get(recruiter_id, 0) for recruiter_id in staffed_ids]
+    return {
+        "strategy": strategy_name,
+        "registrations": len(assign_latencies),
+        "assign_p50": percentile(assign_latencies, 50),
+        "assign_p99": percentile(assign_latencies, 99),
+        "throughput": len(assign_latencies) / (sum(assign_latencies) / 1000),
+        "queries": assign_queries / len(assign_latencies),
+        "loads": staffed_loads,
+        "load_stdev": statistics.pstdev(staffed_loads),
+        "load_spread": max(staffed_loads) - min(staffed_loads),
+        "unstaffed": unstaffed,
+        "extra_recruiters": extra_recruiters,
+        "wait_mean": statistics.mean(waits) if waits else 0.0,
+        "wait_p50": percentile(waits, 50) if waits else 0.0,
+        "wait_p90": percentile(waits, 90) if waits else 0.0,
+        "wait_max": max(waits) if waits else 0.0,
+        "last_completion": last_completion,
+    }
+
+def print_report(result: dict):
+    last = int(result["last_completion"])
+    print(f"\n📊 {result['strategy']}")
+    print(f"   Registrations:      {result['registrations']}")
+    print(f"   Assignment latency: p50 {result['assign_p50']:.2f} ms   p99 {result['assign_p99']:.2f} ms   "
+          f"({result['throughput']:.0f} assignments/s, {result['queries']:.1f} queries each)")
+    print(f"   Load per recruiter: {result['loads']}   stdev {result['load_stdev']:.2f}   spread {result['load_spread']}")
+    print(f"   Wait for interview: mean {result['wait_mean']:.1f} min   p50 {result['wait_p50']:.1f}   "
+          f"p90 {result['wait_p90']:.1f}   max {result['wait_max']:.1f}")
+    print(f"   Last completion:    {last // 60:02d}:{last % 60:02d}")
+    if result["unstaffed"] or result["extra_recruiters"]:
+        print(f"   ⚠️ {result['unstaffed']} applicants assigned to {result['extra_recruiters']} auto-created "
+              f"recruiter(s) nobody staffs (everyone was busy when they registered)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate or replay a day of recruiter assignment")
+    parser.add_argument("--registrations", type=int, default=120, help="Applicants in a generated day")
+    parser.add_argument("--recruiters", type=int, default=5, help="Staffed recruiters")
+    parser.add_argument("--prep-minutes", type=float, default=25, help="Mean time to finish the info session steps")
+    parser.add_argument("--interview-minutes", type=float, default=12, help="Median interview length")
+    parser.add_argument("--speed-spread", type=float, default=0.3, help="Recruiter interview speeds vary by ± this fraction")
+    parser.add_argument("--break-rate", type=float, default=0.0, help="Breaks per recruiter per hour (recruiter set to busy)")
+    parser.add_argument("--break-minutes", type=float, default=10, help="Length of each break")
+    parser.add_argument("--strategy", action="append", choices=sorted(STRATEGIES), help="Repeat to compare (default: capacity)")
+    parser.add_argument("--replay-url", help="Database to replay a real day from (read-only)")
+    parser.add_argument("--replay-date", help="Service date to replay (YYYY-MM-DD)")
+    parser.add_argument("--max-p99-ms", type=float, help="Exit non-zero if assignment p99 exceeds this")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    if args.replay_url:
+        if not args.replay_date:
+            parser.error("--replay-date is required with --replay-url")
+        arrivals = replay_day(args, rng)
+        print(f"🔁 Replaying {len(arrivals)} registrations from {args.replay_date}")
+    else:
+        arrivals = generate_day(args, rng)
+        print(f"🚀 Simulating {len(arrivals)} registrations")
+    if not arrivals:
+        print("❌ No registrations to simulate")
+        sys.exit(1)
+    print(f"   Recruiters: {args.recruiters} (speed ±{args.speed_spread:.0%})   breaks/hour: {args.break_rate}   "
+          f"interview median: {args.interview_minutes} min")
+
+    query_counter = [0]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_query(conn, cursor, statement, parameters, context, executemany):
+        query_counter[0] += 1
+
+    # The service prints a line per assignment; keep the report readable
+    results = []
+    for strategy_name in args.strategy or ["capacity"]:
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = simulate(strategy_name, arrivals, args, query_counter)
+        results.append(result)
+        print_report(result)
+
+    if args.max_p99_ms is not None:
+        slow = [result["strategy"] for result in results if result["assign_p99"] > args.max_p99_ms]
+        if slow:
+            print(f"\n❌ Assignment p99 above {args.max_p99_ms} ms: {', '.join(slow)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
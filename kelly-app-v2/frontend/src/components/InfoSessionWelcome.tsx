@@ -17,6 +17,7 @@ function InfoSessionWelcome({ sessionData, onSessionCompleted }: Props) {
   const [currentSessionData, setCurrentSessionData] = useState(sessionData)
   const [showQuestions, setShowQuestions] = useState(false)
   const [questionsSubmitted, setQuestionsSubmitted] = useState(false)
+  const [estimatedWait, setEstimatedWait] = useState<number | null>(sessionData.estimated_wait_minutes ?? null)
   const isParaprofessional = sessionData.session_type === 'paraprofessional'
   const [questions, setQuestions] = useState({
     q1: sessionData.question_1_response || '',
@@ -59,6 +60,7 @@ function InfoSessionWelcome({ sessionData, onSessionCompleted }: Props) {
       try {
         const latest = await getInfoSession(sessionData.id)
         setCurrentSessionData(latest)
+        setEstimatedWait(latest.estimated_wait_minutes ?? null)
         
         // Only update steps if backend has changes (don't overwrite optimistic local updates)
         // Compare current steps with latest steps to see if there are real changes
@@ -134,6 +136,22 @@ function InfoSessionWelcome({ sessionData, onSessionCompleted }: Props) {
     }
   }, [sessionData.id, isCompleted, questionsSubmitted])
 
+  // Keep the estimated wait fresh until the recruiter starts the interview (estimate becomes null)
+  const waitingForRecruiter = estimatedWait !== null
+  useEffect(() => {
+    if (!waitingForRecruiter) return
+    const refreshEstimate = async () => {
+      try {
+        const latest = await getInfoSession(sessionData.id)
+        setEstimatedWait(latest.estimated_wait_minutes ?? null)
+      } catch (error) {
+        console.error('Error refreshing estimated wait:', error)
+      }
+    }
+    const interval = setInterval(refreshEstimate, 30000)
+    return () => clearInterval(interval)
+  }, [sessionData.id, waitingForRecruiter])
+
   // Sync questions from latest session data when currentSessionData changes
   // Only update if user is NOT actively editing (questionsSubmitted = true means view mode)
   useEffect(() => {
@@ -264,6 +282,17 @@ function InfoSessionWelcome({ sessionData, onSessionCompleted }: Props) {
             Welcome to Kelly Education Miami Dade
           </h1>
 
+          {estimatedWait !== null && (
+            <div className="mb-6 p-4 bg-yellow-50 rounded-lg border-l-4 border-yellow-500 text-center">
+              <p className="text-lg text-gray-800">
+                {estimatedWait <= 1
+                  ? <>⏱️ Your recruiter{currentSessionData.assigned_recruiter_name ? ` (${currentSessionData.assigned_recruiter_name})` : ''} will be ready for you shortly</>
+                  : <>⏱️ Estimated wait for your recruiter{currentSessionData.assigned_recruiter_name ? ` (${currentSessionData.assigned_recruiter_name})` : ''}: <strong>about {estimatedWait} minutes</strong></>}
+              </p>
+              <p className="text-sm text-gray-600 mt-1">Please complete the steps below while you wait</p>
+            </div>
+          )}
+
           <div className="mb-8 p-6 bg-blue-50 rounded-lg border-l-4 border-blue-500">
             <p className="text-gray-700 mb-4">
               For our process you must be able to communicate in English, have your Education Proof. 
@@ -18,6 +18,7 @@ function AdminDashboard() {
   const [success, setSuccess] = useState<string | null>(null)
   const [showExclusionUpload, setShowExclusionUpload] = useState(false)
   const [uploading, setUploading] = useState(false)
+  const [mergeUpload, setMergeUpload] = useState(false)
   const [exclusionPreview, setExclusionPreview] = useState<any[]>([])
   const [exclusionTotal, setExclusionTotal] = useState(0)
   const [loadingExclusion, setLoadingExclusion] = useState(false)
@@ -155,8 +156,11 @@ function AdminDashboard() {
     setSuccess(null)
 
     try {
-      const result = await uploadExclusionList(file)
-      setSuccess(`Exclusion list uploaded successfully! ${result.added} records added.`)
+      const result = await uploadExclusionList(file, mergeUpload ? 'merge' : 'replace')
+      const diffSummary = result.mode === 'merge'
+        ? `${result.added} added, ${result.removed} removed, ${result.changed} changed, ${result.unchanged} unchanged.`
+        : `${result.added} records added.`
+      setSuccess(`Exclusion list uploaded successfully! ${diffSummary} ${result.rescreen.flags_changed} existing registration flags changed (${result.rescreen.newly_flagged} flagged, ${result.rescreen.cleared} cleared).`)
       if (result.errors && result.errors.length > 0) {
         setError(`Some rows had errors: ${result.errors.slice(0, 3).join(', ')}`)
       }
@@ -180,8 +184,8 @@ function AdminDashboard() {
     }
 
     try {
-      await clearExclusionList()
-      setSuccess('Exclusion list cleared successfully')
+      const result = await clearExclusionList()
+      setSuccess(`Exclusion list cleared successfully. ${result.rescreen.cleared} registration flags cleared.`)
       setExclusionPreview([])
       setExclusionTotal(0)
     } catch (err: any) {
@@ -282,6 +286,15 @@ function AdminDashboard() {
                   className="hidden"
                 />
               </label>
+              <label className="flex items-center gap-2 text-gray-700">
+                <input
+                  type="checkbox"
+                  checked={mergeUpload}
+                  onChange={(e) => setMergeUpload(e.target.checked)}
+                  disabled={uploading}
+                />
+                Merge with current list (keep unchanged records)
+              </label>
               <button
                 onClick={handleClearExclusionList}
                 className="bg-red-600 hover:bg-red-700 text-white font-bold py-2 px-6 rounded-lg"
@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react'
-import { getLiveInfoSessions, getNewHireOrientations, getBadges, getFingerprints, getMyVisits, getCurrentUser, notifyTeamVisit, getNewHireOrientation, updateNewHireOrientation, bulkDeleteNewHireOrientations, deleteNewHireOrientationDuplicates } from '../services/api'
+import { getLiveInfoSessions, subscribeInfoSessionFeed, applyInfoSessionEvent, getNewHireOrientations, getBadges, getFingerprints, getMyVisits, getCurrentUser, notifyTeamVisit, getNewHireOrientation, updateNewHireOrientation, bulkDeleteNewHireOrientations, deleteNewHireOrientationDuplicates } from '../services/api'
 import type { InfoSessionWithSteps, NewHireOrientation, NewHireOrientationWithSteps } from '../types'
 import { formatMiamiTime, getMiamiDateKey, formatMiamiDateDisplay } from '../utils/dateUtils'
 import CHRPage from './CHRPage'
@@ -28,7 +28,16 @@ function ManagementDashboard() {
   }, [activeTab])
 
   useEffect(() => {
-    // Set up polling for live updates every 5 seconds
+    // The info session tab is kept current by the live feed; other tabs poll every 5 seconds
+    if (activeTab === 'info-session') {
+      return subscribeInfoSessionFeed((event) => {
+        if (event.type === 'resync') {
+          refreshDataInBackground()
+        } else {
+          setLiveSessions((sessions) => applyInfoSessionEvent(sessions, event))
+        }
+      })
+    }
     const interval = setInterval(refreshDataInBackground, 5000)
     return () => clearInterval(interval)
   }, [activeTab])
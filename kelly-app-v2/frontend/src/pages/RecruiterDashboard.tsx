@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react'
+import React, { useState, useEffect, useRef } from 'react'
 import { useParams } from 'react-router-dom'
 import {
   getRecruiterStatus,
@@ -8,6 +8,7 @@ import {
   completeSession,
   updateSessionDocuments,
   getLiveInfoSessions,
+  subscribeInfoSessionFeed,
   getInfoSessions,
   deleteInfoSession,
   downloadAnswersPDF,
@@ -247,13 +248,20 @@ function RecruiterDashboard() {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [activeTab])
 
-  // Background refresh only for sessions tab — every 30 seconds
+  // Sessions tab refreshes when the live feed reports a change to one of this recruiter's sessions
+  const sessionIdsRef = useRef<Set<number>>(new Set())
+  sessionIdsRef.current = new Set(sessions.map(s => s.id))
   useEffect(() => {
-    if (!recruiterId) return
-    const intervalId = setInterval(() => {
-      if (activeTab === 'sessions') refreshDataInBackground()
-    }, 30000)
-    return () => clearInterval(intervalId)
+    if (!recruiterId || activeTab !== 'sessions') return
+    return subscribeInfoSessionFeed((event) => {
+      if (
+        event.type === 'resync' ||
+        sessionIdsRef.current.has(event.id) ||
+        (event.type === 'upsert' && event.session.assigned_recruiter_id === parseInt(recruiterId))
+      ) {
+        refreshDataInBackground()
+      }
+    })
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [recruiterId, activeTab])
 
@@ -1,5 +1,5 @@
-import React, { useState, useEffect } from 'react'
-import { getLiveInfoSessions, getCompletedInfoSessions, getNewHireOrientations, getBadges, getFingerprints, getMyVisits, getCurrentUser, notifyTeamVisit, getNewHireOrientation, updateNewHireOrientation, bulkDeleteNewHireOrientations, deleteNewHireOrientationDuplicates } from '../services/api'
+import React, { useState, useEffect, useRef } from 'react'
+import { getLiveInfoSessions, subscribeInfoSessionFeed, applyInfoSessionEvent, loadedInfoSessionWindow, getCompletedInfoSessions, getNewHireOrientations, getBadges, getFingerprints, getMyVisits, getCurrentUser, notifyTeamVisit, getNewHireOrientation, updateNewHireOrientation, bulkDeleteNewHireOrientations, deleteNewHireOrientationDuplicates } from '../services/api'
 import type { InfoSessionWithSteps, NewHireOrientation, NewHireOrientationWithSteps } from '../types'
 import { formatMiamiTime, getMiamiDateKey, formatMiamiDateDisplay } from '../utils/dateUtils'
 import CHRPage from './CHRPage'
@@ -13,6 +13,10 @@ function StaffDashboard() {
   const [activeTab, setActiveTab] = useState<TabType>('info-session')
   const [liveSessions, setLiveSessions] = useState<InfoSessionWithSteps[]>([])
   const [completedSessions, setCompletedSessions] = useState<InfoSessionWithSteps[]>([])
+  // Cursor for older completed sessions (undefined once everything is loaded); the ref is read by the live feed
+  const [completedCursor, setCompletedCursor] = useState<string | undefined>()
+  const completedCursorRef = useRef<string | undefined>()
+  const [loadingMoreCompleted, setLoadingMoreCompleted] = useState(false)
   const [newHireOrientations, setNewHireOrientations] = useState<NewHireOrientation[]>([])
   const [selectedOrientation, setSelectedOrientation] = useState<NewHireOrientationWithSteps | null>(null)
   const [selectedNhoIds, setSelectedNhoIds] = useState<Set<number>>(new Set())
@@ -25,7 +29,18 @@ function StaffDashboard() {
   useEffect(() => {
     checkAuth()
     loadData()
-    // Set up polling for live updates every 5 seconds
+    // Info session tabs are kept current by the live feed; other tabs poll every 5 seconds
+    if (activeTab === 'info-session' || activeTab === 'info-session-completed') {
+      return subscribeInfoSessionFeed((event) => {
+        if (event.type === 'resync') {
+          loadData()
+        } else if (activeTab === 'info-session') {
+          setLiveSessions((sessions) => applyInfoSessionEvent(sessions, event))
+        } else {
+          setCompletedSessions((sessions) => applyInfoSessionEvent(sessions, event, ['completed'], loadedInfoSessionWindow(sessions, completedCursorRef.current)))
+        }
+      })
+    }
     const interval = setInterval(loadData, 5000)
     return () => clearInterval(interval)
   }, [activeTab])
@@ -57,7 +72,8 @@ function StaffDashboard() {
           break
         case 'info-session-completed':
           const completed = await getCompletedInfoSessions()
-          setCompletedSessions(completed)
+          setCompletedSessions(completed.sessions)
+          updateCompletedCursor(completed.nextCursor)
           break
         case 'new-hire-orientation':
           const orientations = await getNewHireOrientations()
@@ -83,6 +99,29 @@ function StaffDashboard() {
     }
   }
 
+  const updateCompletedCursor = (cursor?: string) => {
+    completedCursorRef.current = cursor
+    setCompletedCursor(cursor)
+  }
+
+  const loadMoreCompleted = async () => {
+    if (!completedCursor) return
+    try {
+      setLoadingMoreCompleted(true)
+      const page = await getCompletedInfoSessions(completedCursor)
+      // The live feed may already have added some of these
+      setCompletedSessions((sessions) => {
+        const loadedIds = new Set(sessions.map((s) => s.id))
+        return [...sessions, ...page.sessions.filter((s) => !loadedIds.has(s.id))]
+      })
+      updateCompletedCursor(page.nextCursor)
+    } catch (error) {
+      console.error('Error loading older completed sessions:', error)
+    } finally {
+      setLoadingMoreCompleted(false)
+    }
+  }
+
   const refreshDataInBackground = async () => {
     try {
       setRefreshing(true)
@@ -94,7 +133,8 @@ function StaffDashboard() {
           break
         case 'info-session-completed':
           const completed = await getCompletedInfoSessions()
-          setCompletedSessions(completed)
+          setCompletedSessions(completed.sessions)
+          updateCompletedCursor(completed.nextCursor)
           break
         case 'new-hire-orientation':
           const orientations = await getNewHireOrientations()
@@ -446,6 +486,17 @@ function StaffDashboard() {
             </table>
           </div>
         )}
+        {completedCursor && (
+          <div className="text-center">
+            <button
+              onClick={loadMoreCompleted}
+              disabled={loadingMoreCompleted}
+              className="px-4 py-2 bg-blue-600 text-white rounded hover:bg-blue-700 text-sm font-semibold disabled:opacity-50"
+            >
+              {loadingMoreCompleted ? 'Loading...' : 'Load older sessions'}
+            </button>
+          </div>
+        )}
       </div>
     )
   }
@@ -386,12 +386,19 @@ function StatisticsDashboard() {
                     <th className="px-4 py-2 text-right">Assigned</th>
                     <th className="px-4 py-2 text-right">Completed</th>
                     <th className="px-4 py-2 text-right">Completion Rate</th>
+                    <th className="px-4 py-2 text-right">Avg Duration</th>
+                    <th className="px-4 py-2 text-right">P90 Duration</th>
                   </tr>
                 </thead>
                 <tbody>
                   {statistics.recruiter_performance.map((recruiter, index) => (
                     <tr key={index} className="border-b hover:bg-gray-50">
-                      <td className="px-4 py-2 font-semibold">{recruiter.recruiter_name}</td>
+                      <td className="px-4 py-2 font-semibold">
+                        {recruiter.recruiter_name}
+                        {!recruiter.is_active && (
+                          <span className="ml-2 text-xs font-normal text-gray-500">(inactive)</span>
+                        )}
+                      </td>
                       <td className="px-4 py-2 text-right">{recruiter.assigned_sessions}</td>
                       <td className="px-4 py-2 text-right">{recruiter.completed_sessions}</td>
                       <td className="px-4 py-2 text-right">
@@ -402,6 +409,12 @@ function StatisticsDashboard() {
                           {recruiter.completion_rate.toFixed(1)}%
                         </span>
                       </td>
+                      <td className="px-4 py-2 text-right">
+                        {recruiter.average_duration_minutes !== null ? `${recruiter.average_duration_minutes.toFixed(1)} min` : '-'}
+                      </td>
+                      <td className="px-4 py-2 text-right">
+                        {recruiter.p90_duration_minutes !== null ? `${recruiter.p90_duration_minutes.toFixed(1)} min` : '-'}
+                      </td>
                     </tr>
                   ))}
                 </tbody>
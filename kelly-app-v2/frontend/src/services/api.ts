@@ -1,5 +1,6 @@
 import axios from 'axios'
-import type { InfoSessionRegistration, InfoSessionWithSteps, Announcement, CHRCase, CHRDashboardStats, CHRStatusBreakdown, NewHireOrientationRegistration, NewHireOrientationWithSteps, Event, EventAttendee, EventAttendeeCreate, RecruiterList } from '../types'
+import { getMiamiDateKey } from '../utils/dateUtils'
+import type { InfoSessionRegistration, InfoSessionWithSteps, InfoSessionFeedEvent, Announcement, CHRCase, CHRDashboardStats, CHRStatusBreakdown, NewHireOrientationRegistration, NewHireOrientationWithSteps, Event, EventAttendee, EventAttendeeCreate, RecruiterList } from '../types'
 
 // Detectar automáticamente la URL del backend basándose en la URL actual
 // Si se accede desde localhost, usa localhost. Si se accede desde una IP, usa esa IP.
@@ -140,6 +141,7 @@ export const checkExclusion = async (
 ): Promise<{
   is_in_exclusion_list: boolean
   matches: Array<{ id: number; name: string; code: string | null; ssn: string | null; dob: string | null; notes: string | null }>
+  possible_matches: Array<{ id: number; name: string; code: string | null; ssn: string | null; dob: string | null; notes: string | null; score: number }>
   warning_message: string | null
 }> => {
   try {
@@ -154,6 +156,7 @@ export const checkExclusion = async (
     return {
       is_in_exclusion_list: false,
       matches: [],
+      possible_matches: [],
       warning_message: null
     }
   }
@@ -604,14 +607,91 @@ export const deleteUser = async (userId: number): Promise<void> => {
 }
 
 // Visits API
+// /live defaults to today (Miami time) and is loaded whole, following the keyset cursor header
+const getAllInfoSessionPages = async (url: string): Promise<InfoSessionWithSteps[]> => {
+  const sessions: InfoSessionWithSteps[] = []
+  let cursor: string | undefined
+  do {
+    const response = await api.get(url, { params: cursor ? { cursor } : {} })
+    sessions.push(...response.data)
+    cursor = response.headers['x-next-cursor']
+  } while (cursor)
+  return sessions
+}
+
 export const getLiveInfoSessions = async (): Promise<InfoSessionWithSteps[]> => {
-  const response = await api.get('/info-session/live')
-  return response.data
+  return getAllInfoSessionPages('/info-session/live')
 }
 
-export const getCompletedInfoSessions = async (): Promise<InfoSessionWithSteps[]> => {
-  const response = await api.get('/info-session/completed')
-  return response.data
+export interface InfoSessionPage {
+  sessions: InfoSessionWithSteps[]
+  nextCursor?: string
+}
+
+export const COMPLETED_PAGE_SIZE = 100
+
+// /completed covers all dates, so it is loaded one page at a time (newest first);
+// pass the previous page's nextCursor to load older sessions
+export const getCompletedInfoSessions = async (cursor?: string): Promise<InfoSessionPage> => {
+  const params: Record<string, string | number> = { limit: COMPLETED_PAGE_SIZE }
+  if (cursor) params.cursor = cursor
+  const response = await api.get('/info-session/completed', { params })
+  return { sessions: response.data, nextCursor: response.headers['x-next-cursor'] }
+}
+
+// Live feed: load a snapshot once, then apply the deltas pushed by the server
+export const subscribeInfoSessionFeed = (onEvent: (event: InfoSessionFeedEvent) => void): (() => void) => {
+  const source = new EventSource(`${API_BASE_URL}/info-session/stream`)
+  const handler = (message: MessageEvent) => {
+    try {
+      onEvent(JSON.parse(message.data))
+    } catch (error) {
+      console.error('Error parsing live feed event:', error)
+    }
+  }
+  source.addEventListener('upsert', handler as EventListener)
+  source.addEventListener('delete', handler as EventListener)
+  source.addEventListener('resync', handler as EventListener)
+  // EventSource reconnects by itself; events may have been missed while disconnected
+  source.onerror = () => onEvent({ type: 'resync' })
+  return () => source.close()
+}
+
+export const LIVE_SESSION_STATUSES = ['registered', 'in-progress', 'initiated', 'completed']
+
+// Miami-local YYYY-MM-DD range a list was loaded for (inclusive); null means all dates
+export type InfoSessionWindow = { start: string; end: string } | null
+
+export const todayInfoSessionWindow = (): InfoSessionWindow => {
+  const today = getMiamiDateKey(new Date().toISOString())
+  return { start: today, end: today }
+}
+
+// Window covered by the loaded pages of an all-dates list: from the oldest loaded day on
+// while older pages remain, everything once the last page is loaded
+export const loadedInfoSessionWindow = (sessions: InfoSessionWithSteps[], nextCursor?: string): InfoSessionWindow => {
+  if (!nextCursor || sessions.length === 0) return null
+  return { start: getMiamiDateKey(sessions[sessions.length - 1].created_at), end: '9999-12-31' }
+}
+
+// Apply a feed event to a list; sessions whose status no longer matches are removed,
+// and sessions registered outside the loaded window are never added
+export const applyInfoSessionEvent = (
+  sessions: InfoSessionWithSteps[],
+  event: InfoSessionFeedEvent,
+  statuses: string[] = LIVE_SESSION_STATUSES,
+  dateWindow: InfoSessionWindow = todayInfoSessionWindow()
+): InfoSessionWithSteps[] => {
+  if (event.type === 'resync') return sessions
+  const rest = sessions.filter((s) => s.id !== event.id)
+  if (event.type === 'delete' || !statuses.includes(event.session.status)) return rest
+  if (dateWindow) {
+    const createdOn = getMiamiDateKey(event.session.created_at)
+    if (createdOn < dateWindow.start || createdOn > dateWindow.end) return rest
+  }
+  return sessions.length === rest.length
+    ? [event.session, ...rest]
+    : sessions.map((s) => (s.id === event.id ? event.session : s))
 }
 
 
@@ -728,9 +808,12 @@ export interface StatisticsData {
   recruiter_performance: Array<{
     recruiter_id: number
     recruiter_name: string
+    is_active: boolean
     assigned_sessions: number
     completed_sessions: number
     completion_rate: number
+    average_duration_minutes: number | null
+    p90_duration_minutes: number | null
   }>
 }
 
@@ -759,15 +842,30 @@ export const getCurrentUser = async (): Promise<any> => {
 }
 
 // Exclusion List API
-export const uploadExclusionList = async (file: File): Promise<{
+export interface ExclusionRescreenReport {
+  checked: number
+  newly_flagged: number
+  cleared: number
+  match_updated: number
+  flags_changed: number
+}
+
+export const uploadExclusionList = async (file: File, mode: 'replace' | 'merge' = 'replace'): Promise<{
   message: string
+  mode: 'replace' | 'merge'
+  version_id: number
   added: number
+  removed: number
+  changed: number
+  unchanged: number
   errors?: string[] | null
+  rescreen: ExclusionRescreenReport
 }> => {
   const formData = new FormData()
   formData.append('file', file)
   
   const response = await api.post('/exclusion-list/upload', formData, {
+    params: { mode },
     headers: {
       'Content-Type': 'multipart/form-data',
     },
@@ -785,6 +883,7 @@ export const getExclusionList = async (): Promise<{
 
 export const clearExclusionList = async (): Promise<{
   message: string
+  rescreen: ExclusionRescreenReport
 }> => {
   const response = await api.delete('/exclusion-list/clear')
   return response.data
@@ -58,8 +58,15 @@ export interface InfoSession {
 
 export interface InfoSessionWithSteps extends InfoSession {
   steps: InfoSessionStep[]
+  estimated_wait_minutes?: number | null  // until the assigned recruiter can start the interview
 }
 
+// Change events pushed by GET /info-session/stream
+export type InfoSessionFeedEvent =
+  | { type: 'upsert'; id: number; session: InfoSessionWithSteps }
+  | { type: 'delete'; id: number }
+  | { type: 'resync' }
+
 export interface NewHireOrientationRegistration {
   first_name: string
   last_name: string